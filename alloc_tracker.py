@@ -0,0 +1,235 @@
+"""Per-frame allocation tracking for the game loop.
+
+AllocationTracker combines two sources, bracketed by begin_frame() and
+end_frame() like FrameProfiler:
+
+- tracemalloc measures the Python-heap bytes allocated within each frame
+  (the traced peak above the frame's starting size). Snapshot diffs by line
+  since tracking started show the bytes retained per frame and which call
+  sites keep growing.
+- Surface counters: while tracking, pygame.Surface construction and the
+  pygame.transform functions are wrapped so every new Surface is counted,
+  with its pixel bytes, at the line that created it. SDL pixel memory is
+  invisible to tracemalloc. Surfaces and fonts constructed while tracking
+  also count their copies, conversions, subsurface views (no pixel bytes)
+  and text renders, so enable tracking before the game starts to see those
+  and call restart() once it has warmed up.
+
+Tracking slows the game down noticeably, so it is off by default and every
+call returns immediately while disabled. Only one tracker should be enabled
+at a time, since the Surface counters patch pygame globally.
+"""
+import fnmatch
+import gc
+import os
+import re
+import sys
+import tracemalloc
+from collections import deque
+
+from frame_profiler import percentile
+
+# ===== ALLOCATION TRACKING CONSTANTS =====
+ALLOCATION_WINDOW = 600  # Frames kept for per-frame statistics
+ALLOCATION_REPORT_SITES = 8  # Call sites listed per report section
+COUNTED_TRANSFORMS = ('scale', 'smoothscale', 'rotate', 'rotozoom', 'flip', 'scale_by')
+
+
+def get_call_site(frame):
+    """'file.py:line (function)' for a Python frame"""
+    code = frame.f_code
+    return f'{os.path.basename(code.co_filename)}:{frame.f_lineno} ({code.co_name})'
+
+
+class AllocationTracker:
+    """Counts Python-heap and Surface allocations per frame, by call site"""
+    def __init__(self, window=ALLOCATION_WINDOW, ignore_files=()):
+        self.enabled = False
+        self.window = window
+        self.ignore_files = ignore_files  # Callers' own bookkeeping, left out of the growth report
+        self.patches = []  # (owner, attribute, original) to restore on disable
+        self.started_tracemalloc = False
+        self.reset()
+
+    def reset(self):
+        self.python_bytes = deque(maxlen=self.window)  # Bytes allocated within each frame
+        self.surface_counts = deque(maxlen=self.window)
+        self.surface_bytes = deque(maxlen=self.window)
+        self.surface_sites = {}  # call site -> [surfaces, bytes] since tracking started
+        self.frame_count = 0
+        self.frame_start_bytes = 0
+        self.frame_surfaces = 0
+        self.frame_surface_bytes = 0
+        self.start_snapshot = None
+
+    def set_enabled(self, enabled):
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        if enabled:
+            self.started_tracemalloc = not tracemalloc.is_tracing()
+            if self.started_tracemalloc:
+                tracemalloc.start()
+            self.install_surface_counters()
+            self.restart()
+        else:
+            self.uninstall_surface_counters()
+            if self.started_tracemalloc:
+                tracemalloc.stop()
+
+    def restart(self):
+        """Drop the statistics so far (e.g. a warm-up) and measure from this frame on"""
+        self.reset()
+        # Collect the garbage made so far (and empty the free lists), so freeing it later does not hide growth
+        gc.collect()
+        self.start_snapshot = self.take_snapshot()
+        self.begin_frame()
+
+    def install_surface_counters(self):
+        import pygame
+
+        tracker = self
+        base_surface = pygame.Surface
+        base_font = pygame.font.Font
+
+        class CountingSurface(base_surface):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                tracker.count_surface(self, sys._getframe(1))
+
+            def copy(self):
+                surface = super().copy()
+                tracker.count_surface(surface, sys._getframe(1))
+                return surface
+
+            def convert(self, *args):
+                surface = super().convert(*args)
+                tracker.count_surface(surface, sys._getframe(1))
+                return surface
+
+            def convert_alpha(self, *args):
+                surface = super().convert_alpha(*args)
+                tracker.count_surface(surface, sys._getframe(1))
+                return surface
+
+            def subsurface(self, *args):
+                surface = super().subsurface(*args)
+                tracker.count_surface(surface, sys._getframe(1), shares_pixels=True)
+                return surface
+
+        class CountingFont(base_font):
+            def render(self, *args, **kwargs):
+                surface = super().render(*args, **kwargs)
+                tracker.count_surface(surface, sys._getframe(1))
+                return surface
+
+        def counted(function):
+            def wrapper(*args, **kwargs):
+                surface = function(*args, **kwargs)
+                # Given a destination Surface, the transform writes into it instead of allocating
+                if all(surface is not arg for arg in (*args, *kwargs.values())):
+                    tracker.count_surface(surface, sys._getframe(1))
+                return surface
+            return wrapper
+
+        self.patches = [(pygame, 'Surface', base_surface), (pygame.font, 'Font', base_font)]
+        pygame.Surface = CountingSurface
+        pygame.font.Font = CountingFont
+        for name in COUNTED_TRANSFORMS:
+            function = getattr(pygame.transform, name, None)
+            if function is not None:
+                self.patches.append((pygame.transform, name, function))
+                setattr(pygame.transform, name, counted(function))
+
+    def uninstall_surface_counters(self):
+        for owner, name, original in self.patches:
+            setattr(owner, name, original)
+        self.patches = []
+
+    def count_surface(self, surface, frame, shares_pixels=False):
+        if not self.enabled:
+            return
+        size = 0 if shares_pixels else surface.get_width() * surface.get_height() * surface.get_bytesize()
+        self.frame_surfaces += 1
+        self.frame_surface_bytes += size
+        site = self.surface_sites.setdefault(get_call_site(frame), [0, 0])
+        site[0] += 1
+        site[1] += size
+
+    def take_snapshot(self):
+        # The filters' own pattern caches (fnmatch, re) grow with every new file name they see
+        ignored = (tracemalloc.__file__, fnmatch.__file__, os.path.join(os.path.dirname(re.__file__), '*'), __file__,
+                   '<frozen importlib._bootstrap>', '<unknown>') + tuple(self.ignore_files)
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, name) for name in ignored])
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        tracemalloc.reset_peak()
+        self.frame_start_bytes = tracemalloc.get_traced_memory()[0]
+        self.frame_surfaces = 0
+        self.frame_surface_bytes = 0
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.python_bytes.append(tracemalloc.get_traced_memory()[1] - self.frame_start_bytes)
+        self.surface_counts.append(self.frame_surfaces)
+        self.surface_bytes.append(self.frame_surface_bytes)
+        self.frame_count += 1
+
+    def get_summary(self, top=ALLOCATION_REPORT_SITES):
+        """Per-frame allocation statistics and the heaviest call sites since tracking started"""
+        if not self.enabled or not self.frame_count:
+            return None
+        frames = self.frame_count
+
+        def stats(samples):
+            return {'mean': sum(samples) / len(samples), 'p95': percentile(samples, 95), 'max': max(samples)}
+
+        surface_sites = sorted(self.surface_sites.items(), key=lambda item: item[1][1], reverse=True)
+        gc.collect()  # Like the start snapshot, so free-listed objects are not counted as growth
+        growth = self.take_snapshot().compare_to(self.start_snapshot, 'lineno')
+        growth_sites = [stat for stat in growth if stat.size_diff > 0][:top]  # compare_to sorts biggest first
+        return {
+            'frames': frames,
+            'python_bytes_per_frame': stats(self.python_bytes),
+            'retained_bytes_per_frame': sum(stat.size_diff for stat in growth) / frames,
+            'surfaces_per_frame': stats(self.surface_counts),
+            'surface_bytes_per_frame': stats(self.surface_bytes),
+            'surface_sites': [
+                {'site': site, 'surfaces_per_frame': count / frames, 'bytes_per_frame': size / frames}
+                for site, (count, size) in surface_sites[:top]
+            ],
+            'growth_sites': [
+                {'site': f'{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}',
+                 'bytes_per_frame': stat.size_diff / frames, 'blocks_per_frame': stat.count_diff / frames}
+                for stat in growth_sites
+            ],
+        }
+
+    def format_report(self, top=ALLOCATION_REPORT_SITES):
+        """Human-readable report lines"""
+        summary = self.get_summary(top)
+        if summary is None:
+            return ['No frames tracked']
+        python_bytes = summary['python_bytes_per_frame']
+        surfaces = summary['surfaces_per_frame']
+        lines = [
+            f"{summary['frames']} frames: Python heap {python_bytes['mean'] / 1024:.1f} KB/frame "
+            f"(p95 {python_bytes['p95'] / 1024:.1f}, max {python_bytes['max'] / 1024:.1f}), "
+            f"retained {summary['retained_bytes_per_frame']:.0f} B/frame",
+            f"Surfaces {surfaces['mean']:.1f}/frame (max {surfaces['max']}), "
+            f"{summary['surface_bytes_per_frame']['mean'] / 1024:.1f} KB/frame",
+        ]
+        lines += [f"  surface {site['site']}: {site['surfaces_per_frame']:.2f}/frame, "
+                  f"{site['bytes_per_frame'] / 1024:.1f} KB/frame" for site in summary['surface_sites']]
+        lines += [f"  growth {site['site']}: {site['bytes_per_frame']:+.0f} B/frame, "
+                  f"{site['blocks_per_frame']:+.2f} blocks/frame" for site in summary['growth_sites']]
+        return lines
+
+    def export_report(self, path, top=ALLOCATION_REPORT_SITES):
+        """Write the report as text; returns the number of frames it covers"""
+        with open(path, 'w') as f:
+            f.write('\n'.join(self.format_report(top)) + '\n')
+        return self.frame_count
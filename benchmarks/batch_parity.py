@@ -0,0 +1,257 @@
+"""Differential check of snake_batch.BatchSnakeEngine against snake_engine.SnakeEngine.
+
+Game rules: every batch row is loaded with the state of its own SnakeEngine
+game, then both are stepped with the same actions (a random policy and a
+greedy one that heads for the food). After each tick the outcome and the
+resulting state must match. Food respawns and powerup offers are random in
+both engines, so the engine's draws are copied into the batch row.
+
+Obstacle generation: both engines generate layouts at the default obstacle
+count and on a crowded board where the requested count does not fit. Every
+obstacle must sit on a valid anchor, a game may stop short only when no
+shape fits anywhere, and both engines must place the same number of shapes
+and cells on average.
+
+    python benchmarks/batch_parity.py
+    python benchmarks/batch_parity.py --games 128 --steps 5000
+"""
+import argparse
+import math
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snake_engine import GRID_SIZE, OBSTACLE_COUNT, POWERUP_SELECTION_COUNT, PowerupState, SnakeEngine
+from snake_batch import (
+    BATCH_DIRECTIONS, COLLISION_TYPES, NO_ACTION, BatchSnakeEngine, _BASE_ANCHORS, _get_valid_anchors,
+)
+
+# ===== PARITY CONSTANTS =====
+DEFAULT_GAMES = 64
+DEFAULT_STEPS = 3000
+CROWDED_OBSTACLE_COUNT = 500  # More shapes than fit on the board
+OBSTACLE_GAMES = 400  # Layouts generated per engine and obstacle count
+PARITY_SEED = 1234
+MAX_REPORTED = 10  # Mismatches printed per check
+
+
+def to_cell(position):
+    return position[1] * GRID_SIZE + position[0]
+
+
+def get_powerup_summary(engine):
+    """(shields, double points uses, ghost mode active, speed boost active) of a SnakeEngine"""
+    active = [powerup for powerup in engine.active_powerups if powerup.active]
+    return (
+        sum(powerup.type == PowerupState.SHIELD for powerup in active),
+        sum(powerup.remaining_uses for powerup in active if powerup.type == PowerupState.DOUBLE_POINTS),
+        any(powerup.type == PowerupState.GHOST_MODE for powerup in active),
+        any(powerup.type == PowerupState.SPEED_BOOST for powerup in active),
+    )
+
+
+def get_batch_powerup_summary(batch, env):
+    now = batch.current_time[env]
+    return (int(batch.shields[env]), int(batch.double_points_uses[env]),
+            bool(now < batch.ghost_mode_end[env]), bool(now < batch.speed_boost_end[env]))
+
+
+def load_row(batch, env, engine):
+    """Overwrite one batch game with the state of a SnakeEngine"""
+    cells = [to_cell(position) for position in reversed(list(engine.snake.body))]  # Tail first
+    batch.body[env, :len(cells)] = cells
+    batch.head_index[env] = len(cells) - 1
+    batch.length[env] = len(cells)
+    batch.occupied[env] = False
+    batch.occupied[env, cells] = True
+    batch.obstacles[env] = False
+    batch.obstacles[env, [to_cell(position) for position in engine.obstacle.positions]] = True
+    batch.obstacle_shapes[env] = len(engine.obstacle.shapes)
+    batch.food[env] = to_cell(engine.food.position)
+
+    snake = engine.snake
+    batch.direction[env] = BATCH_DIRECTIONS.index(snake.direction)
+    batch.queued_direction[env] = BATCH_DIRECTIONS.index(snake.direction_queue[0]) if snake.direction_queue else NO_ACTION
+    batch.grow_pending[env] = snake.grow_pending
+
+    batch.score[env] = engine.score
+    batch.apples_collected[env] = engine.apples_collected
+    batch.current_time[env] = engine.current_time
+    batch.ticks[env] = engine.ticks
+    batch.game_over[env] = engine.game_over
+
+    shields, double_points_uses, _, _ = get_powerup_summary(engine)
+    batch.shields[env] = shields
+    batch.double_points_uses[env] = double_points_uses
+    batch.ghost_mode_end[env] = batch.speed_boost_end[env] = 0
+    for powerup in engine.active_powerups:
+        duration = PowerupState.DURATIONS[powerup.type]
+        if powerup.active and duration is not None:
+            end = powerup.start_time + duration
+            if powerup.type == PowerupState.GHOST_MODE:
+                batch.ghost_mode_end[env] = max(batch.ghost_mode_end[env], end)
+            else:
+                batch.speed_boost_end[env] = max(batch.speed_boost_end[env], end)
+    batch.powerup_selection_active[env] = engine.powerup_selection_active
+    if engine.powerup_selection_active:
+        batch.powerup_choices[env] = [PowerupState.ALL_TYPES.index(name) for name in engine.powerup_choices]
+    batch.selected_powerup_index[env] = engine.selected_powerup_index
+
+
+def compare_row(batch, env, engine, result, batch_result):
+    """Differences between one game's tick outcome and state in the two engines"""
+    pairs = [
+        ('collision', result.collision_type, COLLISION_TYPES[batch_result.collision[env]]),
+        ('shield_broken', result.shield_broken, bool(batch_result.shield_broken[env])),
+        ('died', result.died, bool(batch_result.died[env])),
+        ('points', result.points, int(batch_result.points[env])),
+        ('powerup_offered', result.powerup_offered, bool(batch_result.powerup_offered[env])),
+        ('body', list(engine.snake.body), batch.get_body(env)),
+        ('direction', engine.snake.direction, BATCH_DIRECTIONS[batch.direction[env]]),
+        ('score', engine.score, int(batch.score[env])),
+        ('apples_collected', engine.apples_collected, int(batch.apples_collected[env])),
+        ('current_time', engine.current_time, int(batch.current_time[env])),
+        ('game_over', engine.game_over, bool(batch.game_over[env])),
+        ('powerups', get_powerup_summary(engine), get_batch_powerup_summary(batch, env)),
+        ('powerup_selection', engine.powerup_selection_active, bool(batch.powerup_selection_active[env])),
+    ]
+    return [f'{name}: engine {expected!r}, batch {actual!r}' for name, expected, actual in pairs if expected != actual]
+
+
+def random_policy(engine, rng):
+    return rng.choice([None] + BATCH_DIRECTIONS)
+
+
+def greedy_policy(engine, rng):
+    """Turn toward the food through a cell that is free after the move, if any"""
+    head_x, head_y = engine.snake.body[0]
+    food_x, food_y = engine.food.position
+    best = None
+    for direction in BATCH_DIRECTIONS:
+        x, y = head_x + direction[0], head_y + direction[1]
+        if not (0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE):
+            continue
+        if engine.obstacle.check_collision((x, y)) or engine.snake.occupies((x, y), include_tail=False):
+            continue
+        distance = abs(food_x - x) + abs(food_y - y)
+        if best is None or distance < best[0]:
+            best = (distance, direction)
+    return best[1] if best else None
+
+
+POLICIES = {'random': random_policy, 'greedy': greedy_policy}
+
+
+def run_differential(policy_name, games, steps, seed):
+    """Step SnakeEngine games and batch rows in lockstep; returns (ticks compared, mismatch lines)"""
+    policy = POLICIES[policy_name]
+    rng = random.Random(seed)
+    engines = [SnakeEngine(seed=seed + env) for env in range(games)]
+    batch = BatchSnakeEngine(games, seed=seed)
+    for env, engine in enumerate(engines):
+        load_row(batch, env, engine)
+
+    mismatches = []
+    compared = 0
+    actions = np.full(games, NO_ACTION, dtype=np.int8)
+    choices = np.zeros(games, dtype=np.int8)
+    for step in range(steps):
+        engine_actions = []
+        for env, engine in enumerate(engines):
+            if engine.powerup_selection_active:
+                action = choices[env] = rng.randrange(POWERUP_SELECTION_COUNT)
+                actions[env] = NO_ACTION
+            else:
+                action = policy(engine, rng)
+                actions[env] = NO_ACTION if action is None else BATCH_DIRECTIONS.index(action)
+            engine_actions.append(action)
+
+        batch_result = batch.step(actions, choices)
+        for env, engine in enumerate(engines):
+            result = engine.step(engine_actions[env])
+            compared += 1
+            differences = compare_row(batch, env, engine, result, batch_result)
+            if differences:
+                mismatches.append(f'{policy_name} game {env} step {step}: ' + '; '.join(differences))
+            if engine.game_over:
+                engine.reset()
+            elif not differences:
+                # Copy the engine's random draws: the respawned food and the offered cards
+                batch.food[env] = to_cell(engine.food.position)
+                if result.powerup_offered:
+                    batch.powerup_choices[env] = [PowerupState.ALL_TYPES.index(name) for name in engine.powerup_choices]
+                continue
+            load_row(batch, env, engine)  # Resynchronize after a new game or a mismatch
+    return compared, mismatches
+
+
+def get_obstacle_stats(batch, obstacle_count):
+    """(shapes, cells) per game plus problem lines for the layouts held in a batch"""
+    problems = []
+    off_anchor = np.flatnonzero((batch.obstacles & ~_BASE_ANCHORS[0]).any(axis=1))  # 1x1 anchors cover every allowed cell
+    on_snake = np.flatnonzero((batch.obstacles & batch.occupied).any(axis=1))
+    room_left = _get_valid_anchors(batch.obstacles | batch.occupied).any(axis=(0, 2))
+    stopped_early = np.flatnonzero((batch.obstacle_shapes < obstacle_count) & room_left)
+    for name, rows in (('obstacle outside the allowed cells', off_anchor), ('obstacle on the snake', on_snake),
+                       ('fewer shapes than requested with room left', stopped_early)):
+        problems += [f'game {env}: {name}' for env in rows]
+    return batch.obstacle_shapes.astype(np.float64), batch.obstacles.sum(axis=1).astype(np.float64), problems
+
+
+def compare_means(name, engine_values, batch_values):
+    """Problem line when the two means differ by more than 4 standard errors"""
+    error = math.sqrt(engine_values.var() / engine_values.size + batch_values.var() / batch_values.size)
+    difference = abs(engine_values.mean() - batch_values.mean())
+    if difference > 4 * error + 1e-9:
+        return [f'{name}: engine mean {engine_values.mean():.2f}, batch mean {batch_values.mean():.2f}']
+    return []
+
+
+def check_obstacles(obstacle_count, games, seed):
+    """Generate layouts in both engines; returns (summary line, problem lines)"""
+    batch = BatchSnakeEngine(games, seed=seed, obstacle_count=obstacle_count)
+    batch_shapes, batch_cells, problems = get_obstacle_stats(batch, obstacle_count)
+
+    # Engine layouts are checked the same way after loading them into a batch
+    engine_batch = BatchSnakeEngine(games, seed=seed, obstacle_count=0)
+    for env in range(games):
+        load_row(engine_batch, env, SnakeEngine(seed=seed + env, obstacle_count=obstacle_count))
+    engine_shapes, engine_cells, engine_problems = get_obstacle_stats(engine_batch, obstacle_count)
+    problems += [f'engine {line}' for line in engine_problems]
+    problems += compare_means('shapes placed', engine_shapes, batch_shapes)
+    problems += compare_means('obstacle cells', engine_cells, batch_cells)
+    summary = (f'obstacles[count={obstacle_count}]: shapes engine {engine_shapes.mean():.2f} / batch {batch_shapes.mean():.2f}, '
+               f'cells engine {engine_cells.mean():.2f} / batch {batch_cells.mean():.2f}')
+    return summary, [f'obstacles[count={obstacle_count}] {line}' for line in problems]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Differential check of the batch engine against SnakeEngine')
+    parser.add_argument('--games', type=int, default=DEFAULT_GAMES, help='games per policy (default: %(default)s)')
+    parser.add_argument('--steps', type=int, default=DEFAULT_STEPS, help='ticks per policy (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=PARITY_SEED)
+    args = parser.parse_args()
+
+    failures = []
+    for obstacle_count in (OBSTACLE_COUNT, CROWDED_OBSTACLE_COUNT):
+        summary, problems = check_obstacles(obstacle_count, OBSTACLE_GAMES, args.seed)
+        print(f'{summary}, {len(problems)} problems', flush=True)
+        failures += problems
+    for policy_name in POLICIES:
+        compared, mismatches = run_differential(policy_name, args.games, args.steps, args.seed)
+        print(f'{policy_name}: {compared} ticks compared, {len(mismatches)} mismatches', flush=True)
+        failures += mismatches
+
+    for line in failures[:MAX_REPORTED]:
+        print(f'  {line}')
+    if len(failures) > MAX_REPORTED:
+        print(f'  ... {len(failures) - MAX_REPORTED} more')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
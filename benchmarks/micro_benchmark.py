@@ -0,0 +1,314 @@
+"""Microbenchmarks for the core simulation primitives.
+
+Each case times one primitive in isolation: state is rebuilt (untimed) before
+every repeat, then the primitive is called `number` times in a tight loop,
+with number calibrated so one repeat lasts at least --min-time seconds. The
+per-call times of all repeats are summarised as median and interquartile
+range, so a data-structure change can be judged per primitive instead of
+through noisy end-to-end FPS.
+
+    python benchmarks/micro_benchmark.py                 # run everything
+    python benchmarks/micro_benchmark.py --filter spawn  # only matching cases
+
+The footprint of the transient game entities (bytes each, measured with
+tracemalloc over a batch of instances) is reported alongside.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from render_benchmark import REPO_ROOT, build_board_cycle, get_environment
+
+from snake_engine import (
+    GRID_SIZE, LEFT, UP, OccupancyGrid, SnakeBody, SnakeModel, FoodModel, ObstacleField, PowerupState,
+)
+
+# ===== BENCHMARK CONSTANTS =====
+DEFAULT_REPEAT = 15
+DEFAULT_MIN_TIME = 0.02  # Seconds per repeat
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, 'benchmarks', 'micro_results.json')
+BENCHMARK_SEED = 1234
+FOOTPRINT_INSTANCES = 10000
+
+
+def make_snake_on_cycle(length, snake_class=SnakeModel):
+    """Snake of the given length laid along the board cycle, plus the direction to take from each cell"""
+    cycle = build_board_cycle(GRID_SIZE)
+    directions = {}
+    for i, (x, y) in enumerate(cycle):
+        next_x, next_y = cycle[(i + 1) % len(cycle)]
+        directions[(x, y)] = (next_x - x, next_y - y)
+
+    grid = OccupancyGrid()
+    snake = snake_class(grid)
+    grid.clear(OccupancyGrid.SNAKE)
+    snake.body = SnakeBody(cycle[length - 1::-1])  # Head first
+    for segment in snake.body:
+        grid.add(segment, OccupancyGrid.SNAKE)
+    snake.direction = directions[snake.body[0]]
+    return snake, directions
+
+
+def make_filled_grid(fill_ratio, rng):
+    """Grid with fill_ratio of its cells covered by snake segments"""
+    grid = OccupancyGrid()
+    cells = [(x, y) for x in range(GRID_SIZE) for y in range(GRID_SIZE)]
+    for cell in rng.sample(cells, int(len(cells) * fill_ratio)):
+        grid.add(cell, OccupancyGrid.SNAKE)
+    return grid
+
+
+# ===== CASES =====
+# Each case builder takes a seeded rng and returns a zero-argument callable to time
+
+
+def case_snake_move(length):
+    def build(rng):
+        import snake_game
+
+        snake, directions = make_snake_on_cycle(length, snake_game.Snake)  # Includes the body layer move log
+        body = snake.body
+
+        def run():
+            snake.direction = directions[body[0]]  # Follow the cycle so the snake never dies
+            snake.move()
+        return run
+    return build
+
+
+def case_change_direction(accepted):
+    def build(rng):
+        snake = SnakeModel()
+        snake.direction = UP
+        new_direction = LEFT if accepted else UP  # Repeating the current direction is rejected
+        queue = snake.direction_queue
+
+        def run():
+            queue.clear()
+            snake.change_direction(new_direction)
+        return run
+    return build
+
+
+def case_food_spawn(fill_ratio):
+    def build(rng):
+        food = FoodModel(make_filled_grid(fill_ratio, rng))
+        return lambda: food.spawn(rng)
+    return build
+
+
+def case_obstacle_generate(count):
+    def build(rng):
+        snake = SnakeModel()
+        field = ObstacleField(snake.grid)
+        food_position = (5, 5)
+        return lambda: field.generate(count, snake.body, food_position, rng)
+    return build
+
+
+def case_powerup_is_expired(powerup_type):
+    def build(rng):
+        powerup = PowerupState(powerup_type)
+        powerup.activate(0)
+        return lambda: powerup.is_expired(5000)
+    return build
+
+
+def get_screen():
+    """Game-sized display surface on the dummy video driver"""
+    import pygame
+    import snake_game
+
+    if pygame.display.get_surface() is None:
+        pygame.init()
+        pygame.display.set_mode((snake_game.WIDTH, snake_game.HEIGHT))
+    return pygame.display.get_surface()
+
+
+def case_snake_draw(length):
+    def build(rng):
+        import snake_game
+
+        screen = get_screen()
+        snake, _ = make_snake_on_cycle(length, snake_game.Snake)
+        snake.update_interpolation(0.5)  # Mid-slide, so the head and tail are interpolated
+        snake.draw(screen)  # Paint the body layer, so only steady-state frames are timed
+        return lambda: snake.draw(screen)
+    return build
+
+
+def case_snake_move_draw(length):
+    def build(rng):
+        import snake_game
+
+        screen = get_screen()
+        snake, directions = make_snake_on_cycle(length, snake_game.Snake)
+        snake.update_interpolation(0.5)
+        snake.draw(screen)
+        body = snake.body
+
+        def run():
+            # A tick frame: the body layer erases the tail and repaints the gradient window
+            snake.direction = directions[body[0]]
+            snake.move()
+            snake.draw(screen)
+        return run
+    return build
+
+
+def case_update_snake_trail(powerup_count):
+    def build(rng):
+        import snake_game
+
+        snake, _ = make_snake_on_cycle(3)
+        powerups = [snake_game.Powerup(powerup_type) for powerup_type in PowerupState.ALL_TYPES[:powerup_count]]
+        for powerup in powerups:
+            powerup.activate(0)
+        state = SimpleNamespace(snake=snake, active_powerups=powerups, snake_trail=[], last_snake_position=None)
+        previous_head = snake.body[1]
+
+        def run():
+            state.last_snake_position = previous_head  # Head moved since the last call, so a segment is added
+            snake_game.update_snake_trail(state, 0)
+        return run
+    return build
+
+
+def case_create_dramatic_burst(event_type):
+    def build(rng):
+        import snake_game
+
+        particles = snake_game.ParticlePool()  # Full pools recycle their oldest slots
+        return lambda: snake_game.create_dramatic_burst(particles, 300, 300, event_type, 0)
+    return build
+
+
+CASES = (
+    [(f'Snake.move[length={length}]', case_snake_move(length)) for length in (3, 300, 800)] +
+    [(f'Snake.draw[length={length}]', case_snake_draw(length)) for length in (3, 100, 800)] +
+    [(f'Snake.move+draw[length={length}]', case_snake_move_draw(length)) for length in (3, 100, 800)] +
+    [(f'Snake.change_direction[{name}]', case_change_direction(accepted))
+     for name, accepted in (('accepted', True), ('rejected', False))] +
+    [(f'Food.spawn[fill={fill_ratio}]', case_food_spawn(fill_ratio)) for fill_ratio in (0.0, 0.5, 0.9, 0.99)] +
+    [(f'Obstacle.generate[count={count}]', case_obstacle_generate(count)) for count in (0, 15, 50, 100)] +
+    [(f'Powerup.is_expired[{powerup_type}]', case_powerup_is_expired(powerup_type))
+     for powerup_type in PowerupState.ALL_TYPES] +
+    [(f'update_snake_trail[powerups={count}]', case_update_snake_trail(count)) for count in (0, 3)] +
+    [(f'create_dramatic_burst[{event_type}]', case_create_dramatic_burst(event_type))
+     for event_type in ('food', 'collision', 'shield_break')]
+)
+
+
+def get_entity_makers():
+    """(name, zero-argument constructor) for the entities created and discarded during play"""
+    import snake_game
+
+    return [
+        ('TrailSegment', lambda: snake_game.TrailSegment(100, 120, snake_game.GREEN, 400)),
+        ('ShockwaveRing', lambda: snake_game.ShockwaveRing(100, 120, snake_game.RED, 80, snake_game.SHOCKWAVE_DURATION, 4)),
+        ('Powerup', lambda: snake_game.Powerup(PowerupState.SHIELD)),
+    ]
+
+
+def measure_footprint(make, count=FOOTPRINT_INSTANCES):
+    """Traced Python-heap bytes per instance, excluding the list holding them"""
+    make()  # Warm up class-level state outside the measurement
+    tracemalloc.start()
+    try:
+        instances = [make() for _ in range(count)]
+        size = tracemalloc.get_traced_memory()[0] - sys.getsizeof(instances)
+    finally:
+        tracemalloc.stop()
+    return size / count
+
+
+def time_case(build, repeat, min_time):
+    """Return (number, per-call seconds for each repeat)"""
+    # Calibrate like timeit.autorange: grow number until one run lasts min_time
+    number = 1
+    while True:
+        run = build(random.Random(BENCHMARK_SEED))
+        started = time.perf_counter()
+        for _ in range(number):
+            run()
+        if time.perf_counter() - started >= min_time:
+            break
+        number *= 2
+
+    samples = []
+    for index in range(repeat):
+        run = build(random.Random(BENCHMARK_SEED + index))
+        started = time.perf_counter()
+        for _ in range(number):
+            run()
+        samples.append((time.perf_counter() - started) / number)
+    return number, samples
+
+
+def summarize(number, samples):
+    """Median, quartiles and spread of per-call samples, in microseconds"""
+    micros = [sample * 1e6 for sample in samples]
+    if len(micros) > 1:
+        q1, median, q3 = statistics.quantiles(micros, n=4)
+    else:
+        q1 = median = q3 = micros[0]
+    return {
+        'median_us': median,
+        'iqr_us': q3 - q1,
+        'q1_us': q1,
+        'q3_us': q3,
+        'min_us': min(micros),
+        'max_us': max(micros),
+        'number': number,
+        'repeat': len(micros),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmarks for core simulation primitives')
+    parser.add_argument('--filter', help='only run cases whose name contains this text')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='timed runs per case (default: %(default)s)')
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME,
+                        help='minimum seconds per run (default: %(default)s)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='where to write the results JSON')
+    args = parser.parse_args()
+
+    os.chdir(REPO_ROOT)  # Sprites load relative to the game directory
+    results = {
+        'environment': get_environment(),
+        'settings': {'repeat': args.repeat, 'min_time': args.min_time},
+        'benchmarks': {},
+        'entity_bytes': {},
+    }
+    print(f"{'case':<40} {'median us':>10} {'IQR us':>10} {'calls':>8}")
+    for name, build in CASES:
+        if args.filter and args.filter not in name:
+            continue
+        summary = summarize(*time_case(build, args.repeat, args.min_time))
+        results['benchmarks'][name] = summary
+        print(f"{name:<40} {summary['median_us']:>10.3f} {summary['iqr_us']:>10.3f} {summary['number']:>8}", flush=True)
+
+    print(f"{'entity':<40} {'bytes':>10}")
+    for name, make in get_entity_makers():
+        if args.filter and args.filter not in name:
+            continue
+        results['entity_bytes'][name] = footprint = measure_footprint(make)
+        print(f"{name:<40} {footprint:>10.0f}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,465 @@
+"""Headless end-to-end rendering benchmarks for snake_game.py.
+
+Each scenario runs the real game loop (snake_game.main) in its own subprocess
+with the SDL dummy video driver. A simulated 60 Hz clock and a scripted
+frame_callback make every run replay the same frames, while the wall-clock
+cost of each frame is measured. Results (FPS, frame-time percentiles and
+peak memory per scenario) are written as JSON and compared against a stored
+baseline; the run exits with status 1 when a scenario regresses.
+
+    python benchmarks/render_benchmark.py                    # run all, compare to the baseline
+    python benchmarks/render_benchmark.py --save-baseline    # record the baseline on this machine
+    python benchmarks/render_benchmark.py --scenario long_snake --scenario death_zoom
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from frame_profiler import percentile
+
+# ===== BENCHMARK CONSTANTS =====
+SIMULATED_FRAME_MS = 1000 / 60  # Game time advanced per frame, whatever the real frame took
+BENCHMARK_SEED = 1234
+DEFAULT_TOLERANCE = 0.25  # Allowed slowdown (and memory growth) against the baseline
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, 'benchmarks', 'render_baseline.json')
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, 'benchmarks', 'render_results.json')
+DEFAULT_ALLOCATION_OUTPUT = os.path.join(REPO_ROOT, 'benchmarks', 'allocation_results.json')
+
+# Steady-state allocation budgets per measured frame (means over the scenario,
+# after its warmup): Surfaces created, Python-heap KB allocated within the frame,
+# and Python-heap bytes retained (growth that never comes back, i.e. a leak or
+# unbounded cache). Warm frames create no Surfaces; the allowance covers content
+# first seen in the window, like a new digit on the timer.
+ALLOCATION_BUDGETS = {
+    'idle': {'surfaces': 0.02, 'python_kb': 48, 'retained_bytes': 32},
+    'long_snake': {'surfaces': 0.02, 'python_kb': 48, 'retained_bytes': 32},
+    'food_bursts': {'surfaces': 0.02, 'python_kb': 72, 'retained_bytes': 32},
+    'death_zoom': {'surfaces': 0.02, 'python_kb': 48, 'retained_bytes': 32},
+    'countdown': {'surfaces': 0.02, 'python_kb': 48, 'retained_bytes': 32},
+    'powerup_selection': {'surfaces': 0.02, 'python_kb': 48, 'retained_bytes': 32},
+}
+
+
+class SimulatedClock:
+    """Stands in for pygame.time.get_ticks so game time advances one fixed step per frame"""
+    def __init__(self):
+        self.frame = 0
+
+    def get_ticks(self):
+        return int(self.frame * SIMULATED_FRAME_MS)
+
+    def advance(self):
+        self.frame += 1
+
+
+def build_board_cycle(size):
+    """Hamiltonian cycle over a size x size board (size must be even).
+
+    Row 0 runs right, the rows below zigzag over columns 1..size-1, and
+    column 0 leads back up, so a snake steered along it never collides.
+    """
+    cells = [(x, 0) for x in range(size)]
+    for y in range(1, size):
+        xs = range(size - 1, 0, -1) if y % 2 else range(1, size)
+        cells.extend((x, y) for x in xs)
+    cells.extend((0, y) for y in range(size - 1, 0, -1))
+    return cells
+
+
+def place_snake(state, body, direction):
+    """Replace the snake with body (head first) moving in direction, on an obstacle-free board"""
+    from snake_engine import OccupancyGrid, SnakeBody
+
+    state.grid.clear(OccupancyGrid.SNAKE)
+    state.snake.body = SnakeBody(body)
+    for segment in body:
+        state.grid.add(segment, OccupancyGrid.SNAKE)
+    state.snake.direction = direction
+    state.snake.direction_queue.clear()
+    state.input_scheduler.clear()
+    state.last_snake_position = body[0]
+    state.obstacle.generate(0, state.snake.body, state.food.position)
+
+
+class Scenario:
+    """One scripted benchmark run: setup() once the game has started, step() every frame"""
+    name = ''
+    warmup = 300  # Frames run before measuring, so caches and sprite bakes settle
+    frames = 600  # Measured frames
+
+    def setup(self, state, current_time):
+        pass
+
+    def step(self, state, current_time, frame):
+        pass
+
+
+class CycleScenario(Scenario):
+    """Snake of a given length steered around the board cycle on an obstacle-free board"""
+    snake_length = 3
+
+    def setup(self, state, current_time):
+        from snake_engine import GRID_SIZE
+
+        self.cycle = build_board_cycle(GRID_SIZE)
+        self.next_cell = {cell: self.cycle[(i + 1) % len(self.cycle)] for i, cell in enumerate(self.cycle)}
+        self.previous_cell = {cell: self.cycle[i - 1] for i, cell in enumerate(self.cycle)}
+
+        # Lay the snake along the cycle, head first
+        body = [self.cycle[i] for i in range(self.snake_length - 1, -1, -1)]
+        place_snake(state, body, state.snake.direction)
+        self.steer(state)
+
+    def steer(self, state):
+        """Point the snake at the next cycle cell and keep the food out of its way"""
+        head_x, head_y = state.snake.body[0]
+        next_x, next_y = self.next_cell[(head_x, head_y)]
+        state.snake.direction = (next_x - head_x, next_y - head_y)
+        state.food.position = self.previous_cell[state.snake.body[-1]]
+
+    def step(self, state, current_time, frame):
+        self.steer(state)
+
+
+class IdleScenario(CycleScenario):
+    name = 'idle'
+
+
+class LongSnakeScenario(CycleScenario):
+    name = 'long_snake'
+    snake_length = 600
+
+
+class FoodBurstScenario(CycleScenario):
+    """Food sits on the next cell every tick, so each move fires the full eat effect stack"""
+    name = 'food_bursts'
+
+    def steer(self, state):
+        super().steer(state)
+        state.food.position = self.next_cell[state.snake.body[0]]
+        state.apples_collected = 0  # Never stop for a powerup selection
+
+
+class DeathZoomScenario(Scenario):
+    """Snake drives into the left wall and the full death zoom plays out.
+
+    The warmup plays one whole death and restarts the game, so the measured
+    death runs with its effects already baked.
+    """
+    name = 'death_zoom'
+    warmup = 240  # Crash after 9 ticks, 2.5 s zoom, game over screen, restart
+    frames = 240  # Second crash and zoom plus the first game over frames
+
+    def setup(self, state, current_time):
+        from snake_engine import LEFT
+
+        place_snake(state, [(8, 15), (9, 15), (10, 15)], LEFT)
+        state.food.position = (20, 5)
+
+    def step(self, state, current_time, frame):
+        if frame == self.warmup - 10:
+            # Restart like Space on the game over screen, skipping the countdown
+            state.game_over = False
+            state.reset_game(current_time)
+            state.countdown_active = False
+            self.setup(state, current_time)
+
+
+class CountdownScenario(Scenario):
+    """Start countdown replayed back to back"""
+    name = 'countdown'
+    warmup = 250  # One whole countdown, so its renders are cached
+    frames = 480
+
+    def setup(self, state, current_time):
+        state.countdown_active = True
+        state.countdown_start_time = current_time
+
+    def step(self, state, current_time, frame):
+        if not state.countdown_active:
+            self.setup(state, current_time)
+
+
+class PowerupSelectionScenario(Scenario):
+    """Powerup selection overlay held open, moving the highlight every 20 frames"""
+    name = 'powerup_selection'
+    frames = 300
+
+    def setup(self, state, current_time):
+        from snake_engine import POWERUP_SELECTION_COUNT, PowerupState
+
+        state.powerup_selection_active = True
+        state.powerup_choices = random.sample(PowerupState.ALL_TYPES, POWERUP_SELECTION_COUNT)
+        state.selected_powerup_index = 0
+
+    def step(self, state, current_time, frame):
+        state.selected_powerup_index = (frame // 20) % len(state.powerup_choices)
+
+
+SCENARIOS = {scenario.name: scenario for scenario in (
+    IdleScenario, LongSnakeScenario, FoodBurstScenario, DeathZoomScenario, CountdownScenario,
+    PowerupSelectionScenario,
+)}
+
+
+class ScenarioDriver:
+    """frame_callback for snake_game.main: starts the game, runs the scenario and times frames"""
+    def __init__(self, scenario, clock, allocation_tracker=None):
+        self.scenario = scenario
+        self.clock = clock
+        self.allocation_tracker = allocation_tracker  # Tracks the measured frames when given
+        self.frame = -1  # Scenario frame, -1 until the game has started
+        self.frame_times = []  # Measured wall-clock milliseconds per frame
+        self.allocations = None  # Allocation summary, taken while the game is still running
+        self.last_frame_start = None
+        self.start_requested = False
+
+    def __call__(self, state, current_time):
+        import pygame
+
+        now = time.perf_counter()
+        self.clock.advance()
+        if not state.game_running:
+            # Title screen: press Start once
+            if not self.start_requested:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN))
+                self.start_requested = True
+            return True
+
+        if self.frame < 0:
+            # Skip the countdown and script the board
+            state.countdown_active = False
+            state.last_move_time = current_time
+            self.scenario.setup(state, current_time)
+        elif self.frame > self.scenario.warmup:
+            self.frame_times.append((now - self.last_frame_start) * 1000)
+        self.last_frame_start = now
+        if self.allocation_tracker is not None:
+            if self.frame == self.scenario.warmup:
+                self.allocation_tracker.restart()
+            elif self.frame > self.scenario.warmup:
+                self.allocation_tracker.end_frame()
+                self.allocation_tracker.begin_frame()
+        self.frame += 1
+        self.scenario.step(state, current_time, self.frame)
+        running = self.frame <= self.scenario.warmup + self.scenario.frames
+        if not running and self.allocation_tracker is not None:
+            self.allocations = self.allocation_tracker.get_summary()
+        return running
+
+
+def get_peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where resource is unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_scenario(name, track_allocations=False):
+    """Run one scenario in this process and return its result dict"""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    os.chdir(REPO_ROOT)  # Assets load relative to the game directory
+
+    import numpy as np
+    import pygame
+    import snake_game
+    from alloc_tracker import AllocationTracker
+
+    random.seed(BENCHMARK_SEED)
+    np.random.seed(BENCHMARK_SEED)
+    clock = SimulatedClock()
+    pygame.time.get_ticks = clock.get_ticks
+    snake_game.FPS = 0  # Render uncapped
+
+    allocation_tracker = None
+    if track_allocations:
+        # Counting from before the game starts, so every Surface and font it makes counts its copies and renders
+        allocation_tracker = AllocationTracker(ignore_files=(os.path.abspath(__file__),))
+        allocation_tracker.set_enabled(True)
+    driver = ScenarioDriver(SCENARIOS[name](), clock, allocation_tracker)
+    started = time.perf_counter()
+    snake_game.main(driver)
+    wall_time = time.perf_counter() - started
+
+    frame_times = driver.frame_times
+    result = {
+        'frames': len(frame_times),
+        'fps': len(frame_times) / (sum(frame_times) / 1000),
+        'frame_ms': {
+            'mean': sum(frame_times) / len(frame_times),
+            'p50': percentile(frame_times, 50),
+            'p95': percentile(frame_times, 95),
+            'p99': percentile(frame_times, 99),
+            'max': max(frame_times),
+        },
+        'peak_rss_mb': get_peak_rss_mb(),
+        'wall_time_s': wall_time,
+    }
+    if allocation_tracker is not None:
+        result['allocations'] = driver.allocations
+        allocation_tracker.set_enabled(False)
+    return result
+
+
+def run_in_subprocess(name, track_allocations=False):
+    """Run one scenario in a fresh interpreter so its peak memory is its own"""
+    handle, path = tempfile.mkstemp(suffix='.json')
+    os.close(handle)
+    command = [sys.executable, os.path.abspath(__file__), '--child', name, '--output', path]
+    if track_allocations:
+        command.append('--allocations')
+    try:
+        # The game's [DEBUG] output is discarded; errors still reach stderr
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        with open(path) as f:
+            return json.load(f)
+    finally:
+        os.remove(path)
+
+
+def get_environment():
+    import numpy as np
+    import pygame
+
+    return {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+
+def find_regressions(results, baseline, tolerance):
+    """Return a message for every scenario that got slower or bigger than the baseline allows"""
+    regressions = []
+    for name, result in results['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None:
+            continue
+        if result['fps'] < base['fps'] * (1 - tolerance):
+            regressions.append(f"{name}: {result['fps']:.1f} FPS vs baseline {base['fps']:.1f}")
+        if result['frame_ms']['p99'] > base['frame_ms']['p99'] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {result['frame_ms']['p99']:.2f}ms vs baseline {base['frame_ms']['p99']:.2f}ms")
+        if (result['peak_rss_mb'] is not None and base.get('peak_rss_mb') is not None and
+                result['peak_rss_mb'] > base['peak_rss_mb'] * (1 + tolerance)):
+            regressions.append(f"{name}: peak RSS {result['peak_rss_mb']:.1f}MB vs baseline {base['peak_rss_mb']:.1f}MB")
+    return regressions
+
+
+def find_budget_overruns(results):
+    """Return a message for every scenario whose per-frame allocations exceed its budget"""
+    overruns = []
+    for name, result in results['scenarios'].items():
+        budget = ALLOCATION_BUDGETS.get(name)
+        allocations = result.get('allocations')
+        if budget is None or allocations is None:
+            continue
+        surfaces = allocations['surfaces_per_frame']['mean']
+        python_kb = allocations['python_bytes_per_frame']['mean'] / 1024
+        retained = allocations['retained_bytes_per_frame']
+        if surfaces > budget['surfaces']:
+            overruns.append(f"{name}: {surfaces:.2f} Surfaces/frame, budget {budget['surfaces']}")
+        if python_kb > budget['python_kb']:
+            overruns.append(f"{name}: {python_kb:.1f} KB/frame allocated, budget {budget['python_kb']}")
+        if retained > budget['retained_bytes']:
+            overruns.append(f"{name}: {retained:.0f} B/frame retained, budget {budget['retained_bytes']}")
+    return overruns
+
+
+def print_allocation_report(results):
+    print(f"{'scenario':<18} {'surf/f':>8} {'surf KB/f':>10} {'py KB/f':>8} {'py p95':>8} {'kept B/f':>9}")
+    for name, result in results['scenarios'].items():
+        allocations = result['allocations']
+        python_bytes = allocations['python_bytes_per_frame']
+        print(f"{name:<18} {allocations['surfaces_per_frame']['mean']:>8.3f} "
+              f"{allocations['surface_bytes_per_frame']['mean'] / 1024:>10.1f} "
+              f"{python_bytes['mean'] / 1024:>8.1f} {python_bytes['p95'] / 1024:>8.1f} "
+              f"{allocations['retained_bytes_per_frame']:>9.0f}")
+        for site in allocations['surface_sites'][:3]:
+            print(f"    {site['site']}: {site['surfaces_per_frame']:.3f} Surfaces/frame")
+
+
+def print_report(results, baseline):
+    print(f"{'scenario':<18} {'FPS':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'RSS MB':>8} {'vs base':>8}")
+    for name, result in results['scenarios'].items():
+        frame_ms = result['frame_ms']
+        rss = f"{result['peak_rss_mb']:.1f}" if result['peak_rss_mb'] is not None else '-'
+        base = baseline.get('scenarios', {}).get(name) if baseline else None
+        change = f"{result['fps'] / base['fps'] - 1:+.0%}" if base else '-'
+        print(f"{name:<18} {result['fps']:>8.1f} {frame_ms['p50']:>8.2f} {frame_ms['p95']:>8.2f} "
+              f"{frame_ms['p99']:>8.2f} {rss:>8} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless end-to-end rendering benchmarks')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='scenario to run (repeatable, default: all)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='where to write the results JSON')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed relative regression before failing (default: %(default)s)')
+    parser.add_argument('--allocations', action='store_true',
+                        help='track per-frame allocations and check them against the allocation budgets')
+    parser.add_argument('--child', metavar='SCENARIO', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        with open(args.output, 'w') as f:
+            json.dump(run_scenario(args.child, args.allocations), f)
+        return 0
+
+    results = {'environment': get_environment(), 'scenarios': {}}
+    for name in args.scenario or SCENARIOS:
+        print(f"Running {name}...", flush=True)
+        results['scenarios'][name] = run_in_subprocess(name, args.allocations)
+
+    output = DEFAULT_ALLOCATION_OUTPUT if args.allocations and args.output == DEFAULT_OUTPUT else args.output
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    if args.allocations:
+        # tracemalloc skews frame times, so allocation runs are only checked against their budgets
+        print_allocation_report(results)
+        print(f"Results written to {output}")
+        overruns = find_budget_overruns(results)
+        for message in overruns:
+            print(f"OVER BUDGET {message}")
+        return 1 if overruns else 0
+
+    baseline = None
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_report(results, baseline)
+    print(f"Results written to {output}")
+    if baseline is None:
+        return 0
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Per-phase frame profiler for the game loop.
+
+The loop calls begin_frame() once, mark(name) at the end of each phase and
+end_frame() after the frame is presented. Each mark attributes the time since
+the previous mark to that phase, measured with time.perf_counter_ns. Rolling
+windows feed the on-screen HUD, and recent frames can be exported as Chrome
+trace-event JSON (chrome://tracing, Perfetto) or CSV. When disabled every call
+returns immediately, so the markers can stay in the loop permanently.
+
+This module is pygame-free; snake_game.py draws the HUD.
+"""
+import csv
+import json
+import time
+from collections import deque
+
+# ===== PROFILER CONSTANTS =====
+PROFILER_WINDOW = 120  # Frames kept for rolling averages and percentiles
+PROFILER_TRACE_FRAMES = 600  # Frames kept for trace/CSV export
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty sequence"""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil without floats
+    return ordered[int(rank) - 1]
+
+
+class FrameProfiler:
+    """Times named phases of each frame and keeps rolling statistics"""
+    def __init__(self, enabled=False, window=PROFILER_WINDOW, trace_frames=PROFILER_TRACE_FRAMES):
+        self.enabled = enabled
+        self.window = window
+        self.phase_samples = {}  # phase name -> deque of per-frame nanoseconds
+        self.frame_samples = deque(maxlen=window)  # Whole-frame nanoseconds
+        self.trace = deque(maxlen=trace_frames)  # Per frame: [(phase, start ns, duration ns), ...]
+        self.origin = time.perf_counter_ns()
+        self.frame_start = self.origin
+        self.last_mark = self.origin
+        self.current = []
+        self.frame_count = 0
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        # Start a fresh frame so time spent while disabled is never attributed
+        self.frame_start = self.last_mark = time.perf_counter_ns()
+        self.current = []
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame_start = self.last_mark = time.perf_counter_ns()
+        self.current = []
+
+    def mark(self, name):
+        """Close the phase that started at the previous mark"""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        self.current.append((name, self.last_mark, now - self.last_mark))
+        self.last_mark = now
+
+    def end_frame(self):
+        if not self.enabled or not self.current:
+            return
+        totals = {}
+        for name, start, duration in self.current:
+            totals[name] = totals.get(name, 0) + duration
+        for name, total in totals.items():
+            samples = self.phase_samples.get(name)
+            if samples is None:
+                samples = self.phase_samples[name] = deque(maxlen=self.window)
+            samples.append(total)
+        self.frame_samples.append(self.last_mark - self.frame_start)
+        self.trace.append(self.current)
+        self.current = []
+        self.frame_count += 1
+
+    def get_summary(self):
+        """Return (frame row, phase rows); rows are (name, mean ms, p95 ms, p99 ms), slowest phase first"""
+        def row(name, samples):
+            return (name, sum(samples) / len(samples) / 1e6,
+                    percentile(samples, 95) / 1e6, percentile(samples, 99) / 1e6)
+
+        if not self.frame_samples:
+            return None, []
+        phases = [row(name, samples) for name, samples in self.phase_samples.items() if samples]
+        phases.sort(key=lambda phase: phase[1], reverse=True)
+        return row('frame', self.frame_samples), phases
+
+    def export_chrome_trace(self, path):
+        """Write recent frames as Chrome trace-event JSON (complete 'X' events, microseconds)"""
+        events = []
+        for frame_index, frame in enumerate(self.trace):
+            for name, start, duration in frame:
+                events.append({
+                    'name': name,
+                    'cat': 'frame',
+                    'ph': 'X',
+                    'ts': (start - self.origin) / 1000,
+                    'dur': duration / 1000,
+                    'pid': 1,
+                    'tid': 1,
+                    'args': {'frame': frame_index},
+                })
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+    def export_csv(self, path):
+        """Write recent frames as frame,phase,start_us,duration_us rows"""
+        rows = 0
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'phase', 'start_us', 'duration_us'])
+            for frame_index, frame in enumerate(self.trace):
+                for name, start, duration in frame:
+                    writer.writerow([frame_index, name, (start - self.origin) / 1000, duration / 1000])
+                    rows += 1
+        return rows
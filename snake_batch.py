@@ -0,0 +1,434 @@
+"""NumPy batch environment: thousands of Snake Survivor games stepped in lockstep.
+
+Every game lives in a row of batched arrays (snake body ring buffer, occupancy
+and obstacle grids, food cell, powerup timers), and step() applies the same
+rules as snake_engine.run_move_tick() to all rows at once with no per-game
+Python loop. Cells are stored as flat indices (y * GRID_SIZE + x).
+"""
+import numpy as np
+
+from snake_engine import (
+    GRID_SIZE, MOVE_DELAY, SPEED_BOOST_FACTOR, SNAKE_START_X, SNAKE_START_Y, OBSTACLE_COUNT,
+    FOOD_POINTS, DOUBLE_POINTS_USES, POWERUP_SELECTION_INTERVAL, POWERUP_SELECTION_COUNT,
+    UP, DOWN, LEFT, RIGHT, ObstacleField, PowerupState,
+)
+
+CELL_COUNT = GRID_SIZE * GRID_SIZE
+
+# ===== ACTION CODES =====
+NO_ACTION = -1  # Keep going straight
+BATCH_DIRECTIONS = [UP, DOWN, LEFT, RIGHT]  # Action code -> direction tuple
+DIRECTION_DX = np.array([d[0] for d in BATCH_DIRECTIONS], dtype=np.int16)
+DIRECTION_DY = np.array([d[1] for d in BATCH_DIRECTIONS], dtype=np.int16)
+OPPOSITE_CODES = np.array([1, 0, 3, 2], dtype=np.int8)
+
+# ===== POWERUP CODES (index into PowerupState.ALL_TYPES) =====
+POWERUP_SHIELD = PowerupState.ALL_TYPES.index(PowerupState.SHIELD)
+POWERUP_DOUBLE_POINTS = PowerupState.ALL_TYPES.index(PowerupState.DOUBLE_POINTS)
+POWERUP_GHOST_MODE = PowerupState.ALL_TYPES.index(PowerupState.GHOST_MODE)
+POWERUP_SPEED_BOOST = PowerupState.ALL_TYPES.index(PowerupState.SPEED_BOOST)
+
+# ===== COLLISION CODES =====
+COLLISION_NONE = 0
+COLLISION_WALL = 1
+COLLISION_OBSTACLE = 2
+COLLISION_SELF = 3
+COLLISION_TYPES = [None, 'wall', 'obstacle', 'self']  # Code -> TickResult.collision_type
+
+NO_FOOD = -1  # Food cell when the board is completely full
+OBSTACLE_ANCHOR_DRAWS = 4  # Rejection-sampling rounds per obstacle before ranking the valid anchors
+
+# Snake start body, tail first, as flat cells
+_START_CELLS = np.array([(SNAKE_START_Y + 2 - i) * GRID_SIZE + SNAKE_START_X for i in range(3)], dtype=np.int16)
+
+
+def _build_base_anchors():
+    """Anchors where ObstacleField.generate may place each shape on an empty board.
+
+    Returns a (shape, cell) mask, the anchor count per shape and a (shape, slot)
+    table of the anchor cells, padded to the longest list.
+    """
+    base_anchors = ObstacleField.get_base_anchors(GRID_SIZE)
+    masks = np.zeros((len(base_anchors), CELL_COUNT), dtype=bool)
+    counts = np.array([len(anchors) for anchors in base_anchors])
+    cells = np.zeros((len(base_anchors), counts.max()), dtype=np.int64)
+    for shape_index, anchors in enumerate(base_anchors):
+        shape_cells = [y * GRID_SIZE + x for x, y in anchors]
+        masks[shape_index, shape_cells] = True
+        cells[shape_index, :len(shape_cells)] = shape_cells
+    return masks, counts, cells
+
+
+def _get_valid_anchors(blocked):
+    """(shape, game, cell) mask of anchors whose whole footprint avoids the (game, cell) blocked cells"""
+    games = blocked.shape[0]
+    blocked = blocked.reshape(-1, GRID_SIZE, GRID_SIZE)
+    valid = np.empty((len(ObstacleField.SHAPES), games, CELL_COUNT), dtype=bool)
+    for shape_index, ((width, height), _) in enumerate(ObstacleField.SHAPES):
+        # An anchor is covered when any cell of the footprint to its right/below is blocked
+        covered = np.zeros_like(blocked)
+        for dx in range(width):
+            for dy in range(height):
+                covered[:, :GRID_SIZE - dy, :GRID_SIZE - dx] |= blocked[:, dy:, dx:]
+        valid[shape_index] = _BASE_ANCHORS[shape_index] & ~covered.reshape(games, CELL_COUNT)
+    return valid
+
+
+def _pad_offsets(offset_lists):
+    """Cell offset lists as one int table, padded with 0, plus a mask of the real entries"""
+    table = np.zeros((len(offset_lists), max(len(offsets) for offsets in offset_lists)), dtype=np.int64)
+    mask = np.zeros(table.shape, dtype=bool)
+    for row, offsets in enumerate(offset_lists):
+        table[row, :len(offsets)] = offsets
+        mask[row, :len(offsets)] = True
+    return table, mask
+
+
+def _build_overlap_offsets(footprints):
+    """Per shape, a (placed shape, slot) table of the anchor offsets from a placed
+    shape's anchor whose footprint overlaps the placed one (the edge margin keeps
+    obstacles away from the sides, so these offsets never wrap across rows)
+    """
+    return [_pad_offsets([sorted({cell - own for cell in placed for own in footprint}) for placed in footprints])
+            for footprint in footprints]
+
+
+_BASE_ANCHORS, _BASE_ANCHOR_COUNTS, _BASE_ANCHOR_CELLS = _build_base_anchors()
+_SHAPE_WEIGHTS = np.array([weight for _, weight in ObstacleField.SHAPES])
+_FOOTPRINTS = [[dy * GRID_SIZE + dx for dx in range(width) for dy in range(height)]
+               for (width, height), _ in ObstacleField.SHAPES]
+_FOOTPRINT_OFFSETS, _FOOTPRINT_MASK = _pad_offsets(_FOOTPRINTS)  # Cells of each shape from its anchor
+_OVERLAP_OFFSETS = _build_overlap_offsets(_FOOTPRINTS)
+_START_OCCUPIED = np.zeros((1, CELL_COUNT), dtype=bool)
+_START_OCCUPIED[0, _START_CELLS] = True
+_START_VALID_ANCHORS = _get_valid_anchors(_START_OCCUPIED)  # Every new game starts from this board
+_START_ANCHOR_COUNTS = _START_VALID_ANCHORS.sum(axis=2)[:, 0]
+_START_ANCHOR_CELLS = np.stack([np.resize(np.flatnonzero(anchors[0]), _START_ANCHOR_COUNTS.max())
+                                for anchors in _START_VALID_ANCHORS])  # (shape, slot), padded by repeating
+# Most anchors of any shape one placed obstacle can rule out
+_MAX_OVERLAPS = max(overlap_mask.sum(axis=1).max() for _, overlap_mask in _OVERLAP_OFFSETS)
+
+
+class BatchTickResult:
+    """Per-game outcome arrays of one BatchSnakeEngine.step()"""
+    def __init__(self, collision, shield_broken, died, points, powerup_offered):
+        self.collision = collision  # COLLISION_* code per game
+        self.shield_broken = shield_broken
+        self.died = died
+        self.points = points
+        self.powerup_offered = powerup_offered
+
+
+class BatchSnakeEngine:
+    """N independent SnakeEngine games stored in NumPy arrays and stepped together"""
+    def __init__(self, num_envs, seed=None, obstacle_count=OBSTACLE_COUNT):
+        self.num_envs = num_envs
+        self.obstacle_count = obstacle_count
+        self.rng = np.random.default_rng(seed)
+        self._rows = np.arange(num_envs)
+
+        # Snake body ring buffer: head at body[head_index], tail length - 1 slots behind it
+        self.body = np.zeros((num_envs, CELL_COUNT), dtype=np.int16)
+        self.head_index = np.zeros(num_envs, dtype=np.int32)
+        self.length = np.zeros(num_envs, dtype=np.int32)
+        self.occupied = np.zeros((num_envs, CELL_COUNT), dtype=bool)  # Snake body cells
+        self.obstacles = np.zeros((num_envs, CELL_COUNT), dtype=bool)
+        self.obstacle_shapes = np.zeros(num_envs, dtype=np.int32)  # Shapes placed (len(ObstacleField.shapes))
+        self.food = np.zeros(num_envs, dtype=np.int16)
+
+        self.direction = np.zeros(num_envs, dtype=np.int8)
+        self.queued_direction = np.full(num_envs, NO_ACTION, dtype=np.int8)  # 1-slot input buffer
+        self.grow_pending = np.zeros(num_envs, dtype=bool)
+
+        self.score = np.zeros(num_envs, dtype=np.int32)
+        self.apples_collected = np.zeros(num_envs, dtype=np.int32)
+        self.current_time = np.zeros(num_envs, dtype=np.int64)
+        self.ticks = np.zeros(num_envs, dtype=np.int64)
+        self.game_over = np.zeros(num_envs, dtype=bool)
+
+        # Powerups: stackable counts for use-based types, end times for timed types
+        self.shields = np.zeros(num_envs, dtype=np.int16)
+        self.double_points_uses = np.zeros(num_envs, dtype=np.int16)
+        self.ghost_mode_end = np.zeros(num_envs, dtype=np.int64)
+        self.speed_boost_end = np.zeros(num_envs, dtype=np.int64)
+        self.powerup_selection_active = np.zeros(num_envs, dtype=bool)
+        self.powerup_choices = np.zeros((num_envs, POWERUP_SELECTION_COUNT), dtype=np.int8)
+        self.selected_powerup_index = np.zeros(num_envs, dtype=np.int8)
+
+        # Obstacle layouts for new games, generated a batch at a time (see _take_layouts)
+        self._layout_obstacles = np.zeros((0, CELL_COUNT), dtype=bool)
+        self._layout_shapes = np.zeros(0, dtype=np.int32)
+
+        self.reset()
+
+    def reset(self, mask=None):
+        """Start new games for every row in mask (all rows when mask is None)"""
+        envs = self._rows if mask is None else np.flatnonzero(mask)
+        if envs.size == 0:
+            return
+
+        self.occupied[envs] = False
+        self.obstacles[envs], self.obstacle_shapes[envs] = self._take_layouts(envs.size)
+        self.body[envs, :3] = _START_CELLS
+        self.occupied[envs[:, None], _START_CELLS] = True
+        self.head_index[envs] = 2
+        self.length[envs] = 3
+
+        self.direction[envs] = BATCH_DIRECTIONS.index(UP)
+        self.queued_direction[envs] = NO_ACTION
+        self.grow_pending[envs] = False
+        self.score[envs] = 0
+        self.apples_collected[envs] = 0
+        self.current_time[envs] = 0
+        self.ticks[envs] = 0
+        self.game_over[envs] = False
+
+        self.shields[envs] = 0
+        self.double_points_uses[envs] = 0
+        self.ghost_mode_end[envs] = 0
+        self.speed_boost_end[envs] = 0
+        self.powerup_selection_active[envs] = False
+        self.selected_powerup_index[envs] = 0
+
+        self._spawn_food(envs)
+
+    def reset_done(self):
+        """Restart every game that has ended"""
+        self.reset(self.game_over)
+
+    def _take_layouts(self, count):
+        """Obstacle grids and shape counts for count new games.
+
+        Obstacle generation costs OBSTACLE_COUNT rounds of whole-array passes
+        however few games it serves, so layouts are generated at least
+        num_envs at a time and handed out from the leftovers on later resets.
+        Every new game starts from the same board, so each is still an
+        independent ObstacleField.generate draw.
+        """
+        missing = count - self._layout_shapes.size
+        if missing > 0:
+            obstacles, shapes = self._generate_layouts(max(missing, self.num_envs))
+            self._layout_obstacles = np.concatenate([self._layout_obstacles, obstacles])
+            self._layout_shapes = np.concatenate([self._layout_shapes, shapes])
+        obstacles, self._layout_obstacles = self._layout_obstacles[:count], self._layout_obstacles[count:]
+        shapes, self._layout_shapes = self._layout_shapes[:count], self._layout_shapes[count:]
+        return obstacles, shapes
+
+    def _sample_anchors(self, valid, shape, games):
+        """Uniform valid anchor of the chosen shape for each listed game (0 for the others)"""
+        anchor = np.zeros(shape.size, dtype=np.int64)
+        # Rejection sampling over the shape's base anchors: cheap while most of them are still free
+        for _ in range(OBSTACLE_ANCHOR_DRAWS):
+            if games.size == 0:
+                return anchor
+            game_shapes = shape[games]
+            slots = (self.rng.random(games.size) * _BASE_ANCHOR_COUNTS[game_shapes]).astype(np.int64)
+            candidates = _BASE_ANCHOR_CELLS[game_shapes, slots]
+            hit = valid[game_shapes, games, candidates]
+            anchor[games[hit]] = candidates[hit]
+            games = games[~hit]
+        if games.size:
+            # Crowded boards: pick by rank among the remaining valid anchors
+            counts = np.cumsum(valid[shape[games], games], axis=1)
+            ranks = (self.rng.random(games.size) * counts[:, -1]).astype(np.int64)
+            anchor[games] = np.argmax(counts > ranks[:, None], axis=1)
+        return anchor
+
+    def _generate_layouts(self, count):
+        """Vectorized ObstacleField.generate around the start snake for count games.
+
+        One shape per game per round, drawn from the anchors where it fits.
+        Returns the (game, cell) obstacle grids and the shapes placed per game.
+        """
+        if self.obstacle_count * _MAX_OVERLAPS < _START_ANCHOR_COUNTS.min():
+            return self._generate_sparse_layouts(count)
+        obstacles = np.zeros((count, CELL_COUNT), dtype=bool)
+        obstacle_shapes = np.zeros(count, dtype=np.int32)
+        valid = np.repeat(_START_VALID_ANCHORS, count, axis=1)
+        anchor_counts = valid.sum(axis=2)  # (shape, game) valid anchors left
+        flat_obstacles = obstacles.reshape(-1)
+        flat_valid = valid.reshape(len(ObstacleField.SHAPES), -1)
+        for _ in range(self.obstacle_count):
+            # Randomly decide shape among those that still fit somewhere
+            weights = (anchor_counts > 0).T * _SHAPE_WEIGHTS
+            cumulative = np.cumsum(weights, axis=1)
+            room = cumulative[:, -1] > 0  # Otherwise the board is full
+            if not room.any():
+                break
+            picks = self.rng.random(count) * cumulative[:, -1]
+            shape = np.minimum((picks[:, None] >= cumulative).sum(axis=1), len(ObstacleField.SHAPES) - 1)
+
+            games = np.flatnonzero(room)
+            anchor = self._sample_anchors(valid, shape, games)[games]
+            placed = shape[games]
+
+            # Mark the footprint, then drop every anchor of every shape whose footprint overlaps it
+            # (flat (game, cell) indices: one fancy index per shape instead of one per cell pair)
+            anchor_cells = (games * CELL_COUNT + anchor)[:, None]
+            mask = _FOOTPRINT_MASK[placed]
+            flat_obstacles[(anchor_cells + _FOOTPRINT_OFFSETS[placed])[mask]] = True
+            for shape_index, (offsets, overlap_mask) in enumerate(_OVERLAP_OFFSETS):
+                mask = overlap_mask[placed]
+                cells = (anchor_cells + offsets[placed])[mask]
+                shape_valid = flat_valid[shape_index]
+                covered = cells[shape_valid[cells]]
+                anchor_counts[shape_index] -= np.bincount(covered // CELL_COUNT, minlength=count)
+                shape_valid[covered] = False
+            obstacle_shapes[room] += 1
+        return obstacles, obstacle_shapes
+
+    def _generate_sparse_layouts(self, count):
+        """_generate_layouts for obstacle counts too low to ever rule out every anchor
+        of a shape: every shape always fits, so the shape draw uses the plain weights
+        and anchors are rejection-sampled against the obstacle grid alone
+        """
+        obstacles = np.zeros((count, CELL_COUNT), dtype=bool)
+        flat_obstacles = obstacles.reshape(-1)
+        cumulative = np.cumsum(_SHAPE_WEIGHTS)
+        game_cells = np.arange(count) * CELL_COUNT
+        for _ in range(self.obstacle_count):
+            picks = self.rng.random(count) * cumulative[-1]
+            shape = np.minimum(np.searchsorted(cumulative, picks, side='right'), len(ObstacleField.SHAPES) - 1)
+            anchor_cells = np.zeros(count, dtype=np.int64)
+            games = np.arange(count)
+            while games.size:
+                game_shapes = shape[games]
+                slots = (self.rng.random(games.size) * _START_ANCHOR_COUNTS[game_shapes]).astype(np.int64)
+                candidates = game_cells[games] + _START_ANCHOR_CELLS[game_shapes, slots]
+                cells = candidates[:, None] + _FOOTPRINT_OFFSETS[game_shapes]
+                hit = ~(flat_obstacles[cells] & _FOOTPRINT_MASK[game_shapes]).any(axis=1)
+                anchor_cells[games[hit]] = candidates[hit]
+                games = games[~hit]
+            flat_obstacles[(anchor_cells[:, None] + _FOOTPRINT_OFFSETS[shape])[_FOOTPRINT_MASK[shape]]] = True
+        return obstacles, np.full(count, self.obstacle_count, dtype=np.int32)
+
+    def _spawn_food(self, envs):
+        """Pick a uniformly random free cell for each game (NO_FOOD on a full board)"""
+        if envs.size == 0:
+            return
+        keys = self.rng.random((envs.size, CELL_COUNT))
+        keys[self.occupied[envs] | self.obstacles[envs]] = -1.0
+        cells = np.argmax(keys, axis=1)
+        full = keys[np.arange(envs.size), cells] < 0
+        self.food[envs] = np.where(full, NO_FOOD, cells)
+
+    def _choose_powerups(self, envs, choices):
+        """Activate the chosen card for each game in envs"""
+        picked = self.powerup_choices[envs, choices]
+        now = self.current_time[envs]
+        self.shields[envs] += picked == POWERUP_SHIELD
+        self.double_points_uses[envs] += np.where(picked == POWERUP_DOUBLE_POINTS, DOUBLE_POINTS_USES, 0).astype(np.int16)
+        ghost_end = now + PowerupState.DURATIONS[PowerupState.GHOST_MODE]
+        speed_end = now + PowerupState.DURATIONS[PowerupState.SPEED_BOOST]
+        self.ghost_mode_end[envs] = np.where(picked == POWERUP_GHOST_MODE,
+                                             np.maximum(self.ghost_mode_end[envs], ghost_end), self.ghost_mode_end[envs])
+        self.speed_boost_end[envs] = np.where(picked == POWERUP_SPEED_BOOST,
+                                              np.maximum(self.speed_boost_end[envs], speed_end), self.speed_boost_end[envs])
+        self.powerup_selection_active[envs] = False
+        self.selected_powerup_index[envs] = 0
+
+    def step(self, actions=None, powerup_choices=None):
+        """Run one movement tick in every live game and return a BatchTickResult.
+
+        actions holds one action code per game (NO_ACTION or an index into
+        BATCH_DIRECTIONS). Games with an open powerup selection take the card in
+        powerup_choices instead (the highlighted card when None), then move.
+        Finished games are left untouched until reset.
+        """
+        rows = self._rows
+        live = ~self.game_over
+
+        # Powerup selection replaces the turn input for this tick
+        selecting = live & self.powerup_selection_active
+        if selecting.any():
+            envs = np.flatnonzero(selecting)
+            if powerup_choices is None:
+                choices = self.selected_powerup_index[envs]
+            else:
+                choices = np.asarray(powerup_choices)[envs] % POWERUP_SELECTION_COUNT
+            self._choose_powerups(envs, choices)
+
+        # Snake.change_direction: no reversal, no repeat, 1 buffered input
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int8)
+            compare = np.where(self.queued_direction >= 0, self.queued_direction, self.direction)
+            turn = (live & ~selecting & (actions >= 0) & (self.queued_direction < 0) &
+                    (actions != compare) & (actions != OPPOSITE_CODES[compare]))
+            self.queued_direction[turn] = actions[turn]
+
+        # Powerups are judged at the time the tick starts, like the expiry cleanup in main()
+        ghost_mode = self.current_time < self.ghost_mode_end
+        speed_boost = self.current_time < self.speed_boost_end
+        shield = self.shields > 0
+        move_delay = np.where(speed_boost, int(MOVE_DELAY * SPEED_BOOST_FACTOR), MOVE_DELAY)
+        self.current_time += np.where(live, move_delay, 0)
+        self.ticks += live
+
+        # Predict next head position before moving
+        head = self.body[rows, self.head_index]
+        tail = self.body[rows, (self.head_index - self.length + 1) % CELL_COUNT]
+        next_dir = np.where(self.queued_direction >= 0, self.queued_direction, self.direction)
+        next_x = head % GRID_SIZE + DIRECTION_DX[next_dir]
+        next_y = head // GRID_SIZE + DIRECTION_DY[next_dir]
+        in_bounds = (next_x >= 0) & (next_x < GRID_SIZE) & (next_y >= 0) & (next_y < GRID_SIZE)
+        next_head = np.where(in_bounds, next_y * GRID_SIZE + next_x, 0)
+
+        wall = live & ~in_bounds
+        obstacle = live & in_bounds & self.obstacles[rows, next_head]
+        # Tail is excluded since it moves away during the move
+        self_hit = (live & in_bounds & ~obstacle & ~ghost_mode &
+                    self.occupied[rows, next_head] & (next_head != tail))
+        collision = wall | obstacle | self_hit
+
+        # Only move if no collision, OR if a shield will absorb a wall/obstacle hit
+        do_move = live & (~collision | (shield & (wall | obstacle)))
+        consume = do_move & (self.queued_direction >= 0)
+        self.direction[consume] = self.queued_direction[consume]
+        self.queued_direction[do_move] = NO_ACTION
+
+        # Snake.move refuses walls and any body cell (including the tail)
+        moved = np.flatnonzero(do_move & in_bounds & ~self.occupied[rows, next_head])
+        new_index = (self.head_index[moved] + 1) % CELL_COUNT
+        self.body[moved, new_index] = next_head[moved]
+        self.head_index[moved] = new_index
+        self.occupied[moved, next_head[moved]] = True
+        shrink = moved[~self.grow_pending[moved]]
+        self.occupied[shrink, tail[shrink]] = False
+        grown = moved[self.grow_pending[moved]]
+        self.length[grown] += 1
+        self.grow_pending[grown] = False
+
+        # Shield breaks and absorbs the collision, otherwise the game ends
+        shield_broken = collision & shield
+        self.shields[shield_broken] -= 1
+        died = collision & ~shield
+        self.game_over |= died
+
+        # Check food collision
+        eaten = live & ~collision & (self.body[rows, self.head_index] == self.food)
+        double_points = eaten & (self.double_points_uses > 0)
+        self.double_points_uses[double_points] -= 1
+        points = np.where(eaten, np.where(double_points, FOOD_POINTS * 2, FOOD_POINTS), 0)
+        self.score += points
+        self.grow_pending |= eaten
+        eaten_envs = np.flatnonzero(eaten)
+        self._spawn_food(eaten_envs)
+        self.apples_collected[eaten_envs] += 1
+
+        # Trigger powerup selection every 3 apples
+        offered = eaten & (self.apples_collected % POWERUP_SELECTION_INTERVAL == 0) & ~self.powerup_selection_active
+        offered_envs = np.flatnonzero(offered)
+        if offered_envs.size:
+            shuffled = np.argsort(self.rng.random((offered_envs.size, len(PowerupState.ALL_TYPES))), axis=1)
+            self.powerup_choices[offered_envs] = shuffled[:, :POWERUP_SELECTION_COUNT]
+            self.selected_powerup_index[offered_envs] = 1  # Start with middle option selected
+            self.powerup_selection_active[offered_envs] = True
+
+        collision_code = np.select([wall, obstacle, self_hit],
+                                   [COLLISION_WALL, COLLISION_OBSTACLE, COLLISION_SELF], COLLISION_NONE)
+        return BatchTickResult(collision_code, shield_broken, died, points, offered)
+
+    def get_body(self, env):
+        """Body cells of one game as (x, y) tuples, head first (SnakeModel.body order)"""
+        indices = (self.head_index[env] - np.arange(self.length[env])) % CELL_COUNT
+        return [(int(c) % GRID_SIZE, int(c) // GRID_SIZE) for c in self.body[env, indices]]
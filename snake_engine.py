@@ -0,0 +1,691 @@
+"""Headless Snake Survivor rules engine.
+
+Everything in this module is pygame-free: movement, collision prediction,
+shield absorption, food scoring, double points and powerup selection live here
+and are shared by the windowed game in snake_game.py and by SnakeEngine, which
+steps whole games without a display for bots, testing and score validation.
+"""
+import random
+from array import array
+from collections import deque
+
+# ===== GRID CONSTANTS =====
+GRID_SIZE = 30
+
+# ===== GAME TIMING CONSTANTS =====
+MOVE_DELAY = 100  # milliseconds between moves (10 moves/second)
+SPEED_BOOST_FACTOR = 0.5  # Speed boost halves the move delay
+
+# ===== INPUT CONSTANTS =====
+INPUT_BUFFER_LIMIT = 2  # Pending turns held for upcoming ticks (enough to chain a quick U-turn)
+LATENCY_SAMPLE_LIMIT = 1024  # Most recent input-to-move latencies kept for reporting
+
+# ===== SNAKE CONSTANTS =====
+SNAKE_START_X = 15
+SNAKE_START_Y = 15
+SNAKE_START_LENGTH = 3
+OBSTACLE_START_AREA_MIN_X = 16
+OBSTACLE_START_AREA_MAX_X = 20
+OBSTACLE_START_AREA_MIN_Y = 13
+OBSTACLE_START_AREA_MAX_Y = 17
+OBSTACLE_COUNT = 15
+
+# ===== SCORING CONSTANTS =====
+FOOD_POINTS = 10
+DOUBLE_POINTS_USES = 5
+
+# ===== POWERUP CONSTANTS =====
+POWERUP_SELECTION_INTERVAL = 3  # every N apples
+POWERUP_SELECTION_COUNT = 3  # 3 choices per selection
+
+# ===== DIRECTIONS =====
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+
+# ===== DIRECTION UTILITIES =====
+OPPOSITE_DIRECTIONS = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+
+# ===== DEATH REASONS (shown on the Game Over screen) =====
+DEATH_REASONS = {
+    'wall': "You hit the wall!",
+    'obstacle': "You crashed into an obstacle!",
+    'self': "You ran into yourself!",
+}
+
+
+class OccupancyGrid:
+    """Per-cell layer flags for the board, answering collision checks in O(1).
+
+    The snake and obstacle field share one grid and keep it in sync as the head
+    and tail move, so lookups cost the same for a 3-segment or 800-segment snake.
+    The grid also indexes its empty cells (swap-remove list plus slot map) so
+    food can be placed on a uniformly random free cell in O(1).
+    """
+    SNAKE = 1
+    OBSTACLE = 2
+
+    def __init__(self, size=GRID_SIZE):
+        self.size = size
+        self.cells = bytearray(size * size)
+        self._rebuild_free_cells()
+
+    def _rebuild_free_cells(self):
+        self.free_cells = [cell for cell, value in enumerate(self.cells) if not value]
+        self.free_slots = array('i', [-1]) * len(self.cells)  # Index into free_cells, -1 if occupied
+        for slot, cell in enumerate(self.free_cells):
+            self.free_slots[cell] = slot
+
+    def _take_free_cell(self, cell):
+        slot = self.free_slots[cell]
+        last = self.free_cells.pop()
+        if last != cell:
+            self.free_cells[slot] = last
+            self.free_slots[last] = slot
+        self.free_slots[cell] = -1
+
+    def _release_free_cell(self, cell):
+        self.free_slots[cell] = len(self.free_cells)
+        self.free_cells.append(cell)
+
+    def clear(self, layer=None):
+        """Clear one layer, or every layer when layer is None"""
+        if layer is None:
+            self.cells = bytearray(self.size * self.size)
+        else:
+            keep = 0xFF & ~layer
+            self.cells = self.cells.translate(bytes(value & keep for value in range(256)))
+        self._rebuild_free_cells()
+
+    def in_bounds(self, position):
+        x, y = position
+        return 0 <= x < self.size and 0 <= y < self.size
+
+    def add(self, position, layer):
+        x, y = position
+        cell = y * self.size + x
+        if not self.cells[cell]:
+            self._take_free_cell(cell)
+        self.cells[cell] |= layer
+
+    def remove(self, position, layer):
+        x, y = position
+        cell = y * self.size + x
+        if self.cells[cell]:
+            self.cells[cell] &= ~layer
+            if not self.cells[cell]:
+                self._release_free_cell(cell)
+
+    def has(self, position, layer):
+        """True if position is on the board and covered by layer"""
+        x, y = position
+        size = self.size
+        return 0 <= x < size and 0 <= y < size and self.cells[y * size + x] & layer != 0
+
+    def free_count(self):
+        return len(self.free_cells)
+
+    def random_free_cell(self, rng=random):
+        """Uniformly random empty cell as (x, y), or None when the board is full"""
+        if not self.free_cells:
+            return None
+        cell = self.free_cells[rng.randrange(len(self.free_cells))]
+        return (cell % self.size, cell // self.size)
+
+
+class SnakeBody:
+    """Ring buffer of (x, y) segments, head first, with O(1) head insert and tail pop.
+
+    Coordinates live in one compact array of x, y pairs and the body indexes
+    like a list (body[0] is the head, body[-1] the tail), so renderers keep
+    their indexed access while a long snake never shifts memory on a move.
+    """
+    def __init__(self, segments=(), capacity=GRID_SIZE * GRID_SIZE):
+        self.capacity = max(1, capacity)
+        self.coords = array('h', bytes(4 * self.capacity))  # x, y per slot
+        self.head = 0  # Slot holding body[0]
+        self.length = 0
+        for segment in reversed(list(segments)):
+            self.appendleft(segment)
+
+    def _slot(self, index):
+        length = self.length
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('snake body index out of range')
+        return 2 * ((self.head + index) % self.capacity)
+
+    def _resize(self):
+        """Double the capacity, unrolling the ring so the head sits in slot 0"""
+        ordered = self.to_array()
+        self.capacity *= 2
+        self.coords = ordered + array('h', bytes(4 * self.capacity - 2 * len(ordered)))
+        self.head = 0
+
+    def appendleft(self, segment):
+        """Insert a new head segment"""
+        if self.length == self.capacity:
+            self._resize()
+        self.head = (self.head - 1) % self.capacity
+        slot = 2 * self.head
+        self.coords[slot], self.coords[slot + 1] = segment
+        self.length += 1
+
+    def pop(self):
+        """Remove and return the tail segment"""
+        slot = self._slot(-1)
+        self.length -= 1
+        return (self.coords[slot], self.coords[slot + 1])
+
+    def to_array(self):
+        """Body as one contiguous array('h') of x, y pairs, head first"""
+        start = 2 * self.head
+        end = start + 2 * self.length
+        if end <= 2 * self.capacity:
+            return self.coords[start:end]
+        return self.coords[start:] + self.coords[:end - 2 * self.capacity]
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        slot = self._slot(index)
+        return (self.coords[slot], self.coords[slot + 1])
+
+    def __iter__(self):
+        coords = self.coords
+        capacity = self.capacity
+        for i in range(self.head, self.head + self.length):
+            slot = 2 * (i % capacity)
+            yield (coords[slot], coords[slot + 1])
+
+    def __contains__(self, position):
+        # O(n) scan; collision code should ask the OccupancyGrid instead
+        return any(segment == position for segment in self)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        return f'SnakeBody({list(self)!r})'
+
+
+class SnakeModel:
+    """Snake body, direction and input queue without any rendering"""
+    def __init__(self, grid=None):
+        # Start at center with 3 segments moving up (-90 degrees from initial right direction)
+        self.body = SnakeBody([(SNAKE_START_X, SNAKE_START_Y), (SNAKE_START_X, SNAKE_START_Y + 1), (SNAKE_START_X, SNAKE_START_Y + 2)])
+        self.grid = grid if grid is not None else OccupancyGrid()
+        for segment in self.body:
+            self.grid.add(segment, OccupancyGrid.SNAKE)
+        self.direction = UP
+        self.grow_pending = False
+        self.interpolation = 0.0  # 0.0 to 1.0 for smooth movement between cells
+        self.direction_queue = deque()  # Queue for buffering rapid input changes
+
+    def move(self):
+        # Consume next direction from queue if available
+        if self.direction_queue:
+            self.direction = self.direction_queue.popleft()
+
+        head_x, head_y = self.body[0]
+        dir_x, dir_y = self.direction
+        new_head = (head_x + dir_x, head_y + dir_y)
+
+        # Check wall collision
+        if (new_head[0] < 0 or new_head[0] >= GRID_SIZE or
+            new_head[1] < 0 or new_head[1] >= GRID_SIZE):
+            return False  # Collision with wall
+
+        # Check self collision
+        if self.grid.has(new_head, OccupancyGrid.SNAKE):
+            return False  # Collision with self
+
+        # Move snake
+        self.body.appendleft(new_head)
+        self.grid.add(new_head, OccupancyGrid.SNAKE)
+        if not self.grow_pending:
+            self.grid.remove(self.body.pop(), OccupancyGrid.SNAKE)  # Remove tail
+        else:
+            self.grow_pending = False
+
+        return True  # No collision
+
+    def grow(self):
+        self.grow_pending = True
+
+    def change_direction(self, new_direction):
+        # Prevent 180-degree turns
+        # Determine what direction to compare against
+        compare_direction = self.direction_queue[-1] if self.direction_queue else self.direction
+
+        # Validate: prevent 180-degree reversal and duplicate consecutive directions
+        if new_direction != OPPOSITE_DIRECTIONS[compare_direction] and new_direction != compare_direction:
+            # Limit queue size to 1 buffered input for responsive classic snake feel
+            if len(self.direction_queue) < 1:
+                self.direction_queue.append(new_direction)
+
+    def check_self_collision(self):
+        return self.body[0] in self.body[1:]
+
+    def occupies(self, position, include_tail=True):
+        """O(1) check whether a body segment covers position"""
+        if not include_tail and position == self.body[-1]:
+            return False
+        return self.grid.has(position, OccupancyGrid.SNAKE)
+
+    def get_next_head(self):
+        """Predict the head position after the next move (uses the queued direction first)"""
+        head_x, head_y = self.body[0]
+        next_dir = self.direction_queue[0] if self.direction_queue else self.direction
+        return (head_x + next_dir[0], head_y + next_dir[1])
+
+    def update_interpolation(self, progress):
+        """Update interpolation based on time since last move"""
+        self.interpolation = min(1.0, progress)
+
+
+class FoodModel:
+    """Food position and spawning without any rendering"""
+    def __init__(self, grid=None):
+        self.position = (0, 0)
+        self.grid = grid if grid is not None else OccupancyGrid()
+
+    def spawn(self, rng=random):
+        """Place food on a random cell not covered by the snake or obstacles.
+
+        Returns False (and leaves the food where it was) when the board is full.
+        """
+        position = self.grid.random_free_cell(rng)
+        if position is None:
+            return False
+        self.position = position
+        return True
+
+    def get_position(self):
+        return self.position
+
+
+class AnchorPool:
+    """Set of candidate positions with O(1) discard and uniform random sampling"""
+    def __init__(self, positions):
+        self.positions = list(positions)
+        self.slots = {position: slot for slot, position in enumerate(self.positions)}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def discard(self, position):
+        slot = self.slots.pop(position, None)
+        if slot is None:
+            return
+        last = self.positions.pop()
+        if last != position:
+            self.positions[slot] = last
+            self.slots[last] = slot
+
+    def sample(self, rng=random):
+        return self.positions[rng.randrange(len(self.positions))]
+
+
+class ObstacleField:
+    """Obstacle layout and collision checks without any rendering"""
+
+    # (width, height) and probability: 60% single cell, 20% 2x1, 10% 1x2, 10% 2x2
+    SHAPES = [((1, 1), 0.6), ((2, 1), 0.2), ((1, 2), 0.1), ((2, 2), 0.1)]
+
+    # Board size -> per-shape anchors that clear the edges and snake start area
+    _base_anchor_cache = {}
+
+    def __init__(self, grid=None):
+        self.positions = set()
+        self.shapes = []  # List of (x, y, width, height) tuples
+        self.grid = grid if grid is not None else OccupancyGrid()
+        self.layout_version = 0  # Bumped on every generate() so renderers can cache the layout
+
+    @classmethod
+    def get_base_anchors(cls, size):
+        """Top-left anchors per shape that keep the edge margin and snake start path clear"""
+        if size not in cls._base_anchor_cache:
+            def cell_allowed(px, py):
+                # Check general proximity and path in front of snake
+                in_start_path = (OBSTACLE_START_AREA_MIN_X <= px <= OBSTACLE_START_AREA_MAX_X and
+                                OBSTACLE_START_AREA_MIN_Y <= py <= OBSTACLE_START_AREA_MAX_Y)
+                too_close = abs(px - SNAKE_START_X) + abs(py - SNAKE_START_Y) <= 3
+                return not (too_close or in_start_path)  # Keep center and starting path clear
+
+            # Avoid edges (2 cell margin plus shape size)
+            cls._base_anchor_cache[size] = [
+                [(x, y) for x in range(2, size - 1 - width) for y in range(2, size - 1 - height)
+                 if all(cell_allowed(x + dx, y + dy) for dx in range(width) for dy in range(height))]
+                for (width, height), _ in cls.SHAPES
+            ]
+        return cls._base_anchor_cache[size]
+
+    def generate(self, count, snake_body, food_position, rng=random):
+        """Generate random obstacles avoiding snake, food, and edges. Some span multiple cells.
+
+        Each shape is drawn from the anchors where it still fits, so exactly
+        count obstacles are placed unless the board runs out of room.
+        """
+        self.positions = set()
+        self.shapes = []
+        self.layout_version += 1
+        self.grid.clear(OccupancyGrid.OBSTACLE)
+        pools = [AnchorPool(anchors) for anchors in ObstacleField.get_base_anchors(self.grid.size)]
+
+        def block(pos):
+            # Any anchor whose footprint covers this cell is no longer valid
+            for pool, ((width, height), _) in zip(pools, ObstacleField.SHAPES):
+                for dx in range(width):
+                    for dy in range(height):
+                        pool.discard((pos[0] - dx, pos[1] - dy))
+
+        for pos in snake_body:
+            block(pos)
+        block(food_position)
+
+        while len(self.shapes) < count:
+            # Randomly decide shape among those that still fit somewhere
+            available = [i for i, pool in enumerate(pools) if pool]
+            if not available:
+                break  # Board is full
+            weights = [ObstacleField.SHAPES[i][1] for i in available]
+            shape_index = rng.choices(available, weights)[0]
+            (width, height), _ = ObstacleField.SHAPES[shape_index]
+            x, y = pools[shape_index].sample(rng)
+
+            for dx in range(width):
+                for dy in range(height):
+                    pos = (x + dx, y + dy)
+                    self.grid.add(pos, OccupancyGrid.OBSTACLE)
+                    self.positions.add(pos)
+                    block(pos)
+            self.shapes.append((x, y, width, height))
+
+    def check_collision(self, position):
+        """Check if position collides with obstacle"""
+        return self.grid.has(position, OccupancyGrid.OBSTACLE)
+
+
+class PowerupState:
+    """Powerup activation state and expiry rules for the 4 powerup types"""
+
+    # Powerup types
+    SHIELD = 'shield'
+    DOUBLE_POINTS = 'double_points'
+    GHOST_MODE = 'ghost_mode'
+    SPEED_BOOST = 'speed_boost'
+
+    ALL_TYPES = [SHIELD, DOUBLE_POINTS, GHOST_MODE, SPEED_BOOST]
+
+    # Duration in ms, None for powerups that end on use (shield) or apple count (double points)
+    DURATIONS = {
+        SHIELD: None,
+        DOUBLE_POINTS: None,
+        GHOST_MODE: 10000,  # 10 seconds
+        SPEED_BOOST: 15000,  # 15 seconds
+    }
+
+    __slots__ = ('type', 'active', 'start_time', 'remaining_uses')
+
+    def __init__(self, powerup_type):
+        self.type = powerup_type
+        self.active = False
+        self.start_time = 0
+        self.remaining_uses = 0  # For double points (counts apples)
+
+    def activate(self, current_time):
+        """Activate the powerup"""
+        self.active = True
+        self.start_time = current_time
+        if self.type == PowerupState.DOUBLE_POINTS:
+            self.remaining_uses = DOUBLE_POINTS_USES
+
+    def is_expired(self, current_time):
+        """Check if powerup has expired"""
+        if not self.active:
+            return True
+
+        duration = PowerupState.DURATIONS[self.type]
+        if duration is not None:
+            return current_time - self.start_time >= duration
+
+        # For non-duration powerups (shield, double points)
+        if self.type == PowerupState.DOUBLE_POINTS:
+            return self.remaining_uses <= 0
+
+        return False
+
+    def get_remaining_time(self, current_time):
+        """Get remaining time in seconds"""
+        if not self.active:
+            return 0
+        duration = PowerupState.DURATIONS[self.type]
+        if duration is None:
+            return 0
+        remaining_ms = duration - (current_time - self.start_time)
+        return max(0, remaining_ms / 1000)
+
+
+def find_active_powerup(active_powerups, powerup_type):
+    """Return the first active powerup of the given type, or None"""
+    for powerup in active_powerups:
+        if powerup.type == powerup_type and powerup.active:
+            return powerup
+    return None
+
+
+def get_move_delay(active_powerups):
+    """Milliseconds between moves, halved while speed boost is active"""
+    if find_active_powerup(active_powerups, PowerupState.SPEED_BOOST):
+        return int(MOVE_DELAY * SPEED_BOOST_FACTOR)  # 50% faster
+    return MOVE_DELAY
+
+
+class InputScheduler:
+    """Timestamped turn buffer that feeds each turn to the first tick run after it was pressed.
+
+    Turns are held with the time they were sampled and handed to the snake one
+    per tick, in order. Turns that would reverse or repeat the current heading
+    are dropped, so a quick chain like LEFT, DOWN lands on two consecutive ticks
+    instead of being lost. Every applied turn records its input-to-move latency.
+    """
+    def __init__(self, limit=INPUT_BUFFER_LIMIT, sample_limit=LATENCY_SAMPLE_LIMIT):
+        self.limit = limit
+        self.pending = deque()  # (timestamp, direction)
+        self.latencies = deque(maxlen=sample_limit)  # milliseconds
+        self.resume_time = 0  # Last time ticks were held; no latency is counted before it
+
+    def clear(self):
+        self.pending.clear()
+
+    def push(self, direction, timestamp):
+        if self.pending and self.pending[-1][1] == direction:
+            return  # Repeated key press
+        if len(self.pending) < self.limit:
+            self.pending.append((timestamp, direction))
+
+    def hold(self, current_time):
+        """While no ticks can run, count latency from when the snake can move again"""
+        self.resume_time = current_time
+
+    def apply(self, snake, tick_time):
+        """Queue the earliest legal pending turn for the tick scheduled at tick_time; returns the direction or None"""
+        if snake.direction_queue:
+            return None  # A turn is still waiting for a successful move
+        while self.pending:
+            timestamp, direction = self.pending.popleft()
+            snake.change_direction(direction)
+            if snake.direction_queue:
+                # Turns sampled after the tick was due (catch-up ticks) count as zero latency
+                self.latencies.append(max(0, tick_time - max(timestamp, self.resume_time)))
+                return direction
+        return None
+
+
+class TickResult:
+    """What happened during one movement tick, so callers can trigger effects"""
+    def __init__(self):
+        self.collision_type = None  # 'wall', 'obstacle', 'self' or None
+        self.shield_broken = False  # Shield absorbed collision_type
+        self.died = False
+        self.food_eaten = None  # Position of the apple eaten this tick
+        self.points = 0
+        self.powerup_offered = False  # A powerup selection was opened
+
+
+def run_move_tick(state, rng=random):
+    """Advance the snake one cell and apply collision, shield, food and powerup rules.
+
+    state is any object exposing snake, food, obstacle, active_powerups, score,
+    apples_collected, powerup_selection_active, powerup_choices,
+    selected_powerup_index and death_reason (GameState or SnakeEngine).
+    """
+    result = TickResult()
+    snake = state.snake
+
+    # Check if ghost mode is active (allows passing through self)
+    ghost_mode_active = find_active_powerup(state.active_powerups, PowerupState.GHOST_MODE) is not None
+
+    # Predict next head position before moving
+    next_head = snake.get_next_head()
+
+    collision_type = None  # 'wall', 'obstacle', or 'self'
+
+    # Check for wall collision
+    if next_head[0] < 0 or next_head[0] >= GRID_SIZE or next_head[1] < 0 or next_head[1] >= GRID_SIZE:
+        collision_type = 'wall'
+    # Check for obstacle collision before moving
+    elif state.obstacle.check_collision(next_head):
+        collision_type = 'obstacle'
+    # Check for self-collision on the predicted next position BEFORE moving
+    # Exclude tail since it will move away during the move
+    elif not ghost_mode_active and snake.occupies(next_head, include_tail=False):
+        collision_type = 'self'
+
+    # Check if shield is active BEFORE moving
+    shield = find_active_powerup(state.active_powerups, PowerupState.SHIELD)
+
+    # Only move if no collision detected, OR if shield will protect us from wall/obstacle
+    if collision_type is None or (shield and collision_type in ['wall', 'obstacle']):
+        snake.move()
+
+    result.collision_type = collision_type
+    if collision_type is not None:
+        if shield:
+            # Shield breaks and absorbs the collision, game continues normally
+            shield.active = False
+            result.shield_broken = True
+        else:
+            result.died = True
+            state.death_reason = DEATH_REASONS.get(collision_type, "Game Over!")
+        return result
+
+    # Check food collision
+    if snake.body[0] == state.food.get_position():
+        result.food_eaten = state.food.position
+
+        # Check if double points is active
+        points_to_add = FOOD_POINTS
+        double_points = find_active_powerup(state.active_powerups, PowerupState.DOUBLE_POINTS)
+        if double_points:
+            points_to_add = FOOD_POINTS * 2
+            double_points.remaining_uses -= 1
+            if double_points.remaining_uses <= 0:
+                double_points.active = False
+
+        snake.grow()
+        state.score += points_to_add
+        result.points = points_to_add
+        state.food.spawn(rng)
+        state.apples_collected += 1
+
+        # Trigger powerup selection every 3 apples
+        if state.apples_collected % POWERUP_SELECTION_INTERVAL == 0 and not state.powerup_selection_active:
+            state.powerup_selection_active = True
+            state.powerup_choices = rng.sample(PowerupState.ALL_TYPES, POWERUP_SELECTION_COUNT)
+            state.selected_powerup_index = 1  # Start with middle option selected
+            result.powerup_offered = True
+
+    return result
+
+
+class SnakeEngine:
+    """Headless game: the main() rules driven by step() instead of the wall clock.
+
+    Simulated time advances by the current move delay on every step, so
+    duration-based powerups expire exactly as they would in real time.
+    """
+    def __init__(self, seed=None, obstacle_count=OBSTACLE_COUNT):
+        self.rng = random.Random(seed)
+        self.obstacle_count = obstacle_count
+        self.reset()
+
+    def reset(self):
+        """Start a new game (equivalent to GameState.reset_game)"""
+        self.grid = OccupancyGrid()
+        self.snake = SnakeModel(self.grid)
+        self.food = FoodModel(self.grid)
+        self.obstacle = ObstacleField(self.grid)
+        self.obstacle.generate(self.obstacle_count, self.snake.body, self.food.position, self.rng)
+        self.food.spawn(self.rng)
+        self.score = 0
+        self.apples_collected = 0
+        self.active_powerups = []
+        self.powerup_selection_active = False
+        self.powerup_choices = []
+        self.selected_powerup_index = 0
+        self.death_reason = ""
+        self.game_over = False
+        self.current_time = 0
+        self.ticks = 0
+
+    def choose_powerup(self, index=None):
+        """Activate one of the offered powerups (defaults to the highlighted card)"""
+        if not self.powerup_selection_active:
+            return None
+        if index is None:
+            index = self.selected_powerup_index
+        powerup = PowerupState(self.powerup_choices[index % POWERUP_SELECTION_COUNT])
+        powerup.activate(self.current_time)
+        self.active_powerups.append(powerup)
+        self.powerup_selection_active = False
+        self.powerup_choices = []
+        self.selected_powerup_index = 0
+        return powerup
+
+    def step(self, action=None):
+        """Run one movement tick and return its TickResult.
+
+        action is a direction (UP/DOWN/LEFT/RIGHT) to queue before moving, or
+        None to keep going straight. While a powerup selection is open, an int
+        action picks that card; any other action takes the highlighted one.
+        """
+        if self.game_over:
+            return None
+
+        if self.powerup_selection_active:
+            self.choose_powerup(action if isinstance(action, int) else None)
+        elif action is not None:
+            self.snake.change_direction(action)
+
+        self.current_time += get_move_delay(self.active_powerups)
+        result = run_move_tick(self, self.rng)
+        self.ticks += 1
+        if result.died:
+            self.game_over = True
+
+        # Clean up expired powerups
+        self.active_powerups = [p for p in self.active_powerups if not p.is_expired(self.current_time)]
+        return result
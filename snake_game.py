@@ -1,29 +1,53 @@
 import pygame
+import numpy as np
 import random
 import math
 import json
 import os
 import math
+from collections import OrderedDict
+
+from frame_profiler import FrameProfiler, percentile
+from alloc_tracker import AllocationTracker
+
+from snake_engine import (
+    GRID_SIZE, OBSTACLE_COUNT, POWERUP_SELECTION_COUNT,
+    UP, DOWN, LEFT, RIGHT,
+    OccupancyGrid, SnakeModel, FoodModel, ObstacleField, PowerupState, InputScheduler,
+    get_move_delay, run_move_tick,
+)
 
 # ===== DISPLAY CONSTANTS =====
-GRID_SIZE = 30
 CELL_SIZE = 20
 GRID_WIDTH = GRID_SIZE * CELL_SIZE  # 600
 GRID_HEIGHT = GRID_SIZE * CELL_SIZE  # 600
 PANEL_WIDTH = 424
 WIDTH = GRID_WIDTH + PANEL_WIDTH  # 1024 (600 grid + 424 panel)
 HEIGHT = GRID_HEIGHT  # 600 (matches grid height)
-FPS = 30
+FPS = 60  # Render rate cap (e.g. 60, 120, 144), 0 renders uncapped; movement ticks run on their own timestep
+ANIMATION_FRAME_MS = 1000 / 30  # Per-frame effect speeds (particle velocity, food pulse) are tuned for 30 FPS
+DIRTY_RECT_UPDATES = True  # Upload only changed screen regions instead of flipping the whole window
+DIRTY_RECT_LIMIT = 1024  # Fall back to a full flip when more regions than this changed
 
 # ===== GAME TIMING CONSTANTS =====
-MOVE_DELAY = 100  # milliseconds between moves (10 moves/second)
 COUNTDOWN_DURATION = 3500  # 3 seconds (3, 2, 1) + 0.5 seconds (GO!) = 3.5 seconds total
 GO_DURATION = 500  # "GO!" shows for 0.5 seconds
+ANIMATION_KEYFRAME_MS = 20  # Countdown and death zoom time step, so every run repeats the same cached sizes
 DEATH_ANIMATION_DURATION = 2500  # 2.5 seconds
 SHIELD_BREAK_DURATION = 300  # milliseconds
 SCORE_FLASH_DURATION = 300  # milliseconds
 SCREEN_FLASH_DURATION = 150  # milliseconds
 SHIELD_TEXT_DURATION = 1000  # milliseconds
+MAX_TICKS_PER_FRAME = 5  # Movement ticks caught up per frame before a stalled backlog is dropped
+INPUT_POLL_INTERVAL = 1  # ms between input polls while waiting for the next frame
+
+# ===== PROFILER CONSTANTS =====
+PROFILER_HUD_REFRESH = 15  # Frames between HUD statistic refreshes
+PROFILER_HUD_MAX_PHASES = 12  # Slowest phases listed in the HUD
+PROFILER_HUD_LINE_HEIGHT = 16
+PROFILER_TRACE_FILE = 'profile_trace.json'  # Chrome trace export (F4)
+PROFILER_CSV_FILE = 'profile_frames.csv'  # CSV export (F4)
+ALLOCATION_REPORT_FILE = 'allocation_report.txt'  # Allocation report, written when tracking is turned off (F5)
 
 # ===== ANIMATION CONSTANTS =====
 DEATH_ZOOM_START = 500  # ms before zoom starts
@@ -37,26 +61,33 @@ FOOD_BURST_PARTICLES = 20
 FOOD_FAST_PARTICLES = 8
 SCREEN_SHAKE_DECAY = 8
 SCREEN_SHAKE_DURATION = 300
-
-# ===== SNAKE CONSTANTS =====
-SNAKE_START_X = 15
-SNAKE_START_Y = 15
-SNAKE_START_LENGTH = 3
-OBSTACLE_START_AREA_MIN_X = 16
-OBSTACLE_START_AREA_MAX_X = 20
-OBSTACLE_START_AREA_MIN_Y = 13
-OBSTACLE_START_AREA_MAX_Y = 17
-
-# ===== POWERUP CONSTANTS =====
-POWERUP_SELECTION_INTERVAL = 3  # every N apples
-POWERUP_SELECTION_COUNT = 3  # 3 choices per selection
+PARTICLE_POOL_CAPACITY = 4096  # Oldest particles are recycled once the pool is full
+PARTICLE_ATLAS_MAX_ENTRIES = 4096  # LRU cap for pre-rendered particle sprites
+PARTICLE_ALPHA_STEP = 17  # Alpha quantization (16 levels)
+PARTICLE_ROTATION_STEPS = 8  # Star rotations baked per 90 degrees (4-fold symmetric)
+PARTICLE_STREAK_ANGLE_STEPS = 16  # Streak directions baked per full turn
+TEXT_CACHE_MAX_ENTRIES = 256  # LRU cap for rendered text surfaces
+ROTATED_TEXT_CACHE_MAX_ENTRIES = 256  # LRU cap for rotated text surfaces
+ROTATED_TEXT_ANGLE_STEP = 1  # Rotated text angles are rounded to this many degrees
+GLYPH_CACHE_MAX_ENTRIES = 1024  # LRU cap for per-character text renders (changing counters)
+SNAKE_GRADIENT_STEP = 5  # Brightness lost per segment behind the head
+SNAKE_MIN_BRIGHTNESS = 100  # Tail-end brightness floor
+SNAKE_GRADIENT_LEVELS = (255 - SNAKE_MIN_BRIGHTNESS) // SNAKE_GRADIENT_STEP + 1  # Pre-baked segment sprites
+SNAKE_SPRITE_COLORKEY = (255, 0, 255)  # Transparent corners of the segment sprites
+SNAKE_LAYER_MAX_CHANGED = 64  # Changed body layer cells kept for dirty rects before dirtying the whole grid
 
 # ===== DRAMATIC VISUAL EFFECTS CONSTANTS =====
 TRAIL_LENGTH = 8  # Number of trail segments behind snake (increased for visibility)
 SHOCKWAVE_MAX_RADIUS = 80  # Maximum shockwave radius
 SHOCKWAVE_DURATION = 600  # Shockwave lifetime in ms
+SHOCKWAVE_FRAME_STEPS = 24  # Baked frames per shockwave lifetime
+SHOCKWAVE_FRAME_CACHE_MAX_ENTRIES = 256  # LRU cap for baked shockwave frames
+TRAIL_FRAME_STEPS = 12  # Baked frames per trail segment lifetime
+TRAIL_FRAME_CACHE_MAX_ENTRIES = 64  # LRU cap for baked trail frames
 BORDER_PULSE_DURATION = 400  # Screen border pulse duration in ms
 BORDER_PULSE_WIDTH = 8  # Border pulse width in pixels
+BORDER_PULSE_STEPS = 24  # Pre-baked border pulse intensity levels per color
+ZOOM_VIEW_CACHE_MAX_ENTRIES = 256  # LRU cap for death zoom crop and scaled views
 
 # Enhanced particle burst settings
 FOOD_BURST_LAYERS = 3  # Multiple particle layers for drama
@@ -87,24 +118,25 @@ BUTTON_HOVER = (0, 150, 0)   # Brighter Green
 BUTTON_TEXT = (255, 255, 255)
 TITLE_COLOR = (0, 255, 0)
 
-# ===== DIRECTIONS =====
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
 
-# ===== DIRECTION UTILITIES =====
-OPPOSITE_DIRECTIONS = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+def get_body_cells(body):
+    """Cells of a SnakeBody as an (n, 2) int16 array, head first"""
+    return np.frombuffer(body.to_array(), dtype=np.int16).reshape(-1, 2)
 
 
-class Snake:
-    def __init__(self):
-        # Start at center with 3 segments moving up (-90 degrees from initial right direction)
-        self.body = [(SNAKE_START_X, SNAKE_START_Y), (SNAKE_START_X, SNAKE_START_Y + 1), (SNAKE_START_X, SNAKE_START_Y + 2)]
-        self.direction = UP
-        self.grow_pending = False
-        self.interpolation = 0.0  # 0.0 to 1.0 for smooth movement between cells
-        self.direction_queue = []  # Queue for buffering rapid input changes
+class Snake(SnakeModel):
+    # Pre-baked body segment per gradient level, shared by every snake
+    segment_sprites = None
+    
+    def __init__(self, grid=None):
+        super().__init__(grid)
+        
+        # Persistent body layer, updated from the moves logged since it was last drawn
+        self.body_layer = None
+        self.layer_moves = []  # Vacated tail cell per move (None when the snake grew)
+        self.vacated_tail = None  # Cell the tail left on the last move, drawn retracting
+        self.drawn_head = None  # (rect, sprite) as last drawn, for dirty rect tracking
+        self.drawn_tail = None
         
         # Sprite system
         self.head_sprite = None
@@ -144,6 +176,31 @@ class Snake:
             print(f"[DEBUG] Unexpected error loading head sprite: {e} - using green rectangle fallback")
             self.use_head_sprite = False
     
+    @classmethod
+    def bake_segment_sprites(cls):
+        """Render the rounded body segment once per brightness level of the gradient"""
+        cls.segment_sprites = []
+        for level in range(SNAKE_GRADIENT_LEVELS):
+            brightness = max(SNAKE_MIN_BRIGHTNESS, 255 - level * SNAKE_GRADIENT_STEP)
+            sprite = pygame.Surface((CELL_SIZE, CELL_SIZE))
+            sprite.fill(SNAKE_SPRITE_COLORKEY)
+            rect = sprite.get_rect()
+            pygame.draw.rect(sprite, (0, brightness, 0), rect, border_radius=4)
+            pygame.draw.rect(sprite, DARK_GREEN, rect, 2, border_radius=4)
+            sprite.set_colorkey(SNAKE_SPRITE_COLORKEY, pygame.RLEACCEL)
+            cls.segment_sprites.append(sprite)
+    
+    def move(self):
+        tail = self.body[-1]
+        length = len(self.body)
+        moved = super().move()
+        
+        # Log what changed so the body layer only repaints the affected cells
+        self.vacated_tail = tail if moved and len(self.body) == length else None
+        if moved and len(self.layer_moves) <= SNAKE_GRADIENT_LEVELS:
+            self.layer_moves.append(self.vacated_tail)
+        return moved
+    
     def get_direction_angle(self, direction):
         """Convert direction tuple to rotation angle (base sprite faces LEFT)"""
         direction_angles = {
@@ -162,10 +219,10 @@ class Snake:
         angle = self.get_direction_angle(direction)
         
         # Check cache
-        cache_key = f"head_{angle}"
-        if cache_key in self.sprite_cache:
+        cached = self.sprite_cache.get(angle)
+        if cached is not None:
             self.cache_hits += 1
-            return self.sprite_cache[cache_key]
+            return cached
         
         # Cache miss - create rotated sprite
         self.cache_misses += 1
@@ -180,58 +237,10 @@ class Snake:
             del self.sprite_cache[oldest_key]
             print(f"[DEBUG] Snake sprite cache full, removed {oldest_key}")
         
-        self.sprite_cache[cache_key] = rotated_sprite
+        self.sprite_cache[angle] = rotated_sprite
         print(f"[DEBUG] Cached rotated head sprite: {angle}° rotation")
         return rotated_sprite
     
-    def move(self):
-        # Consume next direction from queue if available
-        if self.direction_queue:
-            self.direction = self.direction_queue.pop(0)
-        
-        head_x, head_y = self.body[0]
-        dir_x, dir_y = self.direction
-        new_head = (head_x + dir_x, head_y + dir_y)
-        
-        # Check wall collision
-        if (new_head[0] < 0 or new_head[0] >= GRID_SIZE or
-            new_head[1] < 0 or new_head[1] >= GRID_SIZE):
-            return False  # Collision with wall
-        
-        # Check self collision
-        if new_head in self.body:
-            return False  # Collision with self
-        
-        # Move snake
-        self.body.insert(0, new_head)
-        if not self.grow_pending:
-            self.body.pop()  # Remove tail
-        else:
-            self.grow_pending = False
-        
-        return True  # No collision
-    
-    def grow(self):
-        self.grow_pending = True
-    
-    def change_direction(self, new_direction):
-        # Prevent 180-degree turns
-        # Determine what direction to compare against
-        compare_direction = self.direction_queue[-1] if self.direction_queue else self.direction
-        
-        # Validate: prevent 180-degree reversal and duplicate consecutive directions
-        if new_direction != OPPOSITE_DIRECTIONS[compare_direction] and new_direction != compare_direction:
-            # Limit queue size to 1 buffered input for responsive classic snake feel
-            if len(self.direction_queue) < 1:
-                self.direction_queue.append(new_direction)
-    
-    def check_self_collision(self):
-        return self.body[0] in self.body[1:]
-    
-    def update_interpolation(self, progress):
-        """Update interpolation based on time since last move"""
-        self.interpolation = min(1.0, progress)
-    
     def get_display_position(self, segment_index):
         """Get interpolated pixel position for smooth rendering"""
         current_pos = self.body[segment_index]
@@ -249,52 +258,43 @@ class Snake:
         return (x * CELL_SIZE, y * CELL_SIZE)
     
     def draw(self, screen):
-        for i, segment in enumerate(self.body):
-            # Use interpolated position for smooth movement
-            x, y = self.get_display_position(i)
-            
-            if i == 0:  # Head segment
-                if self.use_head_sprite:
-                    # Sprite-based head rendering
-                    try:
-                        head_sprite = self.get_rotated_head_sprite(self.direction)
-                        if head_sprite:
-                            screen.blit(head_sprite, (x, y))
-                            
-                            # Log cache performance occasionally (every 200 draws)
-                            total_requests = self.cache_hits + self.cache_misses
-                            if total_requests > 0 and total_requests % 200 == 0:
-                                hit_rate = (self.cache_hits / total_requests) * 100
-                                print(f"[DEBUG] Snake sprite cache hit rate: {hit_rate:.1f}% ({self.cache_hits}/{total_requests})")
-                        else:
-                            raise ValueError("Head sprite not available")
-                    except Exception as e:
-                        print(f"[DEBUG] Error rendering head sprite, using rectangle fallback: {e}")
-                        # Fallback to rectangle rendering for head
-                        rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-                        brightness = 255  # Brightest for head
-                        color = (0, brightness, 0)
-                        pygame.draw.rect(screen, color, rect, border_radius=4)
-                        pygame.draw.rect(screen, DARK_GREEN, rect, 2, border_radius=4)
-                else:
-                    # Fallback: rectangle rendering for head
-                    rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-                    brightness = 255  # Brightest for head
-                    color = (0, brightness, 0)
-                    pygame.draw.rect(screen, color, rect, border_radius=4)
-                    pygame.draw.rect(screen, DARK_GREEN, rect, 2, border_radius=4)
-            else:
-                # Body segments: keep original rectangle rendering with gradient
-                rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-                brightness = max(100, 255 - (i * 5))
-                color = (0, brightness, 0)
-                pygame.draw.rect(screen, color, rect, border_radius=4)
-                pygame.draw.rect(screen, DARK_GREEN, rect, 2, border_radius=4)
+        """Blit the body layer, then the retracting tail and the interpolated head on top"""
+        if Snake.segment_sprites is None:
+            Snake.bake_segment_sprites()
+        if self.body_layer is None:
+            self.body_layer = SnakeBodyLayer()
+        self.body_layer.sync(self)
+        self.body_layer.draw(screen)
+        
+        sprites = Snake.segment_sprites
+        t = self.interpolation
+        length = len(self.body)
+        blit_sequence = []
+        
+        # Tail sliding out of the cell it just left into its own (the layer already holds the latter)
+        self.drawn_tail = None
+        if self.vacated_tail is not None and t < 1.0 and length > 1:
+            (from_x, from_y), (to_x, to_y) = self.vacated_tail, self.body[-1]
+            tail_sprite = sprites[min(length - 1, SNAKE_GRADIENT_LEVELS - 1)]
+            tail_x = (from_x + (to_x - from_x) * t) * CELL_SIZE
+            tail_y = (from_y + (to_y - from_y) * t) * CELL_SIZE
+            blit_sequence.append((tail_sprite, (tail_x, tail_y)))
+            self.drawn_tail = ((int(tail_x), int(tail_y), CELL_SIZE, CELL_SIZE), tail_sprite)
+        
+        # Head sliding in from the neck cell: rotated sprite when available, otherwise the brightest segment
+        head_sprite = self.get_rotated_head_sprite(self.direction) if self.use_head_sprite else None
+        if head_sprite is None:
+            head_sprite = sprites[0]
+        head_x, head_y = self.get_display_position(0)
+        blit_sequence.append((head_sprite, (head_x, head_y)))
+        self.drawn_head = ((int(head_x), int(head_y), CELL_SIZE, CELL_SIZE), head_sprite)
+        
+        screen.fblits(blit_sequence)
 
 
-class Food:
-    def __init__(self):
-        self.position = (0, 0)
+class Food(FoodModel):
+    def __init__(self, grid=None):
+        super().__init__(grid)
         self.pulse = 0
         # Sprite system
         self.original_sprite = None
@@ -356,23 +356,10 @@ class Food:
         print(f"[DEBUG] Cached new sprite size: {sprite_size}x{sprite_size} (offset: {size_offset})")
         return scaled_sprite
     
-    def spawn(self, snake_body_and_obstacles):
-        # Keep generating random positions until we find one not on the snake or obstacles
-        while True:
-            x = random.randint(0, GRID_SIZE - 1)
-            y = random.randint(0, GRID_SIZE - 1)
-            position = (x, y)
-            if position not in snake_body_and_obstacles:
-                self.position = position
-                break
-    
-    def get_position(self):
-        return self.position
-    
     def draw(self, screen):
         x, y = self.position
-        # Pulse animation
-        self.pulse += 0.1
+        # Pulse animation (0.1 radians per 30 FPS frame, independent of render rate)
+        self.pulse = pygame.time.get_ticks() / ANIMATION_FRAME_MS * 0.1
         size_offset = int(math.sin(self.pulse) * 3)
         
         if self.use_sprite and self.original_sprite:
@@ -406,85 +393,205 @@ class Food:
 
 
 class Particle:
-    # Particle shape types for dramatic variety
-    CIRCLE = 'circle'
-    STAR = 'star'
-    LIGHTNING = 'lightning'
-    DIAMOND = 'diamond'
-    STREAK = 'streak'
-    
-    def __init__(self, x, y, velocity_x, velocity_y, color, shape='circle', size=5, lifetime=600):
-        self.x = x
-        self.y = y
-        self.vx = velocity_x
-        self.vy = velocity_y
-        self.lifetime = lifetime  # milliseconds - now configurable
-        self.created_time = pygame.time.get_ticks()
-        self.color = color
-        self.shape = shape
-        self.initial_size = size
-        self.rotation = random.uniform(0, 360)  # For rotating shapes
-        self.rotation_speed = random.uniform(-5, 5)  # Rotation animation
-    
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.rotation += self.rotation_speed  # Animate rotation
-    
-    def is_alive(self):
-        return pygame.time.get_ticks() - self.created_time < self.lifetime
-    
-    def draw(self, screen):
-        age = pygame.time.get_ticks() - self.created_time
-        progress = age / self.lifetime
-        # Fade alpha and size as particle ages
-        alpha = max(0, min(255, int(255 * (1 - progress))))  # Clamp to valid range
-        size = max(1, int(self.initial_size * (1 - progress * 0.5)))  # Ensure size is at least 1
-        
-        if size > 0 and alpha > 0:
-            color_rgb = (int(self.color[0]), int(self.color[1]), int(self.color[2]))
-            color_with_alpha = (color_rgb[0], color_rgb[1], color_rgb[2], alpha)
-            
-            if self.shape == Particle.CIRCLE:
-                # Original circle particles
-                surface = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-                pygame.draw.circle(surface, color_with_alpha, (size, size), size)
-                screen.blit(surface, (self.x - size, self.y - size))
-                
-            elif self.shape == Particle.STAR:
-                # 4-pointed star for food collection drama
-                self._draw_star(screen, self.x, self.y, size, color_with_alpha)
-                
-            elif self.shape == Particle.LIGHTNING:
-                # Jagged lightning bolt for collision drama
-                self._draw_lightning(screen, self.x, self.y, size, color_with_alpha)
-                
-            elif self.shape == Particle.DIAMOND:
-                # Diamond sparkles for powerup effects
-                self._draw_diamond(screen, self.x, self.y, size, color_with_alpha)
-                
-            elif self.shape == Particle.STREAK:
-                # Motion streaks for trail effects
-                self._draw_streak(screen, self.x, self.y, size, color_with_alpha)
-    
-    def _draw_star(self, screen, x, y, size, color):
-        """Draw performance-optimized 4-pointed star"""
+    # Particle shape types for dramatic variety (codes stored in ParticlePool.shape)
+    CIRCLE = 0
+    STAR = 1
+    LIGHTNING = 2
+    DIAMOND = 3
+    STREAK = 4
+
+
+class ParticlePool:
+    """Fixed-capacity structure-of-arrays particle system.
+
+    Position, velocity, age, lifetime, size, color, shape and rotation live in
+    NumPy arrays so update, fade and culling run over the whole pool at once.
+    New particles overwrite the oldest slots once the pool is full.
+    """
+    # Sprites are shared by every pool
+    atlas = None
+
+    def __init__(self, capacity=PARTICLE_POOL_CAPACITY):
+        if ParticlePool.atlas is None:
+            ParticlePool.atlas = ParticleAtlas()
+        self.capacity = capacity
+        self.cursor = 0  # Next slot to write (oldest slot when full)
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.created_time = np.zeros(capacity, dtype=np.int64)
+        self.lifetime = np.ones(capacity, dtype=np.int64)  # milliseconds
+        self.initial_size = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.shape = np.zeros(capacity, dtype=np.int8)
+        self.rotation = np.zeros(capacity, dtype=np.float64)  # For rotating shapes
+        self.rotation_speed = np.zeros(capacity, dtype=np.float64)  # Rotation animation
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def clear(self):
+        self.alive[:] = False
+
+    def emit(self, x, y, vx, vy, color, shape, size, lifetime, current_time):
+        """Spawn one particle per velocity; other arguments may be scalars or per-particle arrays.
+
+        A burst larger than the pool keeps only its last capacity particles.
+        """
+        vx = np.atleast_1d(vx)
+        vy = np.atleast_1d(vy)
+        count = min(len(vx), self.capacity)
+        slots = (self.cursor + np.arange(count)) % self.capacity
+        self.cursor = (self.cursor + count) % self.capacity
+
+        def keep_last(value, item_dims=0):
+            # Per-particle arrays are cut like the velocities; scalars (and one color) broadcast
+            value = np.asarray(value)
+            return value[-count:] if value.ndim > item_dims else value
+
+        self.x[slots] = keep_last(x)
+        self.y[slots] = keep_last(y)
+        self.vx[slots] = vx[-count:]
+        self.vy[slots] = vy[-count:]
+        self.color[slots] = keep_last(color, 1)
+        self.shape[slots] = keep_last(shape)
+        self.initial_size[slots] = keep_last(size)
+        self.lifetime[slots] = keep_last(lifetime)
+        self.created_time[slots] = current_time
+        self.rotation[slots] = np.random.uniform(0, 360, count)
+        self.rotation_speed[slots] = np.random.uniform(-5, 5, count)
+        self.alive[slots] = True
+
+    def cull(self, current_time):
+        """Kill every particle older than its lifetime"""
+        self.alive &= (current_time - self.created_time) < self.lifetime
+
+    def update(self, steps=1.0):
+        """Advance every live particle by steps 30 FPS frames"""
+        live = self.alive
+        np.add(self.x, self.vx * steps, out=self.x, where=live)
+        np.add(self.y, self.vy * steps, out=self.y, where=live)
+        np.add(self.rotation, self.rotation_speed * steps, out=self.rotation, where=live)  # Animate rotation
+
+    def draw(self, screen, current_time, offset_x=0, offset_y=0):
+        slots = np.flatnonzero(self.alive)
+        if slots.size == 0:
+            return
+        progress = (current_time - self.created_time[slots]) / self.lifetime[slots]
+        # Fade alpha and size as particles age
+        alphas = np.clip((255 * (1 - progress)).astype(np.int32), 0, 255)
+        sizes = np.maximum(1, (self.initial_size[slots] * (1 - progress * 0.5)).astype(np.int32))
+
+        # Quantize alpha and rotation so every particle maps onto a baked sprite
+        alpha_levels = ((alphas + PARTICLE_ALPHA_STEP // 2) // PARTICLE_ALPHA_STEP).tolist()
+        star_steps = ((self.rotation[slots] % 90) * (PARTICLE_ROTATION_STEPS / 90)).astype(np.int32) % PARTICLE_ROTATION_STEPS
+        streak_angles = np.degrees(np.arctan2(self.vy[slots], self.vx[slots]))
+        streak_steps = np.rint(streak_angles * (PARTICLE_STREAK_ANGLE_STEPS / 360)).astype(np.int32) % PARTICLE_STREAK_ANGLE_STEPS
+        rotation_steps = np.where(self.shape[slots] == Particle.STAR, star_steps,
+                                  np.where(self.shape[slots] == Particle.STREAK, streak_steps, 0)).tolist()
+
+        xs = (self.x[slots] + offset_x).tolist()
+        ys = (self.y[slots] + offset_y).tolist()
+        colors = [tuple(color) for color in self.color[slots].tolist()]
+        shapes = self.shape[slots].tolist()
+        sizes = sizes.tolist()
+        get_sprite, bake_sprite = self.atlas.get, self.atlas.bake
+        blit_sequence = []
+        for i in range(len(xs)):
+            if alpha_levels[i] <= 0:
+                continue
+            sprite, sprite_dx, sprite_dy = get_sprite(
+                (shapes[i], sizes[i], colors[i], alpha_levels[i], rotation_steps[i]), bake_sprite)
+            blit_sequence.append((sprite, (xs[i] + sprite_dx, ys[i] + sprite_dy)))
+        screen.blits(blit_sequence, doreturn=False)
+
+    def get_bounds(self, offset_x=0, offset_y=0):
+        """Rect covering every live particle sprite, or None when the pool is empty"""
+        slots = np.flatnonzero(self.alive)
+        if slots.size == 0:
+            return None
+        # Baked sprites extend at most about twice the particle size from its center
+        margin = int(self.initial_size[slots].max()) * 2 + 2
+        left = int(self.x[slots].min() + offset_x) - margin
+        top = int(self.y[slots].min() + offset_y) - margin
+        right = int(self.x[slots].max() + offset_x) + margin
+        bottom = int(self.y[slots].max() + offset_y) + margin
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+
+class SurfaceCache:
+    """Baked surfaces by key, evicted least-recently-used once max_entries is reached.
+
+    An entry is baked the first time its key is needed, so drawing it again is
+    a dictionary lookup plus one blit.
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def get(self, key, bake):
+        """Entry for key, calling bake(*key) on a miss"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.cache_hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+        self.cache_misses += 1
+        entry = bake(*key)
+        if len(self.entries) >= self.max_entries:
+            self.entries.popitem(last=False)
+        self.entries[key] = entry
+        return entry
+
+
+class ParticleAtlas(SurfaceCache):
+    """Pre-rendered particle sprites keyed by (shape, size, color, alpha level, rotation step).
+
+    Sprites are baked lazily on first use and evicted least-recently-used once
+    max_entries is reached, so drawing a particle is a dictionary lookup plus
+    one blit instead of a Surface allocation and polygon rasterization.
+    Entries are (surface, blit offset x, blit offset y).
+    """
+    def __init__(self, max_entries=PARTICLE_ATLAS_MAX_ENTRIES):
+        super().__init__(max_entries)
+
+    def bake(self, shape, size, color, alpha_level, rotation_step):
+        color = (*color, min(255, alpha_level * PARTICLE_ALPHA_STEP))
+        if shape == Particle.STAR:
+            # 4-pointed star for food collection drama
+            return self._bake_star(size, color, rotation_step * 90 / PARTICLE_ROTATION_STEPS)
+        elif shape == Particle.LIGHTNING:
+            # Jagged lightning bolt for collision drama
+            return self._bake_lightning(size, color)
+        elif shape == Particle.DIAMOND:
+            # Diamond sparkles for powerup effects
+            return self._bake_diamond(size, color)
+        elif shape == Particle.STREAK:
+            # Motion streaks for trail effects
+            return self._bake_streak(size, color, rotation_step * 360 / PARTICLE_STREAK_ANGLE_STEPS)
+        # Original circle particles
+        surface = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
+        pygame.draw.circle(surface, color, (size, size), size)
+        return surface, -size, -size
+
+    def _bake_star(self, size, color, rotation):
+        """Bake performance-optimized 4-pointed star"""
         points = []
         for i in range(8):  # 4 points + 4 inner points
-            angle = (i * 45 + self.rotation) * math.pi / 180
+            angle = (i * 45 + rotation) * math.pi / 180
             radius = size if i % 2 == 0 else size * 0.4  # Alternate outer/inner points
-            px = x + math.cos(angle) * radius
-            py = y + math.sin(angle) * radius
-            points.append((px, py))
-        
-        if len(points) >= 3:
-            surface = pygame.Surface((size*3, size*3), pygame.SRCALPHA)
-            offset_points = [(px - x + size*1.5, py - y + size*1.5) for px, py in points]
-            pygame.draw.polygon(surface, color, offset_points)
-            screen.blit(surface, (x - size*1.5, y - size*1.5))
-    
-    def _draw_lightning(self, screen, x, y, size, color):
-        """Draw jagged lightning bolt"""
+            points.append((size*1.5 + math.cos(angle) * radius, size*1.5 + math.sin(angle) * radius))
+        surface = pygame.Surface((size*3, size*3), pygame.SRCALPHA)
+        pygame.draw.polygon(surface, color, points)
+        return surface, -size*1.5, -size*1.5
+
+    def _bake_lightning(self, size, color):
+        """Bake jagged lightning bolt"""
         surface = pygame.Surface((size*3, size*4), pygame.SRCALPHA)
         # Create jagged lightning path
         points = [
@@ -495,48 +602,63 @@ class Particle:
             (size*2.0, size*3),
             (size*1.5, size*4)
         ]
-        if len(points) >= 2:
-            pygame.draw.lines(surface, color, False, points, max(1, size//3))
-        screen.blit(surface, (x - size*1.5, y - size*2))
-    
-    def _draw_diamond(self, screen, x, y, size, color):
-        """Draw diamond sparkle"""
+        pygame.draw.lines(surface, color, False, points, max(1, size//3))
+        return surface, -size*1.5, -size*2
+
+    def _bake_diamond(self, size, color):
+        """Bake diamond sparkle"""
+        center = size*1.5
         points = [
-            (x, y - size),      # top
-            (x + size, y),      # right
-            (x, y + size),      # bottom
-            (x - size, y)       # left
+            (center, center - size),  # top
+            (center + size, center),  # right
+            (center, center + size),  # bottom
+            (center - size, center)   # left
         ]
         surface = pygame.Surface((size*3, size*3), pygame.SRCALPHA)
-        offset_points = [(px - x + size*1.5, py - y + size*1.5) for px, py in points]
-        pygame.draw.polygon(surface, color, offset_points)
-        screen.blit(surface, (x - size*1.5, y - size*1.5))
-    
-    def _draw_streak(self, screen, x, y, size, color):
-        """Draw motion streak rectangle"""
+        pygame.draw.polygon(surface, color, points)
+        return surface, -center, -center
+
+    def _bake_streak(self, size, color, angle):
+        """Bake motion streak rectangle pointing along angle (degrees)"""
         # Create elongated rectangle based on velocity direction
         length = size * 3
         width = max(1, size // 2)
-        angle = math.atan2(self.vy, self.vx)
-        
         surface = pygame.Surface((length + width, width*2), pygame.SRCALPHA)
-        rect = pygame.Rect(0, width//2, length, width)
-        pygame.draw.rect(surface, color, rect)
-        
+        pygame.draw.rect(surface, color, pygame.Rect(0, width//2, length, width))
+
         # Rotate surface based on movement direction
         if angle != 0:
-            surface = pygame.transform.rotate(surface, -math.degrees(angle))
-        
-        rect = surface.get_rect(center=(x, y))
-        screen.blit(surface, rect)
+            surface = pygame.transform.rotate(surface, -angle)
+        return surface, -surface.get_width() / 2, -surface.get_height() / 2
+
+
+_packed_colors = {}  # (r, g, b) -> packed int, so entities of one color share a single int object
+
+
+def pack_color(color):
+    """RGB color as a 0xRRGGBB int"""
+    color = tuple(color)
+    packed = _packed_colors.get(color)
+    if packed is None:
+        packed = _packed_colors[color] = (int(color[0]) << 16) | (int(color[1]) << 8) | int(color[2])
+    return packed
+
+
+def unpack_color(packed):
+    """(r, g, b) tuple from a 0xRRGGBB int"""
+    return (packed >> 16 & 0xFF, packed >> 8 & 0xFF, packed & 0xFF)
 
 
 class ShockwaveRing:
     """Expanding shockwave rings for dramatic collision effects"""
+    __slots__ = ('x', 'y', 'color', 'max_radius', 'duration', 'width', 'created_time')
+    # Baked ring frames, shared by every ring
+    frames = None
+
     def __init__(self, x, y, color, max_radius=80, duration=600, width=3):
         self.x = x
         self.y = y
-        self.color = color
+        self.color = pack_color(color)  # 0xRRGGBB
         self.max_radius = max_radius
         self.duration = duration
         self.width = width
@@ -548,130 +670,88 @@ class ShockwaveRing:
     def is_alive(self):
         return pygame.time.get_ticks() - self.created_time < self.duration
     
+    @staticmethod
+    def bake_frame(color, max_radius, width, frame):
+        progress = frame / SHOCKWAVE_FRAME_STEPS
+        # Ring expands and fades
+        current_radius = int(max_radius * progress)
+        alpha = max(0, int(255 * (1 - progress)))
+        if current_radius <= 0 or alpha <= 0:
+            return None, 0, 0
+        
+        ring_surface = pygame.Surface((current_radius*2 + width*2, current_radius*2 + width*2), pygame.SRCALPHA)
+        pygame.draw.circle(ring_surface, (*unpack_color(color), alpha), (current_radius + width, current_radius + width), current_radius, width)
+        return ring_surface, -current_radius - width, -current_radius - width
+    
     def draw(self, screen):
         age = pygame.time.get_ticks() - self.created_time
-        progress = age / self.duration
+        frame = age * SHOCKWAVE_FRAME_STEPS // self.duration
         
-        if progress < 1.0:
-            # Ring expands and fades
-            current_radius = int(self.max_radius * progress)
-            alpha = max(0, int(255 * (1 - progress)))
-            
-            if current_radius > 0 and alpha > 0:
-                color_rgb = (int(self.color[0]), int(self.color[1]), int(self.color[2]))
-                color_with_alpha = (color_rgb[0], color_rgb[1], color_rgb[2], alpha)
-                
-                # Create surface for the ring
-                ring_surface = pygame.Surface((current_radius*2 + self.width*2, current_radius*2 + self.width*2), pygame.SRCALPHA)
-                pygame.draw.circle(ring_surface, color_with_alpha, (current_radius + self.width, current_radius + self.width), current_radius, self.width)
-                
-                screen.blit(ring_surface, (self.x - current_radius - self.width, self.y - current_radius - self.width))
+        if frame < SHOCKWAVE_FRAME_STEPS:
+            if ShockwaveRing.frames is None:
+                ShockwaveRing.frames = SurfaceCache(SHOCKWAVE_FRAME_CACHE_MAX_ENTRIES)
+            ring_surface, ring_dx, ring_dy = ShockwaveRing.frames.get(
+                (self.color, self.max_radius, self.width, frame), ShockwaveRing.bake_frame)
+            if ring_surface is not None:
+                screen.blit(ring_surface, (self.x + ring_dx, self.y + ring_dy))
 
 
 class TrailSegment:
     """Snake trail segment for motion effects"""
+    __slots__ = ('x', 'y', 'color', 'lifetime', 'created_time')
+    # Baked trail frames, shared by every segment
+    frames = None
+
     def __init__(self, x, y, color, lifetime=400):
         self.x = x
         self.y = y
-        self.color = color
+        self.color = pack_color(color)  # 0xRRGGBB
         self.lifetime = lifetime
         self.created_time = pygame.time.get_ticks()
     
     def is_alive(self):
         return pygame.time.get_ticks() - self.created_time < self.lifetime
     
-    def draw(self, screen):
-        age = pygame.time.get_ticks() - self.created_time
-        progress = age / self.lifetime
+    @staticmethod
+    def bake_frame(color, frame):
+        progress = frame / TRAIL_FRAME_STEPS
         alpha = max(0, int(150 * (1 - progress)))  # Much more visible - start at 150 alpha
         size_factor = 0.8 * (1 - progress * 0.2)  # Larger and shrink less
+        if alpha <= 0:
+            return None, 0, 0
+        color = unpack_color(color)
         
-        if alpha > 0:
-            color_rgb = (int(self.color[0]), int(self.color[1]), int(self.color[2]))
-            color_with_alpha = (color_rgb[0], color_rgb[1], color_rgb[2], alpha)
-            
-            # Draw more visible trail segment
-            trail_size = int(CELL_SIZE * size_factor)
-            offset = (CELL_SIZE - trail_size) // 2
-            
-            surface = pygame.Surface((trail_size, trail_size), pygame.SRCALPHA)
-            pygame.draw.rect(surface, color_with_alpha, (0, 0, trail_size, trail_size), border_radius=3)
-            # Add a subtle glow effect
-            if alpha > 50:  # Only add glow when trail is still fairly visible
-                glow_size = trail_size + 4
-                glow_offset = offset - 2
-                glow_alpha = alpha // 3
-                glow_color = (color_rgb[0], color_rgb[1], color_rgb[2], glow_alpha)
-                glow_surface = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-                pygame.draw.rect(glow_surface, glow_color, (0, 0, glow_size, glow_size), border_radius=5)
-                screen.blit(glow_surface, (self.x + glow_offset, self.y + glow_offset))
-            
-            screen.blit(surface, (self.x + offset, self.y + offset))
-
-
-class Obstacle:
-    def __init__(self):
-        self.positions = []
-        self.shapes = []  # List of (positions_list, width, height) tuples
-    
-    def generate(self, count, snake_body, food_position):
-        """Generate random obstacles avoiding snake, food, and edges. Some span multiple cells."""
-        self.positions = []
-        self.shapes = []
-        attempts = 0
-        max_attempts = count * 20
-        obstacles_created = 0
+        # Draw more visible trail segment
+        trail_size = int(CELL_SIZE * size_factor)
+        offset = (CELL_SIZE - trail_size) // 2
         
-        while obstacles_created < count and attempts < max_attempts:
-            # Randomly decide shape: 60% single cell, 20% 2x1, 10% 1x2, 10% 2x2
-            rand = random.random()
-            if rand < 0.6:
-                width, height = 1, 1
-            elif rand < 0.8:
-                width, height = 2, 1
-            elif rand < 0.9:
-                width, height = 1, 2
-            else:
-                width, height = 2, 2
-            
-            # Avoid edges (2 cell margin plus shape size)
-            x = random.randint(2, GRID_SIZE - 2 - width)
-            y = random.randint(2, GRID_SIZE - 2 - height)
-            
-            # Generate all positions for this shape
-            shape_positions = []
-            for dx in range(width):
-                for dy in range(height):
-                    shape_positions.append((x + dx, y + dy))
-            
-            # Check if all positions are free and not too close to snake start
-            valid = True
-            for pos in shape_positions:
-                px, py = pos
-                # Check general proximity and path in front of snake
-                in_start_path = (OBSTACLE_START_AREA_MIN_X <= px <= OBSTACLE_START_AREA_MAX_X and 
-                                OBSTACLE_START_AREA_MIN_Y <= py <= OBSTACLE_START_AREA_MAX_Y)
-                too_close = abs(px - SNAKE_START_X) + abs(py - SNAKE_START_Y) <= 3
-                
-                if (pos in snake_body or 
-                    pos == food_position or 
-                    pos in self.positions or
-                    too_close or
-                    in_start_path):  # Keep center and starting path clear
-                    valid = False
-                    break
-            
-            if valid:
-                self.positions.extend(shape_positions)
-                self.shapes.append((x, y, width, height))
-                obstacles_created += 1
-            
-            attempts += 1
-    
-    def check_collision(self, position):
-        """Check if position collides with obstacle"""
-        return position in self.positions
+        # Add a subtle glow effect behind it, only when the trail is still fairly visible
+        if alpha > 50:
+            glow_size = trail_size + 4
+            surface = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
+            pygame.draw.rect(surface, (*color, alpha // 3), (0, 0, glow_size, glow_size), border_radius=5)
+            segment = pygame.Surface((trail_size, trail_size), pygame.SRCALPHA)
+            pygame.draw.rect(segment, (*color, alpha), (0, 0, trail_size, trail_size), border_radius=3)
+            surface.blit(segment, (2, 2))
+            return surface, offset - 2, offset - 2
+        
+        surface = pygame.Surface((trail_size, trail_size), pygame.SRCALPHA)
+        pygame.draw.rect(surface, (*color, alpha), (0, 0, trail_size, trail_size), border_radius=3)
+        return surface, offset, offset
     
+    def draw(self, screen):
+        age = pygame.time.get_ticks() - self.created_time
+        frame = age * TRAIL_FRAME_STEPS // self.lifetime
+        
+        if frame < TRAIL_FRAME_STEPS:
+            if TrailSegment.frames is None:
+                TrailSegment.frames = SurfaceCache(TRAIL_FRAME_CACHE_MAX_ENTRIES)
+            surface, trail_dx, trail_dy = TrailSegment.frames.get((self.color, frame), TrailSegment.bake_frame)
+            if surface is not None:
+                screen.blit(surface, (self.x + trail_dx, self.y + trail_dy))
+
+
+class Obstacle(ObstacleField):
     def draw(self, screen):
         """Draw obstacles with subtle 3D effect as connected multi-cell blocks"""
         for shape in self.shapes:
@@ -711,6 +791,231 @@ class Obstacle:
 
 
 
+class BackgroundLayer:
+    """Pre-composited grid lines and obstacles, rebuilt only when the obstacle layout changes"""
+    def __init__(self):
+        self.surface = None
+        self.layout_version = None
+
+    def get_surface(self, obstacle):
+        if self.surface is None:
+            self.surface = pygame.Surface((GRID_WIDTH, GRID_HEIGHT))
+        if self.layout_version != obstacle.layout_version:
+            self.surface.fill(BLACK)
+            # Draw grid
+            for x in range(0, GRID_WIDTH, CELL_SIZE):
+                pygame.draw.line(self.surface, GRID_LINE_COLOR, (x, 0), (x, GRID_HEIGHT))
+            for y in range(0, GRID_HEIGHT, CELL_SIZE):
+                pygame.draw.line(self.surface, GRID_LINE_COLOR, (0, y), (GRID_WIDTH, y))
+            # Draw obstacles
+            obstacle.draw(self.surface)
+            self.layout_version = obstacle.layout_version
+        return self.surface
+
+    def draw(self, screen, obstacle, offset_x=0, offset_y=0):
+        screen.blit(self.get_surface(obstacle), (offset_x, offset_y))
+
+
+class SnakeBodyLayer:
+    """Persistent per-pixel alpha surface with every snake segment behind the head, painted at its cell.
+
+    A move only erases the vacated tail cell and repaints the gradient window
+    behind the head, and a frame blits the whole layer in one go, so neither
+    costs more for a longer snake. A replaced body (new game) is repainted in full.
+    """
+    def __init__(self):
+        self.surface = pygame.Surface((GRID_WIDTH, GRID_HEIGHT), pygame.SRCALPHA)
+        self.body = None  # SnakeBody the layer was painted from
+        self.changed_rects = []  # Cells changed since the last take_changed_rects()
+
+    def sync(self, snake):
+        """Apply the moves logged since the last sync"""
+        moves = snake.layer_moves
+        if snake.body is not self.body or len(moves) > SNAKE_GRADIENT_LEVELS:
+            self.repaint(snake.body)
+        elif moves:
+            for cell in moves:
+                if cell is not None:
+                    rect = (cell[0] * CELL_SIZE, cell[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                    self.surface.fill((0, 0, 0, 0), rect)
+                    self.mark_changed(rect)
+            # New neck cells, plus the gradient that shifted one level per move behind them
+            self.paint(snake.body, 1, len(moves) + SNAKE_GRADIENT_LEVELS)
+        moves.clear()
+
+    def repaint(self, body):
+        self.surface.fill((0, 0, 0, 0))
+        self.paint(body, 1, len(body))
+        self.body = body
+        self.changed_rects = [pygame.Rect(0, 0, GRID_WIDTH, GRID_HEIGHT)]
+
+    def paint(self, body, start, stop):
+        """Paint segments start..stop-1 (clamped to the body) at their cells"""
+        stop = min(stop, len(body))
+        if start >= stop:
+            return
+        positions = (get_body_cells(body)[start:stop] * CELL_SIZE).tolist()
+        sprites = Snake.segment_sprites
+        # Segments past the gradient all share the dimmest sprite
+        segment_sprites = sprites[start:stop] + [sprites[-1]] * (stop - max(start, SNAKE_GRADIENT_LEVELS))
+        self.surface.fblits(zip(segment_sprites, positions))
+        if stop - start > SNAKE_LAYER_MAX_CHANGED:
+            self.changed_rects = [pygame.Rect(0, 0, GRID_WIDTH, GRID_HEIGHT)]
+        else:
+            for cell_x, cell_y in positions:
+                self.mark_changed((cell_x, cell_y, CELL_SIZE, CELL_SIZE))
+
+    def mark_changed(self, rect):
+        if len(self.changed_rects) < SNAKE_LAYER_MAX_CHANGED:
+            self.changed_rects.append(pygame.Rect(rect))
+        else:
+            self.changed_rects = [pygame.Rect(0, 0, GRID_WIDTH, GRID_HEIGHT)]
+
+    def take_changed_rects(self):
+        changed_rects = self.changed_rects
+        self.changed_rects = []
+        return changed_rects
+
+    def draw(self, screen):
+        screen.blit(self.surface, (0, 0))
+
+
+class OverlayLayer:
+    """Reusable translucent full-grid overlay, refilled only when its color or alpha changes"""
+    def __init__(self, size=(GRID_WIDTH, GRID_HEIGHT)):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.fill_color = None
+
+    def draw(self, screen, color, alpha, position=(0, 0)):
+        fill_color = (color[0], color[1], color[2], alpha)
+        if fill_color != self.fill_color:
+            self.surface.fill(fill_color)
+            self.fill_color = fill_color
+        screen.blit(self.surface, position)
+
+
+class BorderPulseFrames:
+    """Pre-baked border pulse edge strips per (color, intensity step)"""
+    def __init__(self, steps=BORDER_PULSE_STEPS):
+        self.steps = steps
+        self.frames = {}  # (color, step) -> [(strip surface, position), ...]
+
+    def get(self, color, intensity):
+        step = min(self.steps, max(0, int(round(intensity * self.steps))))
+        key = (tuple(color), step)
+        frame = self.frames.get(key)
+        if frame is None:
+            frame = self._bake(color, step / self.steps)
+            self.frames[key] = frame
+        return frame
+
+    def _bake(self, color, intensity):
+        alpha = int(255 * intensity * 0.8)  # Max 80% opacity
+        width = int(BORDER_PULSE_WIDTH * intensity)
+        if alpha <= 0 or width <= 0:
+            return []
+
+        color_rgb = (int(color[0]), int(color[1]), int(color[2]))
+        pulse_surface = pygame.Surface((GRID_WIDTH, GRID_HEIGHT), pygame.SRCALPHA)
+
+        # Draw pulsing border on all 4 edges
+        for i in range(width):
+            current_alpha = int(alpha * (1 - i / width))  # Fade outward
+            edge_color = (color_rgb[0], color_rgb[1], color_rgb[2], current_alpha)
+
+            # Top border
+            pygame.draw.rect(pulse_surface, edge_color, (0, i, GRID_WIDTH, 1))
+            # Bottom border
+            pygame.draw.rect(pulse_surface, edge_color, (0, GRID_HEIGHT - 1 - i, GRID_WIDTH, 1))
+            # Left border
+            pygame.draw.rect(pulse_surface, edge_color, (i, 0, 1, GRID_HEIGHT))
+            # Right border
+            pygame.draw.rect(pulse_surface, edge_color, (GRID_WIDTH - 1 - i, 0, 1, GRID_HEIGHT))
+
+        # Keep only the edge strips, the interior is fully transparent
+        strips = [
+            pygame.Rect(0, 0, GRID_WIDTH, width),
+            pygame.Rect(0, GRID_HEIGHT - width, GRID_WIDTH, width),
+            pygame.Rect(0, width, width, GRID_HEIGHT - width * 2),
+            pygame.Rect(GRID_WIDTH - width, width, width, GRID_HEIGHT - width * 2),
+        ]
+        return [(pulse_surface.subsurface(strip).copy(), strip.topleft) for strip in strips]
+
+
+class DeathZoomLayer:
+    """Scene buffer for the death zoom and the scaled region of it shown on screen.
+
+    Scaling needs a source and a destination of exactly the crop and scaled
+    sizes. Both are views anchored at (0, 0) of fixed buffers, cached by size,
+    so a zoom size seen before creates no Surface.
+    """
+    def __init__(self):
+        self.scene = pygame.Surface((GRID_WIDTH, GRID_HEIGHT))
+        # The crop overshoots the grid by at most two source pixels per axis at 3x
+        self.crop = pygame.Surface((GRID_WIDTH + 8, GRID_HEIGHT + 8))
+        self.target = pygame.Surface((GRID_WIDTH + 8, GRID_HEIGHT + 8))
+        self.views = SurfaceCache(ZOOM_VIEW_CACHE_MAX_ENTRIES)
+
+    def get_view(self, surface, width, height):
+        return self.views.get((surface, width, height), self._make_view)
+
+    @staticmethod
+    def _make_view(surface, width, height):
+        return surface.subsurface((0, 0, width, height))
+
+    def scale(self, crop_rect, zoom_scale):
+        """crop_rect of the scene scaled by zoom_scale, as a view anchored at (0, 0).
+
+        The crop is copied to the origin of the crop buffer first; parts of it
+        outside the scene come out black, like the screen behind the grid.
+        """
+        width, height = crop_rect.size
+        crop = self.get_view(self.crop, width, height)
+        inside = crop_rect.clip(self.scene.get_rect()).move(-crop_rect.x, -crop_rect.y)
+        if inside.size != crop_rect.size:
+            for strip in ((0, 0, width, inside.top), (0, inside.bottom, width, height - inside.bottom),
+                          (0, inside.top, inside.left, inside.height),
+                          (inside.right, inside.top, width - inside.right, inside.height)):
+                crop.fill(BLACK, strip)
+        crop.blit(self.scene, (0, 0), crop_rect)
+        if zoom_scale == 1:
+            return crop
+        scaled = self.get_view(self.target, round(width * zoom_scale), round(height * zoom_scale))
+        pygame.transform.scale(crop, scaled.get_size(), scaled)
+        return scaled
+
+
+class GameOverSnapshot:
+    """Final game scene with the game-over fade pre-applied, captured once per death"""
+    def __init__(self):
+        self.surface = None
+        self.valid = False
+
+    def invalidate(self):
+        self.valid = False
+
+    def get_surface(self, state):
+        if self.surface is None:
+            self.surface = pygame.Surface((GRID_WIDTH, GRID_HEIGHT))
+        if not self.valid:
+            # Draw cached grid + obstacles
+            state.background.draw(self.surface, state.obstacle)
+
+            # Don't draw particles on game over screen - they should be cleared
+
+            # Draw food and snake (frozen)
+            state.food.draw(self.surface)
+            state.snake.draw(self.surface)
+
+            # Dark fade overlay over the scene
+            state.fade_overlay.draw(self.surface, BLACK, 200)  # Strong fade for readability
+            self.valid = True
+        return self.surface
+
+    def draw(self, screen, state):
+        screen.blit(self.get_surface(state), (0, 0))
+
+
 class HighScoreManager:
     def __init__(self, filename='high_score.json'):
         self.filename = filename
@@ -737,14 +1042,9 @@ class HighScoreManager:
         return self.high_score
 
 
-class Powerup:
+class Powerup(PowerupState):
     """Powerup system with 4 types: Shield, Double Points, Ghost Mode, Speed Boost"""
-    
-    # Powerup types
-    SHIELD = 'shield'
-    DOUBLE_POINTS = 'double_points'
-    GHOST_MODE = 'ghost_mode'
-    SPEED_BOOST = 'speed_boost'
+    __slots__ = ()
     
     # Class-level sprite cache (shared across all instances)
     _sprite_cache = {}
@@ -813,85 +1113,249 @@ class Powerup:
     
     # Powerup metadata
     INFO = {
-        SHIELD: {
+        PowerupState.SHIELD: {
             'name': 'Shield',
             'description': 'Survive one collision',
             'color': CYAN,
             'duration': None,  # One-time use
             'icon': '🛡️'
         },
-        DOUBLE_POINTS: {
+        PowerupState.DOUBLE_POINTS: {
             'name': 'Double Points',
             'description': 'Next 5 apples worth 20pts',
             'color': YELLOW,
             'duration': None,  # Lasts for 5 apples
             'icon': '2X'
         },
-        GHOST_MODE: {
+        PowerupState.GHOST_MODE: {
             'name': 'Ghost Mode',
             'description': 'Pass through yourself (10s)',
             'color': PURPLE,
-            'duration': 10000,  # 10 seconds
+            'duration': PowerupState.DURATIONS[PowerupState.GHOST_MODE],  # 10 seconds
             'icon': '👻'
         },
-        SPEED_BOOST: {
+        PowerupState.SPEED_BOOST: {
             'name': 'Speed Boost',
             'description': '50% faster movement (15s)',
             'color': ORANGE,
-            'duration': 15000,  # 15 seconds
+            'duration': PowerupState.DURATIONS[PowerupState.SPEED_BOOST],  # 15 seconds
             'icon': '⚡'
         }
     }
-    
-    def __init__(self, powerup_type):
-        self.type = powerup_type
-        self.active = False
-        self.start_time = 0
-        self.remaining_uses = 0  # For double points (counts apples)
-        
-    def activate(self, current_time):
-        """Activate the powerup"""
-        self.active = True
-        self.start_time = current_time
-        if self.type == Powerup.DOUBLE_POINTS:
-            self.remaining_uses = 5
-    
-    def is_expired(self, current_time):
-        """Check if powerup has expired"""
-        if not self.active:
-            return True
-        
-        duration = Powerup.INFO[self.type]['duration']
-        if duration is not None:
-            return current_time - self.start_time >= duration
-        
-        # For non-duration powerups (shield, double points)
-        if self.type == Powerup.DOUBLE_POINTS:
-            return self.remaining_uses <= 0
-        
-        return False
-    
-    def get_remaining_time(self, current_time):
-        """Get remaining time in seconds"""
-        if not self.active:
-            return 0
-        duration = Powerup.INFO[self.type]['duration']
-        if duration is None:
-            return 0
-        remaining_ms = duration - (current_time - self.start_time)
-        return max(0, remaining_ms / 1000)
 
 
 class FontManager:
-    """Manages cached font objects for performance"""
-    def __init__(self):
+    """Manages cached font objects and rendered text surfaces for performance"""
+    def __init__(self, max_text_entries=TEXT_CACHE_MAX_ENTRIES):
         self.fonts = {}
+        self.text_cache = SurfaceCache(max_text_entries)  # (size, text, color, antialias) -> [surface, faded copy or None]
+        self.rotated_cache = SurfaceCache(ROTATED_TEXT_CACHE_MAX_ENTRIES)  # (size, text, color, angle step) -> same
+        self.glyph_cache = SurfaceCache(GLYPH_CACHE_MAX_ENTRIES)  # (size, character, color) -> surface
     
     def get_font(self, size):
         """Get or create a font of the specified size"""
         if size not in self.fonts:
             self.fonts[size] = pygame.font.Font(None, size)
         return self.fonts[size]
+    
+    def render(self, size, text, color, antialias=True, alpha=None):
+        """Get a rendered text surface, rasterizing glyphs only on a cache miss.
+        
+        The returned surface is shared between callers and must not be modified.
+        With alpha, one reusable copy per text gets the alpha applied on every
+        call, so fading text stays a cache hit; blit it before the next call.
+        """
+        entry = self.text_cache.get((size, text, tuple(color), antialias), self._render)
+        return self._apply_alpha(entry, alpha)
+    
+    def render_rotated(self, size, text, color, angle, alpha=None):
+        """Like render, rotated counterclockwise by angle rounded to ROTATED_TEXT_ANGLE_STEP degrees"""
+        angle_step = round(angle / ROTATED_TEXT_ANGLE_STEP)
+        if angle_step == 0:
+            return self.render(size, text, color, alpha=alpha)
+        entry = self.rotated_cache.get((size, text, tuple(color), angle_step), self._render_rotated)
+        return self._apply_alpha(entry, alpha)
+    
+    def draw_text(self, screen, size, text, color, **position):
+        """Blit text from cached per-character renders and return its rect.
+        
+        For counters and other text that changes every few frames: a new value
+        reuses the glyphs already rendered at this size and color instead of
+        rasterizing a new Surface. position is a pygame.Rect attribute for the
+        text, e.g. center=(x, y) or topleft=(x, y).
+        """
+        glyphs = [self.glyph_cache.get((size, char, tuple(color)), self._render_glyph) for char in text]
+        text_rect = pygame.Rect(0, 0, sum(glyph.get_width() for glyph in glyphs), max(glyph.get_height() for glyph in glyphs))
+        for name, value in position.items():
+            setattr(text_rect, name, value)
+        x = text_rect.x
+        for glyph in glyphs:
+            screen.blit(glyph, (x, text_rect.y))
+            x += glyph.get_width()
+        return text_rect
+    
+    def _apply_alpha(self, entry, alpha):
+        if alpha is None:
+            return entry[0]
+        if entry[1] is None:
+            entry[1] = entry[0].copy()
+        entry[1].set_alpha(alpha)
+        return entry[1]
+    
+    def _render(self, size, text, color, antialias):
+        return [self.get_font(size).render(text, antialias, color), None]
+    
+    def _render_rotated(self, size, text, color, angle_step):
+        return [pygame.transform.rotate(self.render(size, text, color), angle_step * ROTATED_TEXT_ANGLE_STEP), None]
+    
+    def _render_glyph(self, size, char, color):
+        return self.get_font(size).render(char, True, color)
+
+
+class InputSampler:
+    """Polls pygame events between frames and stamps each with the time it was sampled"""
+    def __init__(self, poll_interval=INPUT_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.events = []  # (timestamp, event)
+
+    def poll(self):
+        now = pygame.time.get_ticks()
+        for event in pygame.event.get():
+            self.events.append((now, event))
+
+    def drain(self):
+        """Return every event sampled since the last drain, oldest first"""
+        events = self.events
+        self.events = []
+        return events
+
+    def wait_until(self, deadline):
+        """Sleep until deadline, sampling input every poll_interval milliseconds"""
+        while pygame.time.get_ticks() < deadline:
+            self.poll()
+            pygame.time.wait(self.poll_interval)
+
+
+class ProfilerHud:
+    """Side-panel overlay listing rolling per-phase timings from a FrameProfiler"""
+    def __init__(self, profiler, refresh_frames=PROFILER_HUD_REFRESH):
+        self.profiler = profiler
+        self.refresh_frames = refresh_frames
+        self.lines = []
+        self.status = None  # Last export result, shown under the timings
+        self.refreshed_at = None  # profiler.frame_count of the last refresh
+
+    def show_status(self, status):
+        self.status = status
+        self.refreshed_at = None  # Show it on the next draw
+
+    def refresh(self, latencies):
+        frame, phases = self.profiler.get_summary()
+        self.refreshed_at = self.profiler.frame_count
+        if frame is None:
+            self.lines = ['Profiling...']
+            return
+        fps = 1000 / frame[1] if frame[1] > 0 else 0
+        self.lines = [f'Frame {frame[1]:.2f} ms avg, p99 {frame[3]:.2f} ms ({fps:.0f} FPS)']
+        if latencies:
+            self.lines.append(f'Input latency p50 {percentile(latencies, 50)} / p99 {percentile(latencies, 99)} ms '
+                              f'({len(latencies)} turns)')
+        self.lines.append('phase: avg / p95 / p99 ms')
+        for name, mean, p95, p99 in phases[:PROFILER_HUD_MAX_PHASES]:
+            self.lines.append(f'{name}: {mean:.2f} / {p95:.2f} / {p99:.2f}')
+        if self.status:
+            self.lines.append(self.status)
+
+    def draw(self, screen, font_manager, dirty_rects, latencies=()):
+        """Draw the HUD; latencies are input-to-move samples in milliseconds"""
+        if self.refreshed_at is None or self.profiler.frame_count - self.refreshed_at >= self.refresh_frames:
+            self.refresh(latencies)
+        height = len(self.lines) * PROFILER_HUD_LINE_HEIGHT + 8
+        hud_rect = pygame.Rect(GRID_WIDTH + 10, HEIGHT - height - 10, PANEL_WIDTH - 20, height)
+        pygame.draw.rect(screen, BLACK, hud_rect)
+        for i, line in enumerate(self.lines):
+            screen.blit(font_manager.render(18, line, WHITE), (hud_rect.x + 6, hud_rect.y + 4 + i * PROFILER_HUD_LINE_HEIGHT))
+        dirty_rects.track('profiler_hud', hud_rect, self.refreshed_at)
+
+
+class DirtyRectTracker:
+    """Collects the screen regions that changed this frame and uploads only those.
+
+    Transient regions (particles, food pulse, trails) are marked every frame they
+    are drawn and also refreshed on the following frame so their old pixels get
+    erased. Tracked items (panel fields, snake head and tail) are diffed against the
+    previous frame and only dirty their old and new rects when they changed.
+    Frames with whole-grid effects are flipped in full, as is the frame after.
+    """
+    def __init__(self, enabled=DIRTY_RECT_UPDATES, max_rects=DIRTY_RECT_LIMIT):
+        self.enabled = enabled
+        self.max_rects = max_rects
+        self.screen_rect = pygame.Rect(0, 0, WIDTH, HEIGHT)
+        self.full_update = True  # First frame always uploads everything
+        self.previous_full_update = True
+        self.rects = []
+        self.previous_rects = []
+        self.items = {}  # key -> (rect tuple, appearance)
+        self.previous_items = {}
+        self.full_updates = 0
+        self.partial_updates = 0
+
+    def mark_full(self):
+        self.full_update = True
+
+    def add(self, rect):
+        """Mark a transient region drawn this frame"""
+        if rect is not None:
+            self.rects.append(pygame.Rect(rect))
+
+    def track(self, key, rect, appearance):
+        """Record a drawn item; its old and new rects become dirty when it moves or changes"""
+        self.items[key] = (tuple(rect), appearance)
+
+    def track_snake(self, snake):
+        """Dirty the body layer cells repainted since the last frame and the moving head and tail"""
+        if snake.body_layer is not None:
+            self.rects.extend(snake.body_layer.take_changed_rects())
+        if snake.drawn_head is not None:
+            self.track('snake_head', *snake.drawn_head)
+        if snake.drawn_tail is not None:
+            self.track('snake_tail', *snake.drawn_tail)
+
+    def collect(self):
+        """Return the clipped list of regions that differ from the last uploaded frame"""
+        dirty = self.rects + self.previous_rects
+        previous_items = self.previous_items
+        for key, item in self.items.items():
+            previous = previous_items.get(key)
+            if previous != item:
+                dirty.append(pygame.Rect(item[0]))
+                if previous is not None:
+                    dirty.append(pygame.Rect(previous[0]))
+        for key in previous_items.keys() - self.items.keys():
+            dirty.append(pygame.Rect(previous_items[key][0]))
+        return [rect.clip(self.screen_rect) for rect in dirty]
+
+    def present(self):
+        """Upload the frame, then start tracking the next one"""
+        if not self.enabled or self.full_update or self.previous_full_update:
+            pygame.display.flip()
+            self.full_updates += 1
+        else:
+            dirty = self.collect()
+            if len(dirty) > self.max_rects:
+                pygame.display.flip()
+                self.full_updates += 1
+            else:
+                if dirty:
+                    pygame.display.update(dirty)
+                self.partial_updates += 1
+
+        self.previous_full_update = self.full_update
+        self.full_update = False
+        self.previous_rects = self.rects
+        self.rects = []
+        self.previous_items = self.items
+        self.items = {}
 
 
 class GameState:
@@ -903,11 +1367,21 @@ class GameState:
         self.game_over = False
         self.running = True
         
-        # Game objects
-        self.snake = Snake()
-        self.food = Food()
+        # Game objects (snake and obstacles share one occupancy grid)
+        self.grid = OccupancyGrid()
+        self.snake = Snake(self.grid)
+        self.food = Food(self.grid)
         self.score_manager = HighScoreManager()
-        self.obstacle = Obstacle()
+        self.obstacle = Obstacle(self.grid)
+        self.background = BackgroundLayer()  # Cached grid lines + obstacles
+        
+        # Reusable effect layers (no full-grid Surface allocation per frame)
+        self.flash_overlay = OverlayLayer()
+        self.dim_overlay = OverlayLayer()  # Countdown and powerup selection
+        self.fade_overlay = OverlayLayer()  # Death fade and game over
+        self.border_pulse_frames = BorderPulseFrames()
+        self.death_zoom = DeathZoomLayer()
+        self.game_over_snapshot = GameOverSnapshot()
         
         # Scoring and timing
         self.score = 0
@@ -920,7 +1394,8 @@ class GameState:
         self.death_reason = ""
         
         # Game mechanics
-        self.particles = []
+        self.input_scheduler = InputScheduler()  # Timestamped turns waiting for their tick
+        self.particles = ParticlePool()
         self.active_powerups = []
         self.apples_collected = 0
         
@@ -951,15 +1426,17 @@ class GameState:
     
     def reset_game(self, current_time):
         """Reset game state for a new game"""
-        self.snake = Snake()
-        self.obstacle.generate(15, self.snake.body, self.food.position)
-        self.food.spawn(self.snake.body + self.obstacle.positions)
+        self.grid.clear()
+        self.snake = Snake(self.grid)
+        self.obstacle.generate(OBSTACLE_COUNT, self.snake.body, self.food.position)
+        self.food.spawn()
         self.score = 0
         self.elapsed_time = 0
         self.last_move_time = current_time
         self.countdown_active = True
         self.countdown_start_time = current_time
-        self.particles = []
+        self.particles.clear()
+        self.input_scheduler.clear()
         self.screen_shake_intensity = 0
         self.screen_shake_time = 0
         self.score_flash_time = 0
@@ -972,6 +1449,7 @@ class GameState:
         self.death_reason = ""
         self.death_animation_active = False
         self.shield_text_active = False
+        self.game_over_snapshot.invalidate()
         
         # Reset dramatic visual effects
         self.shockwave_rings = []
@@ -981,7 +1459,18 @@ class GameState:
         self.last_snake_position = self.snake.body[0] if self.snake.body else None  # Initialize with current head position
 
 
-def create_dramatic_burst(particles_list, x, y, event_type, current_time, extra_color=None):
+def emit_radial_burst(particles, x, y, count, base_speed, speed_jitter, color, shape, size, lifetime,
+                      current_time, evenly_spaced=True):
+    """Emit count particles flying outward from (x, y) in one vectorized call"""
+    if evenly_spaced:
+        angles = np.arange(count) / count * 2 * math.pi
+    else:
+        angles = np.random.uniform(0, 2 * math.pi, count)
+    speeds = base_speed + np.random.uniform(0, speed_jitter, count)
+    particles.emit(x, y, np.cos(angles) * speeds, np.sin(angles) * speeds, color, shape, size, lifetime, current_time)
+
+
+def create_dramatic_burst(particles, x, y, event_type, current_time, extra_color=None):
     """Create multi-layered dramatic particle bursts for maximum visual impact"""
     
     if event_type == 'food':
@@ -989,77 +1478,37 @@ def create_dramatic_burst(particles_list, x, y, event_type, current_time, extra_
         base_color = extra_color if extra_color else YELLOW
         secondary_color = RED
         
-        # Layer 1: Fast outer ring of stars (dramatic spread)
-        for i in range(16):
-            angle = (i / 16) * 2 * math.pi
-            speed = 5 + random.uniform(0, 3)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            color = base_color if i % 3 != 0 else secondary_color
-            particles_list.append(Particle(x, y, vx, vy, color, Particle.STAR, 6, 800))
+        # Layer 1: Fast outer ring of stars (dramatic spread), every third one red
+        colors = [secondary_color if i % 3 == 0 else base_color for i in range(16)]
+        emit_radial_burst(particles, x, y, 16, 5, 3, colors, Particle.STAR, 6, 800, current_time)
         
         # Layer 2: Medium diamond sparkles (visual density)
-        for i in range(12):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = 3 + random.uniform(0, 2)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            particles_list.append(Particle(x, y, vx, vy, base_color, Particle.DIAMOND, 4, 600))
+        emit_radial_burst(particles, x, y, 12, 3, 2, base_color, Particle.DIAMOND, 4, 600, current_time, False)
         
         # Layer 3: Slow core particles (lingering effect)
-        for i in range(8):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = 1 + random.uniform(0, 1)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            particles_list.append(Particle(x, y, vx, vy, WHITE, Particle.CIRCLE, 3, 1000))
+        emit_radial_burst(particles, x, y, 8, 1, 1, WHITE, Particle.CIRCLE, 3, 1000, current_time, False)
     
     elif event_type == 'collision':
         # COLLISION: 4-layer lightning explosion with maximum drama
         colors = [RED, ORANGE, YELLOW, WHITE]
         
         # Layer 1: Lightning bolts (outer dramatic ring)
-        for i in range(20):
-            angle = (i / 20) * 2 * math.pi
-            speed = 6 + random.uniform(0, 4)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            color = random.choice(colors)
-            particles_list.append(Particle(x, y, vx, vy, color, Particle.LIGHTNING, 8, 900))
+        bolt_colors = [random.choice(colors) for _ in range(20)]
+        emit_radial_burst(particles, x, y, 20, 6, 4, bolt_colors, Particle.LIGHTNING, 8, 900, current_time)
         
         # Layer 2: Star burst (medium spread)
-        for i in range(15):
-            angle = (i / 15) * 2 * math.pi
-            speed = 4 + random.uniform(0, 2)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            particles_list.append(Particle(x, y, vx, vy, ORANGE, Particle.STAR, 6, 700))
+        emit_radial_burst(particles, x, y, 15, 4, 2, ORANGE, Particle.STAR, 6, 700, current_time)
         
         # Layer 3: Diamond shards (inner density)
-        for i in range(12):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = 2 + random.uniform(0, 2)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            particles_list.append(Particle(x, y, vx, vy, YELLOW, Particle.DIAMOND, 4, 800))
+        emit_radial_burst(particles, x, y, 12, 2, 2, YELLOW, Particle.DIAMOND, 4, 800, current_time, False)
         
         # Layer 4: Slow burning core (maximum drama)
-        for i in range(8):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = 0.5 + random.uniform(0, 1)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            particles_list.append(Particle(x, y, vx, vy, RED, Particle.CIRCLE, 5, 1200))
+        emit_radial_burst(particles, x, y, 8, 0.5, 1, RED, Particle.CIRCLE, 5, 1200, current_time, False)
     
     elif event_type == 'shield_break':
         # SHIELD BREAK: Cyan lightning burst with sparkles
-        for i in range(20):
-            angle = (i / 20) * 2 * math.pi
-            speed = 4 + random.uniform(0, 3)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            shape = Particle.LIGHTNING if i % 3 == 0 else Particle.STAR
-            particles_list.append(Particle(x, y, vx, vy, CYAN, shape, 6, 700))
+        shapes = [Particle.LIGHTNING if i % 3 == 0 else Particle.STAR for i in range(20)]
+        emit_radial_burst(particles, x, y, 20, 4, 3, CYAN, shapes, 6, 700, current_time)
 
 
 def create_shockwave_ring(rings_list, x, y, color, max_radius=80):
@@ -1124,38 +1573,21 @@ def draw_border_pulse(screen, state, current_time):
         if time_since_pulse < BORDER_PULSE_DURATION:
             # Pulse intensity decreases over time
             intensity = 1 - (time_since_pulse / BORDER_PULSE_DURATION)
-            alpha = int(255 * intensity * 0.8)  # Max 80% opacity
-            width = int(BORDER_PULSE_WIDTH * intensity)
             
-            if alpha > 0 and width > 0:
-                color_rgb = (int(state.border_pulse_color[0]), 
-                           int(state.border_pulse_color[1]), 
-                           int(state.border_pulse_color[2]))
-                color_with_alpha = (color_rgb[0], color_rgb[1], color_rgb[2], alpha)
-                
-                # Create border pulse surface
-                pulse_surface = pygame.Surface((GRID_WIDTH, GRID_HEIGHT), pygame.SRCALPHA)
-                
-                # Draw pulsing border on all 4 edges
-                for i in range(width):
-                    current_alpha = int(alpha * (1 - i / width))  # Fade outward
-                    edge_color = (color_rgb[0], color_rgb[1], color_rgb[2], current_alpha)
-                    
-                    # Top border
-                    pygame.draw.rect(pulse_surface, edge_color, (0, i, GRID_WIDTH, 1))
-                    # Bottom border  
-                    pygame.draw.rect(pulse_surface, edge_color, (0, GRID_HEIGHT - 1 - i, GRID_WIDTH, 1))
-                    # Left border
-                    pygame.draw.rect(pulse_surface, edge_color, (i, 0, 1, GRID_HEIGHT))
-                    # Right border
-                    pygame.draw.rect(pulse_surface, edge_color, (GRID_WIDTH - 1 - i, 0, 1, GRID_HEIGHT))
-                
-                screen.blit(pulse_surface, (0, 0))
+            # Blit the pre-baked edge strips for this color and intensity step
+            frame = state.border_pulse_frames.get(state.border_pulse_color, intensity)
+            if frame:
+                screen.blits(frame, doreturn=False)
         else:
             state.border_pulse_time = 0  # Reset pulse
 
 
-def main():
+def main(frame_callback=None):
+    """Run the game loop.
+
+    frame_callback(state, current_time), when given, runs at the start of every
+    frame and stops the loop by returning False (used by the headless benchmarks).
+    """
     # Initialize Pygame
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -1165,6 +1597,19 @@ def main():
     # Initialize font manager for performance
     font_manager = FontManager()
     
+    # Upload only the regions that changed between frames
+    dirty_rects = DirtyRectTracker()
+    
+    # Input is sampled while waiting for the next frame, not just once per frame
+    input_sampler = InputSampler()
+    
+    # Per-phase frame profiler (F3 toggles the HUD, F4 exports trace + CSV while it is on)
+    profiler = FrameProfiler()
+    profiler_hud = ProfilerHud(profiler)
+    
+    # Per-frame allocation tracking (F5 toggles, the report is written when it is turned off)
+    allocation_tracker = AllocationTracker()
+    
     # Create game state
     state = GameState()
     state.start_time = pygame.time.get_ticks()
@@ -1175,14 +1620,42 @@ def main():
     start_button_rect = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2, 200, 50)
     quit_button_rect = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 + 70, 200, 50)
     
+    previous_frame_time = pygame.time.get_ticks()
+    
     while state.running:
+        profiler.begin_frame()
+        allocation_tracker.begin_frame()
         current_time = pygame.time.get_ticks()
         mouse_pos = pygame.mouse.get_pos()
+        
+        # Per-frame effects advance by elapsed 30 FPS frames so they look the same at any render rate
+        frame_steps = min(current_time - previous_frame_time, 100) / ANIMATION_FRAME_MS
+        previous_frame_time = current_time
+        
+        # Scripted driver hook, called before input so posted events land this frame
+        if frame_callback is not None and frame_callback(state, current_time) is False:
+            state.running = False
 
-        # Event handling
-        for event in pygame.event.get():
+        # Event handling (timestamped when sampled)
+        input_sampler.poll()
+        for event_time, event in input_sampler.drain():
             if event.type == pygame.QUIT:
                 state.running = False
+            
+            # Profiler controls work on every screen
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.set_enabled(not profiler.enabled)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4 and profiler.enabled:
+                trace_events = profiler.export_chrome_trace(PROFILER_TRACE_FILE)
+                csv_rows = profiler.export_csv(PROFILER_CSV_FILE)
+                profiler_hud.show_status(f'Exported {trace_events} events, {csv_rows} rows')
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                if allocation_tracker.enabled:
+                    tracked_frames = allocation_tracker.export_report(ALLOCATION_REPORT_FILE)
+                    profiler_hud.show_status(f'Allocation report: {tracked_frames} frames')
+                else:
+                    profiler_hud.show_status('Tracking allocations...')
+                allocation_tracker.set_enabled(not allocation_tracker.enabled)
 
             if state.title_screen_active:
                 if event.type == pygame.KEYDOWN:
@@ -1229,25 +1702,23 @@ def main():
                                 state.powerup_choices = []
                                 state.selected_powerup_index = 0
                         else:
-                            # Handle direction changes (playing/countdown)
+                            # Handle direction changes (playing/countdown), applied at the next tick after the press
                             if event.key == pygame.K_UP:
-                                state.snake.change_direction(UP)
+                                state.input_scheduler.push(UP, event_time)
                             elif event.key == pygame.K_DOWN:
-                                state.snake.change_direction(DOWN)
+                                state.input_scheduler.push(DOWN, event_time)
                             elif event.key == pygame.K_LEFT:
-                                state.snake.change_direction(LEFT)
+                                state.input_scheduler.push(LEFT, event_time)
                             elif event.key == pygame.K_RIGHT:
-                                state.snake.change_direction(RIGHT)
+                                state.input_scheduler.push(RIGHT, event_time)
+        profiler.mark('events')
         
         # Drawing
         screen.fill(BLACK)
 
         if state.title_screen_active:
             # Draw title
-            title_font = font_manager.get_font(90)
-            button_font = font_manager.get_font(50)
-            
-            title_text = title_font.render('Snake Survivor', True, TITLE_COLOR)
+            title_text = font_manager.render(90, 'Snake Survivor', TITLE_COLOR)
             title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100))
             screen.blit(title_text, title_rect)
 
@@ -1255,16 +1726,17 @@ def main():
             # Start Button
             start_color = BUTTON_HOVER if start_button_rect.collidepoint(mouse_pos) or state.selected_button == 0 else BUTTON_NORMAL
             pygame.draw.rect(screen, start_color, start_button_rect, border_radius=10)
-            start_text = button_font.render('Start Game', True, BUTTON_TEXT)
+            start_text = font_manager.render(50, 'Start Game', BUTTON_TEXT)
             start_text_rect = start_text.get_rect(center=start_button_rect.center)
             screen.blit(start_text, start_text_rect)
 
             # Quit Button
             quit_color = BUTTON_HOVER if quit_button_rect.collidepoint(mouse_pos) or state.selected_button == 1 else BUTTON_NORMAL
             pygame.draw.rect(screen, quit_color, quit_button_rect, border_radius=10)
-            quit_text = button_font.render('Quit Game', True, BUTTON_TEXT)
+            quit_text = font_manager.render(50, 'Quit Game', BUTTON_TEXT)
             quit_text_rect = quit_text.get_rect(center=quit_button_rect.center)
             screen.blit(quit_text, quit_text_rect)
+            profiler.mark('title')
 
         elif state.game_running:
             if not state.game_over:
@@ -1277,176 +1749,114 @@ def main():
                     state.countdown_active = False
                     state.last_move_time = current_time  # Reset move timer after countdown
             
-            # Move snake based on timer, not frame rate (only if countdown finished)
-            time_since_move = current_time - state.last_move_time
-            
+            # Move snake on a fixed timestep, independent of the render rate (only if countdown finished)
             # Apply speed boost if active
-            current_move_delay = MOVE_DELAY
-            for powerup in state.active_powerups:
-                if powerup.type == Powerup.SPEED_BOOST and powerup.active:
-                    current_move_delay = int(MOVE_DELAY * 0.5)  # 50% faster
+            current_move_delay = get_move_delay(state.active_powerups)
+            ticks_this_frame = 0
             
-            if not state.countdown_active and not state.powerup_selection_active and not state.death_animation_active and time_since_move >= current_move_delay:
+            while (not state.countdown_active and not state.powerup_selection_active and not state.death_animation_active and
+                   current_time - state.last_move_time >= current_move_delay):
+                # Feed the earliest pending turn to this tick, timed against when the tick was due
+                state.input_scheduler.apply(state.snake, state.last_move_time + current_move_delay)
+                
                 # Update snake trail BEFORE any movement or collision logic
                 update_snake_trail(state, current_time)
                 
-                # Check if ghost mode is active (allows passing through self)
-                ghost_mode_active = any(p.type == Powerup.GHOST_MODE and p.active for p in state.active_powerups)
-                
-                # Predict next head position before moving
-                head_x, head_y = state.snake.body[0]
-                next_dir = state.snake.direction_queue[0] if state.snake.direction_queue else state.snake.direction
-                next_head = (head_x + next_dir[0], head_y + next_dir[1])
-                
-                collision_detected = False
-                collision_type = None  # 'wall', 'obstacle', or 'self'
+                # Movement, collision, shield, food and powerup rules (shared with the headless engine)
+                tick = run_move_tick(state)
                 
-                # Check for wall collision
-                if next_head[0] < 0 or next_head[0] >= GRID_SIZE or next_head[1] < 0 or next_head[1] >= GRID_SIZE:
-                    collision_detected = True
-                    collision_type = 'wall'
-                # Check for obstacle collision before moving
-                elif state.obstacle.check_collision(next_head):
-                    collision_detected = True
-                    collision_type = 'obstacle'
-                # Check for self-collision on the predicted next position BEFORE moving
-                # Exclude tail since it will move away during the move
-                elif not ghost_mode_active and next_head in state.snake.body[:-1]:
-                    collision_detected = True
-                    collision_type = 'self'
-                
-                # Check if shield is active BEFORE moving
-                shield_active = False
-                for powerup in state.active_powerups:
-                    if powerup.type == Powerup.SHIELD and powerup.active:
-                        shield_active = True
-                        break
-                
-                # Only move if no collision detected, OR if shield will protect us from wall/obstacle
-                if not collision_detected or (shield_active and collision_type in ['wall', 'obstacle']):
-                    move_result = state.snake.move()
-                
-                if collision_detected:
-                    if shield_active:
-                        # Shield is active, break it and continue game
-                        for powerup in state.active_powerups:
-                            if powerup.type == Powerup.SHIELD and powerup.active:
-                                powerup.active = False  # Shield breaks
-                                # Create DRAMATIC shield break effect
-                                head_x, head_y = state.snake.body[0]
-                                head_pixel_x = head_x * CELL_SIZE + CELL_SIZE // 2
-                                head_pixel_y = head_y * CELL_SIZE + CELL_SIZE // 2
-                                
-                                # Dramatic shield break burst
-                                create_dramatic_burst(state.particles, head_pixel_x, head_pixel_y, 'shield_break', current_time)
-                                
-                                # Add shockwave ring for extra drama
-                                create_shockwave_ring(state.shockwave_rings, head_pixel_x, head_pixel_y, CYAN, 60)
-                                
-                                # Screen border pulse
-                                trigger_border_pulse(state, CYAN, current_time)
-                                
-                                state.screen_shake_intensity = 15
-                                state.screen_shake_time = current_time
-                                # Trigger shield text effect
-                                state.shield_text_active = True
-                                state.shield_text_time = current_time
-                                break
-                        # Shield absorbed the collision, continue game normally
-                        collision_detected = False
-                    else:
-                        # Trigger death animation instead of immediate game over
-                        state.death_animation_active = True
-                        state.death_animation_start = current_time
-                        state.particles.clear()  # Clear any existing particles before creating new ones
-                        state.shockwave_rings.clear()  # Clear existing shockwaves
-                        
-                        # Get snake head position for zoom focal point
-                        head_x, head_y = state.snake.body[0]
-                        head_pixel_x = head_x * CELL_SIZE + CELL_SIZE // 2
-                        head_pixel_y = head_y * CELL_SIZE + CELL_SIZE // 2
-                        state.death_focal_point = (head_pixel_x, head_pixel_y)
-                        state.death_collision_type = collision_type
-                        
-                        # MAXIMUM DRAMATIC COLLISION BURST
-                        create_dramatic_burst(state.particles, head_pixel_x, head_pixel_y, 'collision', current_time)
-                        
-                        # Multiple expanding shockwave rings for ultimate drama
-                        create_shockwave_ring(state.shockwave_rings, head_pixel_x, head_pixel_y, RED, 120)
-                        create_shockwave_ring(state.shockwave_rings, head_pixel_x, head_pixel_y, ORANGE, 80)
-                        create_shockwave_ring(state.shockwave_rings, head_pixel_x, head_pixel_y, YELLOW, 40)
-                        
-                        # Dramatic red border pulse
-                        trigger_border_pulse(state, RED, current_time)
-                        
-                        # Massive screen shake
-                        state.screen_shake_intensity = 15
-                        state.screen_shake_time = current_time
-                        
-                        state.score_manager.update(state.score)
-                        # Set death reason for Game Over screen
-                        if collision_type == 'wall':
-                            state.death_reason = "You hit the wall!"
-                        elif collision_type == 'obstacle':
-                            state.death_reason = "You crashed into an obstacle!"
-                        elif collision_type == 'self':
-                            state.death_reason = "You ran into yourself!"
-                        else:
-                            state.death_reason = "Game Over!"
-                else:
-                    # Check food collision
-                    if state.snake.body[0] == state.food.get_position():
-                        # Spawn SPECTACULAR food collection effect
-                        food_pixel_x = state.food.position[0] * CELL_SIZE + CELL_SIZE // 2
-                        food_pixel_y = state.food.position[1] * CELL_SIZE + CELL_SIZE // 2
-                        
-                        # Check if double points is active
-                        points_to_add = 10
-                        burst_color = YELLOW  # Default color
-                        for powerup in state.active_powerups:
-                            if powerup.type == Powerup.DOUBLE_POINTS and powerup.active:
-                                points_to_add = 20
-                                burst_color = YELLOW  # All yellow for double points
-                                powerup.remaining_uses -= 1
-                                if powerup.remaining_uses <= 0:
-                                    powerup.active = False
-                                break
-                        
-                        # DRAMATIC FOOD COLLECTION BURST
-                        create_dramatic_burst(state.particles, food_pixel_x, food_pixel_y, 'food', current_time, burst_color)
-                        
-                        # Add shockwave ring for extra spectacle
-                        create_shockwave_ring(state.shockwave_rings, food_pixel_x, food_pixel_y, burst_color, 50)
-                        
-                        # Screen border pulse
-                        trigger_border_pulse(state, burst_color, current_time)
-                        
-                        # Trigger screen shake
-                        state.screen_shake_intensity = 8
-                        state.screen_shake_time = current_time
-                        
-                        # Trigger score flash
-                        state.score_flash_time = current_time
-                        
-                        # Trigger screen flash
-                        state.screen_flash_time = current_time
-                        
-                        state.snake.grow()
-                        state.score += points_to_add
-                        state.food.spawn(state.snake.body + state.obstacle.positions)
-                        state.apples_collected += 1
-                        
-                        # Trigger powerup selection every 3 apples
-                        if state.apples_collected % 3 == 0 and not state.powerup_selection_active:
-                            state.powerup_selection_active = True
-                            # Generate 3 random powerup choices
-                            all_types = [Powerup.SHIELD, Powerup.DOUBLE_POINTS, Powerup.GHOST_MODE, Powerup.SPEED_BOOST]
-                            state.powerup_choices = random.sample(all_types, 3)
-                            state.selected_powerup_index = 1  # Start with middle option selected
-                
-                # Reset interpolation after move
-                state.snake.interpolation = 0.0
-                state.last_move_time = current_time
+                if tick.shield_broken:
+                    # Create DRAMATIC shield break effect
+                    head_x, head_y = state.snake.body[0]
+                    head_pixel_x = head_x * CELL_SIZE + CELL_SIZE // 2
+                    head_pixel_y = head_y * CELL_SIZE + CELL_SIZE // 2
+                    
+                    # Dramatic shield break burst
+                    create_dramatic_burst(state.particles, head_pixel_x, head_pixel_y, 'shield_break', current_time)
+                    
+                    # Add shockwave ring for extra drama
+                    create_shockwave_ring(state.shockwave_rings, head_pixel_x, head_pixel_y, CYAN, 60)
+                    
+                    # Screen border pulse
+                    trigger_border_pulse(state, CYAN, current_time)
+                    
+                    state.screen_shake_intensity = 15
+                    state.screen_shake_time = current_time
+                    # Trigger shield text effect
+                    state.shield_text_active = True
+                    state.shield_text_time = current_time
+                elif tick.died:
+                    # Trigger death animation instead of immediate game over
+                    state.death_animation_active = True
+                    state.death_animation_start = current_time
+                    state.particles.clear()  # Clear any existing particles before creating new ones
+                    state.shockwave_rings.clear()  # Clear existing shockwaves
+                    
+                    # Get snake head position for zoom focal point
+                    head_x, head_y = state.snake.body[0]
+                    head_pixel_x = head_x * CELL_SIZE + CELL_SIZE // 2
+                    head_pixel_y = head_y * CELL_SIZE + CELL_SIZE // 2
+                    state.death_focal_point = (head_pixel_x, head_pixel_y)
+                    state.death_collision_type = tick.collision_type
+                    
+                    # MAXIMUM DRAMATIC COLLISION BURST
+                    create_dramatic_burst(state.particles, head_pixel_x, head_pixel_y, 'collision', current_time)
+                    
+                    # Multiple expanding shockwave rings for ultimate drama
+                    create_shockwave_ring(state.shockwave_rings, head_pixel_x, head_pixel_y, RED, 120)
+                    create_shockwave_ring(state.shockwave_rings, head_pixel_x, head_pixel_y, ORANGE, 80)
+                    create_shockwave_ring(state.shockwave_rings, head_pixel_x, head_pixel_y, YELLOW, 40)
+                    
+                    # Dramatic red border pulse
+                    trigger_border_pulse(state, RED, current_time)
+                    
+                    # Massive screen shake
+                    state.screen_shake_intensity = 15
+                    state.screen_shake_time = current_time
+                    
+                    state.score_manager.update(state.score)
+
+                elif tick.food_eaten:
+                    # Spawn SPECTACULAR food collection effect
+                    food_pixel_x = tick.food_eaten[0] * CELL_SIZE + CELL_SIZE // 2
+                    food_pixel_y = tick.food_eaten[1] * CELL_SIZE + CELL_SIZE // 2
+                    burst_color = YELLOW  # Same color with or without double points
+                    
+                    # DRAMATIC FOOD COLLECTION BURST
+                    create_dramatic_burst(state.particles, food_pixel_x, food_pixel_y, 'food', current_time, burst_color)
+                    
+                    # Add shockwave ring for extra spectacle
+                    create_shockwave_ring(state.shockwave_rings, food_pixel_x, food_pixel_y, burst_color, 50)
+                    
+                    # Screen border pulse
+                    trigger_border_pulse(state, burst_color, current_time)
+                    
+                    # Trigger screen shake
+                    state.screen_shake_intensity = 8
+                    state.screen_shake_time = current_time
+                    
+                    # Trigger score flash
+                    state.score_flash_time = current_time
+                    
+                    # Trigger screen flash
+                    state.screen_flash_time = current_time
+                
+                # Advance by exactly one tick so moves never drift against frames
+                state.last_move_time += current_move_delay
+                current_move_delay = get_move_delay(state.active_powerups)
+                ticks_this_frame += 1
+                if ticks_this_frame >= MAX_TICKS_PER_FRAME:
+                    state.last_move_time = max(state.last_move_time, current_time - current_move_delay)  # Drop a stalled backlog
+                    break
+            
+            if not state.countdown_active and not state.powerup_selection_active and not state.death_animation_active:
+                # Slide between the previous and current cell until the next tick
+                state.snake.update_interpolation((current_time - state.last_move_time) / current_move_delay)
+            else:
+                # Hold the snake on its cells, and don't bank paused time as ticks to catch up
+                state.snake.update_interpolation(1.0)
+                state.last_move_time = max(state.last_move_time, current_time - current_move_delay)
+                state.input_scheduler.hold(current_time)
             
             # Clean up expired shockwave rings
             state.shockwave_rings = [ring for ring in state.shockwave_rings if ring.is_alive()]
@@ -1470,6 +1880,7 @@ def main():
                     state.death_animation_active = False
                     state.game_over = True
                     state.particles.clear()  # Clear particles when game over, so they don't loop on the game over screen
+            profiler.mark('simulation')
         
             # Calculate screen shake offset
             shake_x = 0
@@ -1484,6 +1895,8 @@ def main():
             # Handle death animation zoom effect
             if state.death_animation_active:
                 death_time_elapsed = current_time - state.death_animation_start
+                # Sampled on the keyframe grid, so every death zooms through the same cached view sizes
+                death_time_elapsed -= death_time_elapsed % ANIMATION_KEYFRAME_MS
                 
                 # Animation phases: 500ms freeze, 1500ms zoom (500-2000ms), 500ms hold+fade (2000-2500ms)
                 if death_time_elapsed < 500:
@@ -1495,89 +1908,76 @@ def main():
                 else:
                     zoom_scale = 3.0
                 
-                # Create zoom surface
-                zoom_surface = pygame.Surface((GRID_WIDTH, GRID_HEIGHT))
-                zoom_surface.fill(BLACK)
-                
                 # Get focal point for zoom centering
                 focal_x, focal_y = state.death_focal_point
                 
-                # Draw grid
-                for x in range(0, GRID_WIDTH, CELL_SIZE):
-                    pygame.draw.line(zoom_surface, (30, 30, 30), (x, 0), (x, GRID_HEIGHT))
-                for y in range(0, GRID_HEIGHT, CELL_SIZE):
-                    pygame.draw.line(zoom_surface, (30, 30, 30), (0, y), (GRID_WIDTH, y))
+                # Calculate blit position to center zoom on focal point
+                # The focal point on the scaled scene is at (focal_x * zoom_scale, focal_y * zoom_scale)
+                # We want to place it at the center of the grid area (GRID_WIDTH // 2, GRID_HEIGHT // 2)
+                blit_x = (GRID_WIDTH // 2) - focal_x * zoom_scale + shake_x
+                blit_y = (GRID_HEIGHT // 2) - focal_y * zoom_scale + shake_y
+                
+                # Only the source region that lands inside the grid area after zooming is
+                # drawn and scaled, so the work per frame does not grow with the zoom factor.
+                # It is not clipped to the grid, so its size depends on the zoom factor alone.
+                crop_rect = pygame.Rect(
+                    math.floor(-blit_x / zoom_scale), math.floor(-blit_y / zoom_scale),
+                    math.ceil(GRID_WIDTH / zoom_scale) + 1, math.ceil(GRID_HEIGHT / zoom_scale) + 1
+                )
+                
+                zoom_surface = state.death_zoom.scene
+                zoom_surface.set_clip(crop_rect)
+                
+                # Draw cached grid + obstacles
+                state.background.draw(zoom_surface, state.obstacle)
                 
                 # Draw particles
-                for particle in state.particles:
-                    particle.draw(zoom_surface)
+                state.particles.draw(zoom_surface, current_time)
                 
                 # Draw shockwave rings
                 for ring in state.shockwave_rings:
                     ring.draw(zoom_surface)
                 
-                # Draw obstacles
-                state.obstacle.draw(zoom_surface)
-                
                 # Draw food
                 state.food.draw(zoom_surface)
                 
                 # Draw snake (frozen)
                 state.snake.draw(zoom_surface)
+                zoom_surface.set_clip(None)
                 
-                # Scale the surface
-                scaled_width = int(GRID_WIDTH * zoom_scale)
-                scaled_height = int(GRID_HEIGHT * zoom_scale)
-                scaled_surface = pygame.transform.scale(zoom_surface, (scaled_width, scaled_height))
-                
-                # Calculate blit position to center zoom on focal point
-                # The focal point on the scaled surface is at (focal_x * zoom_scale, focal_y * zoom_scale)
-                # We want to place it at the center of the grid area (GRID_WIDTH // 2, GRID_HEIGHT // 2)
-                scaled_focal_x = focal_x * zoom_scale
-                scaled_focal_y = focal_y * zoom_scale
-                blit_x = (GRID_WIDTH // 2) - scaled_focal_x + shake_x
-                blit_y = (GRID_HEIGHT // 2) - scaled_focal_y + shake_y
-                
-                # Blit scaled surface to screen (grid area only)
-                screen.blit(scaled_surface, (blit_x, blit_y))
+                # Scale the visible region only, then blit it to screen (grid area only)
+                scaled_surface = state.death_zoom.scale(crop_rect, zoom_scale)
+                screen.blit(scaled_surface, (blit_x + crop_rect.x * zoom_scale, blit_y + crop_rect.y * zoom_scale))
                 
                 # Draw fade overlay in final phase
                 if death_time_elapsed >= 2000:
                     fade_progress = (death_time_elapsed - 2000) / 500
                     fade_alpha = int(fade_progress * 255)
-                    fade_surface = pygame.Surface((GRID_WIDTH, GRID_HEIGHT), pygame.SRCALPHA)
-                    fade_surface.fill((0, 0, 0, fade_alpha))
-                    screen.blit(fade_surface, (0, 0))
+                    state.fade_overlay.draw(screen, BLACK, fade_alpha)
                 
                 # Draw panel normally
                 panel_rect = pygame.Rect(GRID_WIDTH, 0, PANEL_WIDTH, HEIGHT)
                 pygame.draw.rect(screen, DARK_GRAY, panel_rect)
                 pygame.draw.line(screen, WHITE, (GRID_WIDTH, 0), (GRID_WIDTH, GRID_HEIGHT), 2)
+                profiler.mark('death_zoom')
             else:
                 # Normal rendering
+                # Draw cached grid + obstacles (with shake offset) before the panel covers any overhang
+                state.background.draw(screen, state.obstacle, shake_x, shake_y)
+                
                 # Draw panel background
                 panel_rect = pygame.Rect(GRID_WIDTH, 0, PANEL_WIDTH, HEIGHT)
                 pygame.draw.rect(screen, DARK_GRAY, panel_rect)
                 
                 # Draw separator line between grid and panel
                 pygame.draw.line(screen, WHITE, (GRID_WIDTH, 0), (GRID_WIDTH, HEIGHT), 2)
-                
-                # Draw background grid (with shake offset, only on grid area)
-                for x in range(0, GRID_WIDTH, CELL_SIZE):
-                    pygame.draw.line(screen, (30, 30, 30), (x + shake_x, shake_y), (x + shake_x, GRID_HEIGHT + shake_y))
-                for y in range(0, GRID_HEIGHT, CELL_SIZE):
-                    pygame.draw.line(screen, (30, 30, 30), (shake_x, y + shake_y), (GRID_WIDTH + shake_x, y + shake_y))
+                profiler.mark('background')
                 
                 # Update and draw particles (with shake offset)
-                state.particles = [p for p in state.particles if p.is_alive()]
-                for particle in state.particles:
-                    particle.update()
-                    # Temporarily offset particle position for shake
-                    original_x, original_y = particle.x, particle.y
-                    particle.x += shake_x
-                    particle.y += shake_y
-                    particle.draw(screen)
-                    particle.x, particle.y = original_x, original_y
+                state.particles.cull(current_time)
+                state.particles.update(frame_steps)
+                profiler.mark('particle_update')
+                state.particles.draw(screen, current_time, shake_x, shake_y)
                 
                 # Draw shockwave rings (with shake offset)
                 for ring in state.shockwave_rings:
@@ -1587,73 +1987,79 @@ def main():
                     ring.y += shake_y
                     ring.draw(screen)
                     ring.x, ring.y = original_x, original_y
-                
-                # Draw obstacles
-                state.obstacle.draw(screen)
+                    ring_extent = ring.max_radius + ring.width
+                    dirty_rects.add((ring.x + shake_x - ring_extent, ring.y + shake_y - ring_extent,
+                                     ring_extent * 2, ring_extent * 2))
+                dirty_rects.add(state.particles.get_bounds(shake_x, shake_y))
+                profiler.mark('effects')
                 
                 # Draw snake trails AFTER obstacles but BEFORE snake for visibility
                 for trail in state.snake_trail:
                     trail.draw(screen)
-                
-                # Initialize font for panel UI
-                font = font_manager.get_font(36)
+                    dirty_rects.add((trail.x - 2, trail.y - 2, CELL_SIZE + 4, CELL_SIZE + 4))
+                profiler.mark('trails')
+
             
             # Update particles even during death animation
             if state.death_animation_active:
-                state.particles = [p for p in state.particles if p.is_alive()]
-                for particle in state.particles:
-                    particle.update()
+                state.particles.cull(current_time)
+                state.particles.update(frame_steps)
                 # Update shockwaves too
                 for ring in state.shockwave_rings:
                     ring.update()
+                profiler.mark('particle_update')
             
             if not state.game_over and not state.death_animation_active:
                 # Draw game elements
                 state.food.draw(screen)
+                food_x, food_y = state.food.position
+                dirty_rects.add(pygame.Rect(food_x * CELL_SIZE, food_y * CELL_SIZE, CELL_SIZE, CELL_SIZE).inflate(8, 8))
+                profiler.mark('food')
                 state.snake.draw(screen)
+                dirty_rects.track_snake(state.snake)
+                profiler.mark('snake')
                 
-                # Draw score with zoom effect in panel
+                # Draw score with zoom effect in panel (counters are drawn from cached
+                # glyphs, so a new value or flash size renders no Surface once seen)
                 if state.score_flash_time > 0:
                     time_since_flash = current_time - state.score_flash_time
                     if time_since_flash < 300:  # Flash lasts 300ms
                         # Scale from 1.5 to 1.0
                         scale = 1.5 - (time_since_flash / 300) * 0.5
                         score_font_size = int(36 * scale)
-                        score_font = pygame.font.Font(None, score_font_size)
-                        score_text = score_font.render(f'Score: {state.score}', True, YELLOW)
-                        score_rect = score_text.get_rect(center=(GRID_WIDTH + PANEL_WIDTH // 2, 30))
-                        screen.blit(score_text, score_rect)
+                        score_rect = font_manager.draw_text(screen, score_font_size, f'Score: {state.score}', YELLOW,
+                                                            center=(GRID_WIDTH + PANEL_WIDTH // 2, 30))
+                        dirty_rects.track('score', score_rect, (state.score, score_font_size))
                     else:
-                        score_text = font.render(f'Score: {state.score}', True, WHITE)
-                        score_rect = score_text.get_rect(center=(GRID_WIDTH + PANEL_WIDTH // 2, 30))
-                        screen.blit(score_text, score_rect)
+                        score_rect = font_manager.draw_text(screen, 36, f'Score: {state.score}', WHITE,
+                                                            center=(GRID_WIDTH + PANEL_WIDTH // 2, 30))
+                        dirty_rects.track('score', score_rect, (state.score, 36))
                 else:
-                    score_text = font.render(f'Score: {state.score}', True, WHITE)
-                    score_rect = score_text.get_rect(center=(GRID_WIDTH + PANEL_WIDTH // 2, 30))
-                    screen.blit(score_text, score_rect)
+                    score_rect = font_manager.draw_text(screen, 36, f'Score: {state.score}', WHITE,
+                                                        center=(GRID_WIDTH + PANEL_WIDTH // 2, 30))
+                    dirty_rects.track('score', score_rect, (state.score, 36))
                 
                 # Draw high score in panel
-                high_score_text = font.render(f'High Score: {state.score_manager.get_high_score()}', True, WHITE)
-                high_score_rect = high_score_text.get_rect(center=(GRID_WIDTH + PANEL_WIDTH // 2, 70))
-                screen.blit(high_score_text, high_score_rect)
+                high_score_rect = font_manager.draw_text(screen, 36, f'High Score: {state.score_manager.get_high_score()}', WHITE,
+                                                         center=(GRID_WIDTH + PANEL_WIDTH // 2, 70))
+                dirty_rects.track('high_score', high_score_rect, state.score_manager.get_high_score())
 
                 # Draw timer
-                timer_text = font.render(f'Time: {int(state.elapsed_time)}', True, WHITE)
-                timer_rect = timer_text.get_rect(center=(GRID_WIDTH + PANEL_WIDTH // 2, 110))
-                screen.blit(timer_text, timer_rect)
+                timer_rect = font_manager.draw_text(screen, 36, f'Time: {int(state.elapsed_time)}', WHITE,
+                                                    center=(GRID_WIDTH + PANEL_WIDTH // 2, 110))
+                dirty_rects.track('timer', timer_rect, int(state.elapsed_time))
                 
                 # Draw active powerup indicators in panel
                 if state.active_powerups:
                     indicator_y = 160
-                    indicator_font = pygame.font.Font(None, 22)
-                    title_font = pygame.font.Font(None, 28)
                     
                     # Draw "Active Powerups" title
-                    title_text = title_font.render('Active Powerups', True, YELLOW)
+                    title_text = font_manager.render(28, 'Active Powerups', YELLOW)
                     title_rect = title_text.get_rect(center=(GRID_WIDTH + PANEL_WIDTH // 2, 140))
                     screen.blit(title_text, title_rect)
+                    dirty_rects.track('powerup_title', title_rect, True)
                     
-                    for powerup in state.active_powerups:
+                    for powerup_index, powerup in enumerate(state.active_powerups):
                         if powerup.active:
                             info = Powerup.INFO[powerup.type]
                             
@@ -1672,34 +2078,35 @@ def main():
                                 screen.blit(sprite, icon_rect)
                             else:
                                 # Fallback to text icon
-                                icon_font = pygame.font.Font(None, 32)
-                                icon_text = icon_font.render(info['icon'], True, BLACK)
+                                icon_text = font_manager.render(32, info['icon'], BLACK)
                                 icon_rect = icon_text.get_rect(center=(bar_x + 20, indicator_y + 20))
                                 screen.blit(icon_text, icon_rect)
                             
                             # Name
-                            name_text = indicator_font.render(info['name'], True, BLACK)
+                            name_text = font_manager.render(22, info['name'], BLACK)
                             screen.blit(name_text, (bar_x + 40, indicator_y + 8))
                             
                             # Timer or uses remaining
+                            remaining_label = None
                             if powerup.type == Powerup.DOUBLE_POINTS:
-                                remaining_text = indicator_font.render(f'{powerup.remaining_uses} apples left', True, BLACK)
-                                screen.blit(remaining_text, (bar_x + 40, indicator_y + 32))
+                                remaining_label = f'{powerup.remaining_uses} apples left'
+                                font_manager.draw_text(screen, 22, remaining_label, BLACK, topleft=(bar_x + 40, indicator_y + 32))
                             elif info['duration'] is not None:
                                 remaining_time = powerup.get_remaining_time(current_time)
-                                time_text = indicator_font.render(f'{remaining_time:.1f}s remaining', True, BLACK)
-                                screen.blit(time_text, (bar_x + 40, indicator_y + 32))
+                                remaining_label = f'{remaining_time:.1f}s remaining'
+                                font_manager.draw_text(screen, 22, remaining_label, BLACK, topleft=(bar_x + 40, indicator_y + 32))
+                            dirty_rects.track(('powerup', powerup_index), bar_rect, (powerup.type, remaining_label))
                         
                         indicator_y += 70
                 
+                profiler.mark('panel_text')
+                
                 # Screen flash effect when collecting food (only on grid area)
                 if state.screen_flash_time > 0:
                     time_since_flash = current_time - state.screen_flash_time
                     if time_since_flash < 150:  # Flash lasts 150ms
                         flash_alpha = int(80 * (1 - time_since_flash / 150))
-                        flash_surface = pygame.Surface((GRID_WIDTH, GRID_HEIGHT), pygame.SRCALPHA)
-                        flash_surface.fill((255, 255, 255, flash_alpha))
-                        screen.blit(flash_surface, (0, 0))
+                        state.flash_overlay.draw(screen, WHITE, flash_alpha)
                 
                 # Draw DRAMATIC border pulse effect
                 draw_border_pulse(screen, state, current_time)
@@ -1715,9 +2122,7 @@ def main():
                         y_offset = -(time_since_shield / shield_text_duration) * 100
                         
                         # Create shield text with large font
-                        shield_font = pygame.font.Font(None, 60)
-                        shield_text = shield_font.render('SHIELD USED!', True, CYAN)
-                        shield_text.set_alpha(alpha)
+                        shield_text = font_manager.render(60, 'SHIELD USED!', CYAN, alpha=alpha)
                         
                         # Center on game grid
                         shield_rect = shield_text.get_rect(center=(GRID_WIDTH // 2, GRID_HEIGHT // 2 + y_offset))
@@ -1728,13 +2133,10 @@ def main():
                 # Draw powerup selection screen (centered on grid)
                 if state.powerup_selection_active:
                     # Semi-transparent overlay over grid only
-                    overlay = pygame.Surface((GRID_WIDTH, GRID_HEIGHT), pygame.SRCALPHA)
-                    overlay.fill((0, 0, 0, 180))
-                    screen.blit(overlay, (0, 0))
+                    state.dim_overlay.draw(screen, BLACK, 180)
                     
                     # Title
-                    title_font = pygame.font.Font(None, 48)
-                    title_text = title_font.render('Choose a Powerup!', True, YELLOW)
+                    title_text = font_manager.render(48, 'Choose a Powerup!', YELLOW)
                     title_rect = title_text.get_rect(center=(GRID_WIDTH // 2, GRID_HEIGHT // 4))
                     screen.blit(title_text, title_rect)
                     
@@ -1769,29 +2171,26 @@ def main():
                             screen.blit(sprite, icon_rect)
                         else:
                             # Fallback to text icon
-                            icon_font = pygame.font.Font(None, 60)
-                            icon_text = icon_font.render(info['icon'], True, BLACK)
+                            icon_text = font_manager.render(60, info['icon'], BLACK)
                             icon_rect = icon_text.get_rect(center=(card_x + card_width // 2, card_y + 50))
                             screen.blit(icon_text, icon_rect)
                         
                         # Name
-                        name_font = pygame.font.Font(None, 32)
-                        name_text = name_font.render(info['name'], True, BLACK)
+                        name_text = font_manager.render(32, info['name'], BLACK)
                         name_rect = name_text.get_rect(center=(card_x + card_width // 2, card_y + 120))
                         screen.blit(name_text, name_rect)
                         
                         # Description (word wrap)
-                        desc_font = pygame.font.Font(None, 20)
                         desc_lines = info['description'].split(' ')
                         line1 = ' '.join(desc_lines[:3])
                         line2 = ' '.join(desc_lines[3:]) if len(desc_lines) > 3 else ''
                         
-                        desc_text1 = desc_font.render(line1, True, BLACK)
+                        desc_text1 = font_manager.render(20, line1, BLACK)
                         desc_rect1 = desc_text1.get_rect(center=(card_x + card_width // 2, card_y + 155))
                         screen.blit(desc_text1, desc_rect1)
                         
                         if line2:
-                            desc_text2 = desc_font.render(line2, True, BLACK)
+                            desc_text2 = font_manager.render(20, line2, BLACK)
                             desc_rect2 = desc_text2.get_rect(center=(card_x + card_width // 2, card_y + 175))
                             screen.blit(desc_text2, desc_rect2)
                 
@@ -1800,19 +2199,21 @@ def main():
                     time_since_countdown = current_time - state.countdown_start_time
                     
                     # Semi-transparent overlay
-                    overlay = pygame.Surface((GRID_WIDTH, GRID_HEIGHT), pygame.SRCALPHA)
-                    overlay.fill((0, 0, 0, 150))  # Black with 150 alpha
-                    screen.blit(overlay, (0, 0))
+                    state.dim_overlay.draw(screen, BLACK, 150)  # Black with 150 alpha
+                    
+                    # Animate on a fixed keyframe grid: sizes and angles repeat between
+                    # countdowns, so their renders stay cached instead of being rasterized per frame
+                    keyframe_time = time_since_countdown - time_since_countdown % ANIMATION_KEYFRAME_MS
                     
                     # Determine countdown number or "GO!"
-                    if time_since_countdown < COUNTDOWN_DURATION:
-                        countdown_value = 3 - int(time_since_countdown / 1000)
+                    if keyframe_time < COUNTDOWN_DURATION:
+                        countdown_value = 3 - int(keyframe_time / 1000)
                         countdown_text = str(countdown_value)
                         color = WHITE
                         base_font_size = 120
                         
                         # Calculate progress within current second (0.0 to 1.0)
-                        progress_in_second = (time_since_countdown % 1000) / 1000.0
+                        progress_in_second = (keyframe_time % 1000) / 1000.0
                         
                         # Zoom in effect: Start at 150% scale, zoom to 100%, then slight bounce
                         if progress_in_second < 0.3:
@@ -1839,7 +2240,7 @@ def main():
                         base_font_size = 100
                         
                         # GO! explosion effect
-                        go_progress = (time_since_countdown - COUNTDOWN_DURATION) / GO_DURATION
+                        go_progress = (keyframe_time - COUNTDOWN_DURATION) / GO_DURATION
                         
                         # Explosive zoom from 50% to 130% then settle to 120%
                         if go_progress < 0.5:
@@ -1852,85 +2253,64 @@ def main():
                         
                         font_size = int(base_font_size * scale)
                     
-                    # Create large font for countdown
-                    countdown_font = pygame.font.Font(None, font_size)
-                    text_surface = countdown_font.render(countdown_text, True, color)
-                    
-                    # Apply rotation if needed
-                    if abs(rotation_angle) > 0.1:
-                        text_surface = pygame.transform.rotate(text_surface, -rotation_angle)
-                    
+                    # Render countdown text (cached per size and angle)
+                    text_surface = font_manager.render_rotated(font_size, countdown_text, color, -rotation_angle)
                     text_rect = text_surface.get_rect(center=(GRID_WIDTH // 2, GRID_HEIGHT // 2))
                     
-                    # Add pulsing glow effect to countdown text
-                    glow_font = pygame.font.Font(None, int(font_size * 1.1))
+                    # Add pulsing glow effect to countdown text (same rotation, re-faded for every layer)
+                    glow_font_size = int(font_size * 1.1)
                     for offset in range(5, 0, -1):
                         alpha = 50 - offset * 10
-                        glow_surface = glow_font.render(countdown_text, True, (*color[:3],))
-                        
-                        # Apply same rotation to glow
-                        if abs(rotation_angle) > 0.1:
-                            glow_surface = pygame.transform.rotate(glow_surface, -rotation_angle)
-                        
-                        glow_surface.set_alpha(alpha)
+                        glow_surface = font_manager.render_rotated(glow_font_size, countdown_text, color, -rotation_angle, alpha=alpha)
                         glow_rect = glow_surface.get_rect(center=(GRID_WIDTH // 2, GRID_HEIGHT // 2))
                         screen.blit(glow_surface, glow_rect)
                     
                     screen.blit(text_surface, text_rect)
+                profiler.mark('overlays')
             elif state.game_over:
                 # Game over screen - show frozen death scene with full fade overlay
-                # Create the final frozen scene surface
-                frozen_surface = pygame.Surface((GRID_WIDTH, GRID_HEIGHT))
-                frozen_surface.fill(BLACK)
-                
-                # Draw grid
-                for x in range(0, GRID_WIDTH, CELL_SIZE):
-                    pygame.draw.line(frozen_surface, (30, 30, 30), (x, 0), (x, GRID_HEIGHT))
-                for y in range(0, GRID_HEIGHT, CELL_SIZE):
-                    pygame.draw.line(frozen_surface, (30, 30, 30), (0, y), (GRID_WIDTH, y))
-                
-                # Don't draw particles on game over screen - they should be cleared
-                
-                # Draw obstacles
-                state.obstacle.draw(frozen_surface)
-                
-                # Draw food
-                state.food.draw(frozen_surface)
-                
-                # Draw snake (frozen)
-                state.snake.draw(frozen_surface)
-                
-                # Blit frozen scene to screen
-                screen.blit(frozen_surface, (0, 0))
-                
-                # Dark fade overlay over the scene
-                fade_overlay = pygame.Surface((GRID_WIDTH, GRID_HEIGHT), pygame.SRCALPHA)
-                fade_overlay.fill((0, 0, 0, 200))  # Strong fade for readability
-                screen.blit(fade_overlay, (0, 0))
+                # (captured once, then reused until restart)
+                state.game_over_snapshot.draw(screen, state)
                 
                 # Draw panel background
                 panel_rect = pygame.Rect(GRID_WIDTH, 0, PANEL_WIDTH, HEIGHT)
                 pygame.draw.rect(screen, DARK_GRAY, panel_rect)
                 pygame.draw.line(screen, WHITE, (GRID_WIDTH, 0), (GRID_WIDTH, HEIGHT), 2)
                 
-                # Initialize font for game over screen
-                game_over_font = font_manager.get_font(48)
-                text_font = font_manager.get_font(36)
-                
-                game_over_text = game_over_font.render('Game Over!', True, RED)
-                reason_text = text_font.render(state.death_reason, True, YELLOW)
-                score_text = text_font.render(f'Final Score: {state.score}', True, WHITE)
-                high_score_text = text_font.render(f'High Score: {state.score_manager.get_high_score()}', True, WHITE)
-                restart_text = text_font.render('Press SPACE to restart', True, WHITE)
+                # Game over screen text (cached renders)
+                game_over_text = font_manager.render(48, 'Game Over!', RED)
+                reason_text = font_manager.render(36, state.death_reason, YELLOW)
+                score_text = font_manager.render(36, f'Final Score: {state.score}', WHITE)
+                high_score_text = font_manager.render(36, f'High Score: {state.score_manager.get_high_score()}', WHITE)
+                restart_text = font_manager.render(36, 'Press SPACE to restart', WHITE)
                 
                 screen.blit(game_over_text, (GRID_WIDTH // 2 - game_over_text.get_width() // 2, GRID_HEIGHT // 2 - 80))
                 screen.blit(reason_text, (GRID_WIDTH // 2 - reason_text.get_width() // 2, GRID_HEIGHT // 2 - 40))
                 screen.blit(score_text, (GRID_WIDTH // 2 - score_text.get_width() // 2, GRID_HEIGHT // 2 + 0))
                 screen.blit(high_score_text, (GRID_WIDTH // 2 - high_score_text.get_width() // 2, GRID_HEIGHT // 2 + 40))
                 screen.blit(restart_text, (GRID_WIDTH // 2 - restart_text.get_width() // 2, GRID_HEIGHT // 2 + 80))
+                profiler.mark('game_over')
+        
+        if profiler.enabled:
+            profiler_hud.draw(screen, font_manager, dirty_rects, state.input_scheduler.latencies)
+            profiler.mark('hud')
+        
+        # Whole-grid effects touch every pixel, so those frames are uploaded in full
+        if (not state.game_running or state.game_over or state.death_animation_active or
+                state.countdown_active or state.powerup_selection_active or state.shield_text_active or
+                state.screen_shake_intensity > 0 or state.border_pulse_time > 0 or
+                current_time - state.screen_flash_time < SCREEN_FLASH_DURATION):
+            dirty_rects.mark_full()
+        dirty_rects.present()
+        profiler.mark('present')
         
-        pygame.display.flip()
-        clock.tick(FPS)
+        # Wait out the frame budget while still sampling input
+        if FPS > 0:
+            input_sampler.wait_until(current_time + 1000 / FPS)
+        clock.tick()
+        profiler.mark('wait')
+        profiler.end_frame()
+        allocation_tracker.end_frame()
     
     pygame.quit()
 
@@ -0,0 +1,43 @@
+"""Steady-state allocation budgets of the render benchmark scenarios.
+
+Each scenario replays the real game loop headlessly in its own process, warms
+up, then tracks allocations over its measured frames; the per-frame means must
+stay within ALLOCATION_BUDGETS (near-zero new Surfaces, bounded retained bytes).
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import render_benchmark
+
+
+@pytest.fixture(scope='module', autouse=True)
+def keep_high_score():
+    """Scenarios play real games, so put back whatever high score file was there"""
+    path = os.path.join(render_benchmark.REPO_ROOT, 'high_score.json')
+    saved = None
+    if os.path.exists(path):
+        with open(path) as f:
+            saved = f.read()
+    yield
+    if saved is None:
+        if os.path.exists(path):
+            os.remove(path)
+    else:
+        with open(path, 'w') as f:
+            f.write(saved)
+
+
+@pytest.mark.parametrize('name', sorted(render_benchmark.SCENARIOS))
+def test_scenario_allocations_within_budget(name):
+    result = render_benchmark.run_in_subprocess(name, track_allocations=True)
+    allocations = result['allocations']
+    assert allocations['frames'] == render_benchmark.SCENARIOS[name].frames
+    assert render_benchmark.find_budget_overruns({'scenarios': {name: result}}) == []
+
+
+def test_every_scenario_has_a_budget():
+    assert set(render_benchmark.ALLOCATION_BUDGETS) == set(render_benchmark.SCENARIOS)